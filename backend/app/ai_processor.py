@@ -1,14 +1,16 @@
 import json
 import re
+import time
 from datetime import datetime, timezone, date, timedelta
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Callable, Optional
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import and_, func
 
 from anthropic import Anthropic
 
 from app.models import Article, Newsletter
 from app.config import get_settings
+from app import metrics, rollups, tags, snapshots
 
 settings = get_settings()
 
@@ -16,16 +18,43 @@ settings = get_settings()
 class AIProcessor:
     """Processes articles using Claude AI for summarization and tagging."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, on_event: Optional[Callable[..., None]] = None):
         self.db = db
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+        self.on_event = on_event  # Progress callback: on_event(event_type, **data)
+        self.client = Anthropic(api_key=settings.anthropic_api_key, base_url=settings.anthropic_base_url or None)
         self.model = "claude-sonnet-4-20250514"
+        self.last_usage = None  # (input_tokens, output_tokens) of the latest article call
+    
+    def _create_message(self, kind: str, prompt: str, max_tokens: int):
+        """Call Claude, recording latency, token use and failures."""
+        start = time.perf_counter()
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+        except Exception:
+            metrics.AI_ERRORS.labels(self.model, kind).inc()
+            raise
+        finally:
+            metrics.AI_REQUEST_DURATION.labels(self.model, kind).observe(time.perf_counter() - start)
+
+        usage = getattr(response, "usage", None)
+        if usage:
+            metrics.AI_TOKENS.labels(self.model, "input").inc(usage.input_tokens)
+            metrics.AI_TOKENS.labels(self.model, "output").inc(usage.output_tokens)
+        return response
     
     def process_article(self, article: Article) -> Article:
         """Process a single article with AI summarization and tagging."""
         if article.processed:
             return article
         
+        self.last_usage = None
+        
         # Prepare content for processing
         content = article.content or article.title
         
@@ -55,13 +84,11 @@ Respond in JSON format only, no other text:
 }}"""
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=500,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = self._create_message("article", prompt, max_tokens=500)
+            
+            usage = getattr(response, "usage", None)
+            if usage:
+                self.last_usage = (usage.input_tokens, usage.output_tokens)
             
             # Parse the response
             response_text = response.content[0].text.strip()
@@ -98,13 +125,16 @@ Respond in JSON format only, no other text:
             article.processed = True
             article.processed_at = datetime.now(timezone.utc)
         
+        tags.record_article_tags(self.db, article)
+        rollups.record_article_processed(self.db, article.category)
         return article
     
     def process_unprocessed_articles(self, limit: int = 50) -> int:
         """Process all unprocessed articles."""
-        articles = self.db.query(Article).filter(
+        # Newest first, so a backlog never starves today's selection window
+        articles = self.db.query(Article).options(undefer(Article.content)).filter(
             Article.processed == False
-        ).limit(limit).all()
+        ).order_by(Article.published_at.desc()).limit(limit).all()
 
         processed_count = 0
 
@@ -114,24 +144,36 @@ Respond in JSON format only, no other text:
             self.db.commit()
             processed_count += 1
 
+            if self.on_event:
+                self.on_event(
+                    "article_processed",
+                    article_id=article.id,
+                    category=article.category,
+                    relevance_score=article.relevance_score,
+                    articles_done=processed_count,
+                    articles_total=len(articles)
+                )
+
         print(f"Processed {processed_count} articles.")
 
         return processed_count
     
     def select_top_articles_for_today(
         self,
-        articles_per_category: int = 5
+        articles_per_category: int = 5,
+        categories: Optional[list[str]] = None
     ) -> dict[str, list[Article]]:
         """
         Select the top articles for today based on relevance score.
         Features them by setting featured_date.
         Only considers articles published within the last 24 hours.
+        `categories` limits selection to some categories (default: all).
         """
         today = date.today()
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
         selected = {}
 
-        for category in settings.categories:
+        for category in categories or settings.categories:
             # Get processed articles in this category that haven't been featured
             # and were published within the last 24 hours
             articles = self.db.query(Article).filter(
@@ -152,34 +194,26 @@ Respond in JSON format only, no other text:
 
             selected[category] = articles
 
+        if any(selected.values()):
+            rollups.record_digest_changed(self.db, today)
+
         self.db.commit()
 
+        if any(selected.values()):
+            snapshots.publish_digest(self.db, today)
+        else:
+            # Nothing new to publish; don't let an earlier snapshot stand in for the database
+            snapshots.discard_digest(today)
+
+        if self.on_event:
+            self.on_event(
+                "selection_done",
+                featured_date=today.isoformat(),
+                featured={category: len(articles) for category, articles in selected.items()}
+            )
+
         return selected
     
-    def get_daily_digest(self, target_date: Optional[date] = None) -> dict:
-        """Get the daily digest for a specific date."""
-        if target_date is None:
-            target_date = date.today()
-        
-        digest = {
-            "date": target_date,
-            "categories": {},
-            "total_articles": 0
-        }
-        
-        for category in settings.categories:
-            articles = self.db.query(Article).filter(
-                and_(
-                    Article.category == category,
-                    Article.featured_date == target_date
-                )
-            ).order_by(Article.relevance_score.desc()).all()
-            
-            digest["categories"][category] = articles
-            digest["total_articles"] += len(articles)
-        
-        return digest
-
     def process_newsletter(self, newsletter: Newsletter) -> Newsletter:
         """Process a newsletter to generate an executive summary."""
         if newsletter.processed:
@@ -209,13 +243,7 @@ Provide an executive summary with the following structure:
 Format your response as clean, scannable bullet points. Be concise but comprehensive. Focus on information that security professionals would find most valuable."""
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1500,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = self._create_message("newsletter", prompt, max_tokens=1500)
 
             newsletter.executive_summary = response.content[0].text.strip()
             newsletter.processed = True
@@ -0,0 +1,59 @@
+import asyncio
+from datetime import date
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import desc, select
+
+from app import http_cache, queries, rollups, schemas
+from app.cache import CoalescingCache
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models import Newsletter
+
+settings = get_settings()
+
+_bootstrap_cache = CoalescingCache(
+    ttl_seconds=settings.bootstrap_cache_ttl_seconds,
+    stale_seconds=settings.cache_stale_seconds,
+    name="bootstrap"
+)
+
+
+async def _load_digest() -> dict:
+    """Available dates, and the digest of the most recent one."""
+    async with AsyncSessionLocal() as db:
+        dates = await queries.get_available_dates(db, limit=30)
+        digest = await queries.get_daily_digest(db, dates[0] if dates else date.today())
+    return {"dates": dates, "digest": digest}
+
+
+async def _load_newsletter():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Newsletter).order_by(desc(Newsletter.published_at)).limit(1)
+        )
+        newsletter = result.scalars().first()
+    return schemas.Newsletter.model_validate(newsletter).model_dump() if newsletter else None
+
+
+async def get_bootstrap() -> tuple[bytes, str]:
+    """
+    Rendered homepage payload and its ETag: the dates list, the latest
+    digest, stats and the newsletter summary. The parts load concurrently
+    on their own sessions; the rendered body is cached, concurrent misses
+    share one build, and an expired body is served while it refreshes.
+    """
+    return await _bootstrap_cache.get_or_compute("bootstrap", _build_bootstrap)
+
+
+async def _build_bootstrap() -> tuple[bytes, str]:
+    digest, stats, newsletter = await asyncio.gather(
+        _load_digest(), rollups.get_stats_snapshot(), _load_newsletter()
+    )
+    body = ORJSONResponse({**digest, "stats": stats, "newsletter": newsletter}).body
+    return body, http_cache.make_etag("bootstrap", body)
+
+
+def invalidate_bootstrap() -> None:
+    """Drop the cached payload after a fetch or newsletter job changed its data."""
+    _bootstrap_cache.invalidate()
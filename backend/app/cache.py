@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from app import metrics
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with a fixed time-to-live per entry.
+    With `max_entries`, the least recently used entries are evicted beyond
+    that many, so keys taken from requests can't grow it without bound.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0  # Bumped by every invalidate()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for key, replacing any existing entry, and drop expired ones."""
+        with self._lock:
+            now = time.monotonic()
+            for expired in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[expired]
+
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop a single entry, or every entry when no key is given."""
+        with self._lock:
+            self.generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async computations with the same key: the first
+    caller starts the work as a task, later callers await that same task.
+    The task is shielded, so a caller that disconnects doesn't cancel the
+    work the others are waiting on.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def start(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Return the in-flight task for key, starting compute() if there is none."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the result of compute(), shared with concurrent callers for key."""
+        return await asyncio.shield(self.start(key, compute))
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Background refreshes have no awaiter, so log their failures here
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Cache computation for {key!r} failed: {task.exception()}")
+
+
+class CoalescingCache:
+    """
+    TTL cache for async computations with request coalescing. A miss runs
+    one computation per key however many requests are waiting on it. With
+    `stale_seconds`, an expired value keeps being served for that long while
+    a single background refresh replaces it, so a hot key's expiry never
+    sends the herd to the database. invalidate() drops values outright, for
+    changes that must be visible on the next request.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        stale_seconds: float = 0,
+        name: str = "default",
+        max_entries: Optional[int] = None
+    ):
+        self.name = name  # Metrics label
+        self.ttl_seconds = ttl_seconds
+        self._cache = TTLCache(ttl_seconds=ttl_seconds + stale_seconds, max_entries=max_entries)
+        self._flight = SingleFlight()
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        # Computations started before an invalidation are not joined afterwards
+        generation = self._cache.generation
+        flight_key = (generation, key)
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            computed_at, value = entry
+            if time.monotonic() - computed_at >= self.ttl_seconds:
+                metrics.record_cache(self.name, "stale")
+                self._flight.start(flight_key, lambda: self._compute_and_store(key, compute, generation))
+            else:
+                metrics.record_cache(self.name, "hit")
+            return value
+
+        metrics.record_cache(self.name, "miss")
+        return await self._flight.do(flight_key, lambda: self._compute_and_store(key, compute, generation))
+
+    async def _compute_and_store(self, key: Hashable, compute: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        value = await compute()
+        # Don't store a value computed from data an invalidation has since replaced
+        if self._cache.generation == generation:
+            self._cache.set(key, (time.monotonic(), value))
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        self._cache.invalidate(key)
@@ -8,13 +8,67 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./data/news.db"
+    database_read_url: str = ""  # Optional read replica for the read-only endpoints
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # Seconds to wait for a free connection
+    db_pool_recycle: int = 280
+    db_pgbouncer: bool = False  # Transaction-mode pooler in front: no server-side prepared statements
     
     # Anthropic API
     anthropic_api_key: str = ""
+    anthropic_base_url: str = ""  # Alternate API endpoint, e.g. the ingestion benchmark's fake (empty: Anthropic)
     
     # Fetching settings
     articles_per_category: int = 5
     fetch_schedule_hours: int = 24
+
+    # Job runner (python -m app.worker)
+    embedded_worker: bool = False  # Run jobs inside the API process instead, for single-process setups
+    worker_concurrency: dict[str, int] = {"fetch": 1, "newsletter": 1, "retention": 1}  # Concurrent jobs per type, per runner
+    worker_poll_interval_seconds: float = 2.0
+    worker_heartbeat_seconds: float = 15.0  # How often a runner refreshes the lease of a job it's running
+    worker_lease_seconds: int = 120  # A running job without a heartbeat for this long has lost its runner
+    job_max_attempts: int = 3  # Runs of a job that lost its runner before it is failed instead of requeued
+    worker_metrics_port: int = 9101  # Prometheus endpoint of the job runner (0 disables)
+    leader_check_seconds: int = 30  # How often replicas retry for the scheduler leader lock
+
+    # Fetch pipeline
+    pipeline_fetch_workers: int = 4  # Feeds downloaded at once
+    pipeline_ai_workers: int = 4  # Articles sent to Claude at once
+    pipeline_queue_size: int = 10  # Work buffered between stages before upstream waits
+
+    # Caching
+    stats_cache_ttl_seconds: int = 30
+    bootstrap_cache_ttl_seconds: int = 30
+    digest_cache_ttl_seconds: int = 300  # Keyed by digest version, so never stale
+    digest_cache_max_entries: int = 256  # Least recently used dates are evicted beyond this
+    cache_stale_seconds: int = 300  # How long an expired value may be served while it refreshes
+    cache_max_age_seconds: int = 60  # Browser/CDN max-age for data that changes at fetch time
+    cache_immutable_max_age_seconds: int = 86400  # Max-age for past digest dates
+
+    # Responses smaller than this are sent uncompressed
+    compression_minimum_size: int = 1024
+
+    # Stored article and newsletter bodies (see app.types.CompressedText)
+    zstd_level: int = 9
+    zstd_dictionary: str = ""  # Trained dictionary for article HTML, from benchmarks.compression (empty: none)
+
+    # Precompressed digest snapshots written at selection time (empty disables)
+    snapshot_dir: str = "./data/snapshots"
+
+    # Article retention (see app.retention), run daily at 03:00 UTC
+    retention_content_days: int = 30  # Drop raw content of unfeatured articles after this many days (0 keeps it)
+    retention_archive_days: int = 365  # Move unfeatured articles to articles_archive after this many days (0 keeps them)
+    retention_batch_size: int = 1000  # Rows changed per transaction
+    retention_vacuum: bool = True  # VACUUM/ANALYZE after a run that changed anything
+
+    # Profiling (see app.profiling)
+    profile_token: str = ""  # Enables the X-Profile-Token header and /api/profiles (empty disables)
+    profile_request_sample_rate: float = 0.0  # Fraction of API requests profiled without the header
+    profile_job_sample_rate: float = 0.0  # Fraction of fetch/newsletter jobs profiled (1.0 = every run)
+    profile_dir: str = "./data/profiles"
+    profile_keep: int = 100  # Oldest profiles beyond this are deleted
     
     # Categories
     categories: list[str] = ["cyber", "ai", "cloud", "crypto"]
@@ -1,9 +1,33 @@
+from pathlib import Path
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import get_settings
 
 settings = get_settings()
 
+
+def _pool_args(database_url: str) -> dict:
+    """
+    Pool settings shared by every engine. SQLite uses SQLAlchemy's default
+    pools, which don't take size limits.
+    """
+    args = {
+        "pool_pre_ping": True,  # Test connections before use (detects stale/dropped connections)
+        "pool_recycle": settings.db_pool_recycle,  # Recycle before the Supabase pooler timeout (300s)
+    }
+    if make_url(database_url).get_backend_name() != "sqlite":
+        args.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return args
+
+
 # Create engine - handle SQLite vs PostgreSQL
 connect_args = {}
 if settings.database_url.startswith("sqlite"):
@@ -13,14 +37,69 @@ engine = create_engine(
     settings.database_url,
     connect_args=connect_args,
     echo=False,  # Set to True for SQL debugging
-    pool_pre_ping=True,  # Test connections before use (detects stale/dropped connections)
-    pool_recycle=280,  # Recycle connections before Supabase pooler timeout (300s)
+    **_pool_args(settings.database_url),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_engine_args(database_url: str) -> tuple[str, dict]:
+    """
+    Map the sync DATABASE_URL onto its async driver (asyncpg or aiosqlite).
+    asyncpg does not understand libpq's sslmode query parameter, so it is
+    translated into asyncpg's ssl connect argument.
+
+    Behind PgBouncer in transaction mode (DB_PGBOUNCER), consecutive
+    statements may run on different server connections, so asyncpg must not
+    cache prepared statements, and the ones it does prepare get unique names.
+    """
+    url = make_url(database_url)
+    async_connect_args = {}
+
+    if url.get_backend_name() == "postgresql":
+        sslmode = url.query.get("sslmode")
+        url = url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+        if sslmode and sslmode != "disable":
+            async_connect_args["ssl"] = sslmode
+        if settings.db_pgbouncer:
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+            async_connect_args["statement_cache_size"] = 0
+            async_connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    return url.render_as_string(hide_password=False), async_connect_args
+
+
+def _create_async_engine(database_url: str):
+    async_database_url, async_connect_args = _async_engine_args(database_url)
+    return create_async_engine(
+        async_database_url,
+        connect_args=async_connect_args,
+        echo=False,
+        **_pool_args(database_url),
+    )
+
+
+# Async engines for the read endpoints, so queries don't block the event loop.
+# Reads go to DATABASE_READ_URL when a replica is configured, keeping user
+# traffic off the primary that the fetch pipeline writes to.
+async_engine = _create_async_engine(settings.database_url)
+async_read_engine = (
+    _create_async_engine(settings.database_read_url) if settings.database_read_url else async_engine
+)
+
+# Read-only sessions, served by the replica when one is configured
+AsyncSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Sessions for reads that must see the pipeline's latest writes (job status)
+AsyncPrimarySessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
 Base = declarative_base()
 
+# Revision matching the schema that create_all produced before migrations
+BASELINE_REVISION = "0001"
+
 
 def get_db():
     """Dependency for getting database sessions."""
@@ -31,8 +110,41 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting async read-only sessions (replica if configured)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_primary_async_db():
+    """Dependency for async reads that must not lag behind the primary."""
+    async with AsyncPrimarySessionLocal() as db:
+        yield db
+
+
 def init_db():
-    """Initialize database tables."""
-    from app import models  # Import models to register them
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    """
+    Bring the database schema up to date with Alembic migrations.
+    Databases created by the old create_all path have tables but no
+    alembic_version, so they are stamped at the baseline revision first.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import inspect
+    from app.rollups import ensure_category_stats
+
+    alembic_cfg = Config(str(Path(__file__).resolve().parent.parent / "alembic.ini"))
+
+    inspector = inspect(engine)
+    if inspector.has_table("articles") and not inspector.has_table("alembic_version"):
+        command.stamp(alembic_cfg, BASELINE_REVISION)
+        print(f"Existing schema stamped at baseline revision {BASELINE_REVISION}.")
+
+    command.upgrade(alembic_cfg, "head")
+    print("Database migrations applied successfully!")
+
+    db = SessionLocal()
+    try:
+        ensure_category_stats(db)
+    finally:
+        db.close()
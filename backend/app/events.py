@@ -0,0 +1,215 @@
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Optional
+
+import orjson
+from sqlalchemy import text
+
+from app.database import async_engine, engine
+
+# Event types that end a fetch job's stream
+TERMINAL_EVENTS = ("job_completed", "job_failed")
+
+# Channel the job runner announces finished jobs on
+JOBS_CHANNEL = "jobs"
+
+# PostgreSQL NOTIFY channel carrying events from the job runner to the API
+RELAY_CHANNEL = "news_job_events"
+
+_END = object()
+
+
+class _Channel:
+    def __init__(self, history_size: int):
+        self.history = deque(maxlen=history_size)
+        self.subscribers: set[asyncio.Queue] = set()
+        self.closed = False
+        self.sequence = 0
+
+
+class EventBroker:
+    """
+    In-process fan-out of job progress events to any number of async
+    subscribers. Jobs publish from worker threads; delivery always happens
+    on the event loop, so subscribers never touch the database.
+
+    Each channel keeps its recent history, so a viewer that connects
+    mid-job first receives everything published so far.
+    """
+
+    def __init__(self, history_size: int = 500, max_channels: int = 20):
+        self.history_size = history_size
+        self.max_channels = max_channels
+        self._channels: OrderedDict = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach the broker to the event loop that serves subscribers."""
+        self._loop = loop
+
+    @property
+    def bound(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+
+    def has_channel(self, channel) -> bool:
+        return channel in self._channels
+
+    def publish(self, channel, event_type: str, **data) -> None:
+        """Publish an event from any thread. A no-op until bind() is called."""
+        self.publish_event(channel, make_event(event_type, **data))
+
+    def publish_event(self, channel, event: dict) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            self._deliver(channel, event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, channel, event)
+
+    def _channel(self, channel) -> _Channel:
+        state = self._channels.get(channel)
+        if state is None:
+            state = self._channels[channel] = _Channel(self.history_size)
+            self._evict()
+        return state
+
+    def _evict(self) -> None:
+        """Forget the oldest channels nobody is listening to, finished ones first."""
+        for want_closed in (True, False):
+            for key in list(self._channels):
+                if len(self._channels) <= self.max_channels:
+                    return
+                state = self._channels[key]
+                if not state.subscribers and state.closed == want_closed:
+                    del self._channels[key]
+
+    def _deliver(self, channel, event: dict) -> None:
+        state = self._channel(channel)
+        if state.closed:
+            return
+
+        state.sequence += 1
+        event["id"] = state.sequence
+        state.history.append(event)
+        if event["type"] in TERMINAL_EVENTS:
+            state.closed = True
+
+        for queue in state.subscribers:
+            self._put(queue, event)
+            if state.closed:
+                self._put(queue, _END)
+
+    def _put(self, queue: asyncio.Queue, item) -> None:
+        # A viewer that can't keep up loses its oldest events, never the job
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    async def subscribe(self, channel, keepalive: Optional[float] = None) -> AsyncIterator[Optional[dict]]:
+        """
+        Yield the channel's history, then live events until the job ends.
+        With `keepalive`, yields None after that many idle seconds so the
+        caller can keep the connection open.
+        """
+        state = self._channel(channel)
+        queue = asyncio.Queue(maxsize=self.history_size + 1)
+        for event in state.history:
+            queue.put_nowait(event)
+        if state.closed:
+            queue.put_nowait(_END)
+
+        state.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item is _END:
+                    return
+                yield item
+        finally:
+            state.subscribers.discard(queue)
+
+
+def make_event(event_type: str, **data) -> dict:
+    return {"type": event_type, "at": datetime.now(timezone.utc).isoformat(), **data}
+
+
+broker = EventBroker()
+
+
+def fetch_channel(log_id: int) -> str:
+    return f"fetch:{log_id}"
+
+
+def publish(channel, event_type: str, **data) -> None:
+    """
+    Publish to the API's subscribers: straight to the broker when the job
+    runs in the API process, otherwise through PostgreSQL NOTIFY. Without
+    PostgreSQL, events from a separate job runner are dropped.
+    """
+    if broker.bound:
+        broker.publish(channel, event_type, **data)
+    elif engine.dialect.name == "postgresql":
+        _notify(channel, make_event(event_type, **data))
+
+
+def publish_fetch_event(log_id: int, event_type: str, **data) -> None:
+    """Publish a progress event for a fetch job."""
+    publish(fetch_channel(log_id), event_type, log_id=log_id, **data)
+
+
+def _notify(channel, event: dict) -> None:
+    # Progress reporting must never fail the job
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:relay, :payload)"),
+                {"relay": RELAY_CHANNEL, "payload": orjson.dumps({"channel": channel, "event": event}).decode()}
+            )
+    except Exception as e:
+        print(f"Failed to relay {event['type']} event on {channel}: {e}")
+
+
+async def relay_events(on_job_finished: Callable[[dict], None], retry_seconds: float = 5) -> None:
+    """
+    Feed events NOTIFYed by job runners into this process's broker, until
+    cancelled. Holds one connection with LISTEN, so it must reach PostgreSQL
+    directly or through a session-mode pooler.
+    """
+    def deliver(connection, pid, relay, payload):
+        message = orjson.loads(payload)
+        if message["channel"] == JOBS_CHANNEL:
+            on_job_finished(message["event"])
+        else:
+            broker.publish_event(message["channel"], message["event"])
+
+    while True:
+        try:
+            async with async_engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                listener = raw.driver_connection
+                closed = asyncio.Event()
+                listener.add_termination_listener(lambda connection: closed.set())
+                await listener.add_listener(RELAY_CHANNEL, deliver)
+                print("Listening for job runner events.")
+                try:
+                    await closed.wait()
+                finally:
+                    if not listener.is_closed():
+                        await listener.remove_listener(RELAY_CHANNEL, deliver)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Job runner event relay failed: {e}")
+        await asyncio.sleep(retry_seconds)
@@ -0,0 +1,127 @@
+"""
+Timing and resource accounting for fetch jobs. The pipeline records into a
+RunMetrics while it runs; the rows are saved with the job's FetchLog and
+summarized (totals and percentiles) by /api/fetch/logs/{id}.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import FetchMetric
+
+# Pipeline stages, in the order a feed's articles pass through them
+STAGES = ("source_sync", "download", "parse", "dedup", "insert", "ai", "selection")
+
+
+class RunMetrics:
+    """Thread-safe collector for one fetch job."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stage_ms = defaultdict(float)
+        self._stage_count = defaultdict(int)
+        self._stage_samples = defaultdict(list)
+        self._rows: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Add the time spent in the block to a stage's total."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, (time.perf_counter() - start) * 1000)
+
+    def add_stage(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self._stage_ms[name] += duration_ms
+            self._stage_count[name] += 1
+            self._stage_samples[name].append(duration_ms)
+
+    def stage_samples(self) -> dict[str, list[float]]:
+        """Every recorded duration of each stage, for percentiles."""
+        with self._lock:
+            return {name: list(samples) for name, samples in self._stage_samples.items()}
+
+    def record_source(self, name: str, duration_ms: float, bytes: Optional[int], entries: int) -> None:
+        with self._lock:
+            self._rows.append({
+                "kind": "source", "name": name[:255], "duration_ms": duration_ms,
+                "bytes": bytes, "count": entries
+            })
+
+    def record_article(
+        self,
+        article_id: int,
+        title: str,
+        duration_ms: float,
+        input_tokens: Optional[int],
+        output_tokens: Optional[int]
+    ) -> None:
+        with self._lock:
+            self._rows.append({
+                "kind": "article", "name": (title or "")[:255], "article_id": article_id,
+                "duration_ms": duration_ms, "input_tokens": input_tokens, "output_tokens": output_tokens
+            })
+
+    def save(self, db: Session, fetch_log_id: int) -> None:
+        """Insert the collected rows. The caller commits."""
+        with self._lock:
+            rows = [
+                {"kind": "stage", "name": name, "duration_ms": self._stage_ms[name], "count": self._stage_count[name]}
+                for name in self._stage_ms
+            ] + self._rows
+        db.add_all(FetchMetric(fetch_log_id=fetch_log_id, **row) for row in rows)
+
+
+def percentiles(values: list[float], points: tuple[float, ...] = (0.5, 0.9, 0.99)) -> dict:
+    """Nearest-rank percentiles (p50/p90/p99 by default) and max."""
+    ordered = sorted(values)
+
+    def rank(p: float):
+        if not ordered:
+            return None
+        return round(ordered[max(0, math.ceil(p * len(ordered)) - 1)], 1)
+
+    return {"count": len(ordered), **{f"p{round(p * 100)}": rank(p) for p in points}, "max": rank(1.0)}
+
+
+async def get_summary(db: AsyncSession, fetch_log_id: int) -> dict:
+    """Stage totals, and latency percentiles and totals for sources and AI calls."""
+    result = await db.execute(select(FetchMetric).where(FetchMetric.fetch_log_id == fetch_log_id))
+    metrics = list(result.scalars())
+
+    stages = {
+        m.name: {"total_ms": round(m.duration_ms, 1), "count": m.count}
+        for m in sorted(metrics, key=lambda m: STAGES.index(m.name) if m.name in STAGES else len(STAGES))
+        if m.kind == "stage"
+    }
+    sources = [m for m in metrics if m.kind == "source"]
+    articles = [m for m in metrics if m.kind == "article"]
+
+    return {
+        "stages": stages,
+        "sources": {
+            "latency_ms": percentiles([m.duration_ms for m in sources]),
+            "bytes_total": sum(m.bytes or 0 for m in sources),
+            "entries_total": sum(m.count or 0 for m in sources),
+            "slowest": [
+                {"name": m.name, "duration_ms": round(m.duration_ms, 1), "bytes": m.bytes, "entries": m.count}
+                for m in sorted(sources, key=lambda m: m.duration_ms, reverse=True)[:5]
+            ],
+        },
+        "articles": {
+            "latency_ms": percentiles([m.duration_ms for m in articles]),
+            "input_tokens": percentiles([m.input_tokens for m in articles if m.input_tokens is not None]),
+            "output_tokens": percentiles([m.output_tokens for m in articles if m.output_tokens is not None]),
+            "input_tokens_total": sum(m.input_tokens or 0 for m in articles),
+            "output_tokens_total": sum(m.output_tokens or 0 for m in articles),
+        },
+    }
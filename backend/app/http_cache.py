@@ -0,0 +1,68 @@
+import hashlib
+from datetime import date
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.config import get_settings
+from app.responses import ETAG_ENCODING_SUFFIXES
+
+settings = get_settings()
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that determine a response's content."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def cache_control(immutable: bool = False) -> str:
+    """
+    Cache-Control value for public read endpoints. Past digest dates never
+    change once selected, everything else may change at the next fetch.
+    """
+    if immutable:
+        return f"public, max-age={settings.cache_immutable_max_age_seconds}"
+    return f"public, max-age={settings.cache_max_age_seconds}, must-revalidate"
+
+
+def is_past_date(value: Optional[date]) -> bool:
+    """Whether a digest date is before today, and therefore immutable."""
+    return value is not None and value < date.today()
+
+
+def _strip_encoding_suffix(tag: str) -> str:
+    """Map the ETag of a compressed representation back to the base ETag."""
+    for suffix in ETAG_ENCODING_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return any(_strip_encoding_suffix(tag) == etag for tag in candidates)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control_value: str
+) -> Optional[Response]:
+    """
+    Attach ETag and Cache-Control to the outgoing response. If the client
+    already holds this version, return a 304 response to send instead.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control_value}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
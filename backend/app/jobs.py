@@ -0,0 +1,322 @@
+"""
+DB-backed job queue. The API and the scheduler only enqueue; the job runner
+(`python -m app.worker`) claims queued jobs and runs them in its own
+process, so ingestion never takes request capacity from the API.
+
+A runner refreshes the heartbeat of each job it runs. A running job whose
+heartbeat is older than WORKER_LEASE_SECONDS lost its runner (crashed or
+killed): the next claim of its type requeues it, or fails it with its fetch
+log once it has been tried JOB_MAX_ATTEMPTS times.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import bootstrap, events, profiling, retention, rollups
+from app.ai_processor import AIProcessor
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import FetchLog, Job
+from app.newsletter_fetcher import NewsletterFetcher
+from app.pipeline import FetchPipeline
+
+settings = get_settings()
+
+FETCH = "fetch"
+NEWSLETTER = "newsletter"
+RETENTION = "retention"
+
+# Scheduled runs. Each run gets a dedupe key (schedule id and UTC date), so
+# it is queued once however many schedulers fire it.
+DAILY_FETCH = "daily_fetch"
+DAILY_NEWSLETTER = "daily_newsletter"
+DAILY_RETENTION = "daily_retention"
+
+
+def scheduled_key(schedule_id: str) -> str:
+    return f"{schedule_id}:{datetime.now(timezone.utc).date().isoformat()}"
+
+
+def enqueue(db: Session, job_type: str, payload: Optional[dict] = None, dedupe_key: Optional[str] = None) -> Job:
+    """Add a job to the queue. The caller commits."""
+    job = Job(type=job_type, status="queued", payload=payload or {}, attempts=0, dedupe_key=dedupe_key)
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _job_for_key(db: Session, dedupe_key: Optional[str]) -> Optional[Job]:
+    if dedupe_key is None:
+        return None
+    return db.execute(select(Job).where(Job.dedupe_key == dedupe_key)).scalar()
+
+
+def enqueue_fetch(db: Session, dedupe_key: Optional[str] = None) -> FetchLog:
+    """
+    Queue the fetch pipeline, with the log its progress is reported on. If
+    a job with the same dedupe key exists, no new one is queued and its
+    log is returned.
+    """
+    existing = _job_for_key(db, dedupe_key)
+    if existing:
+        return db.get(FetchLog, existing.payload["log_id"])
+
+    try:
+        fetch_log = FetchLog(status="queued")
+        db.add(fetch_log)
+        db.flush()
+        enqueue(db, FETCH, {"log_id": fetch_log.id}, dedupe_key)
+        db.commit()
+    except IntegrityError:
+        # Another scheduler queued the same run first
+        db.rollback()
+        return db.get(FetchLog, _job_for_key(db, dedupe_key).payload["log_id"])
+
+    db.refresh(fetch_log)
+    return fetch_log
+
+
+def enqueue_newsletter(db: Session, dedupe_key: Optional[str] = None) -> Job:
+    return _enqueue_once(db, NEWSLETTER, dedupe_key)
+
+
+def enqueue_retention(db: Session, dedupe_key: Optional[str] = None) -> Job:
+    return _enqueue_once(db, RETENTION, dedupe_key)
+
+
+def _enqueue_once(db: Session, job_type: str, dedupe_key: Optional[str]) -> Job:
+    """Queue and commit a job without payload, unless one with the dedupe key exists."""
+    existing = _job_for_key(db, dedupe_key)
+    if existing:
+        return existing
+
+    try:
+        job = enqueue(db, job_type, dedupe_key=dedupe_key)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return _job_for_key(db, dedupe_key)
+    return job
+
+
+def reclaim_stale(db: Session, job_type: str) -> None:
+    """Requeue, or fail after JOB_MAX_ATTEMPTS, running jobs of a type whose runner stopped heartbeating."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.worker_lease_seconds)
+    # Jobs claimed before heartbeats existed only have started_at
+    last_seen = func.coalesce(Job.heartbeat_at, Job.started_at)
+    stale = db.execute(
+        select(Job.id, Job.attempts, Job.payload)
+        .where(Job.status == "running", Job.type == job_type, last_seen < cutoff)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    failed_logs = []
+    for job_id, attempts, payload in stale:
+        retry = attempts < settings.job_max_attempts
+        error = None if retry else f"Runner stopped responding after {attempts} attempts"
+        reclaimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", last_seen < cutoff)
+            .values(
+                status="queued" if retry else "failed",
+                worker=None,
+                error=error,
+                completed_at=None if retry else datetime.now(timezone.utc)
+            )
+        )
+        if reclaimed.rowcount != 1:
+            continue
+
+        log_id = (payload or {}).get("log_id")
+        fetch_log = db.get(FetchLog, log_id) if job_type == FETCH and log_id else None
+        if fetch_log:
+            fetch_log.status = "queued" if retry else "failed"
+            if not retry:
+                fetch_log.errors = [error]
+                fetch_log.completed_at = datetime.now(timezone.utc)
+                failed_logs.append((log_id, error))
+        print(f"Job {job_id} ({job_type}) lost its runner; {'requeued' if retry else 'failed'}")
+    db.commit()
+
+    # Ends the progress streams still waiting on the failed jobs
+    for log_id, error in failed_logs:
+        events.publish_fetch_event(log_id, "job_failed", error=error)
+
+
+def claim(db: Session, job_type: str, worker: str) -> Optional[Job]:
+    """
+    Mark the oldest queued job of a type as running and return it, after
+    reclaiming jobs of that type whose runner died. On PostgreSQL, runners
+    skip rows another runner has locked instead of waiting on them; the
+    conditional update makes the claim safe on SQLite, which has no row
+    locks.
+    """
+    reclaim_stale(db, job_type)
+
+    job_id = db.execute(
+        select(Job.id)
+        .where(Job.status == "queued", Job.type == job_type)
+        .order_by(Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar()
+    if job_id is None:
+        db.rollback()
+        return None
+
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "queued")
+        .values(
+            status="running",
+            worker=worker,
+            attempts=Job.attempts + 1,
+            started_at=datetime.now(timezone.utc),
+            heartbeat_at=datetime.now(timezone.utc)
+        )
+    )
+    db.commit()
+    if claimed.rowcount != 1:
+        return None
+    return db.get(Job, job_id)
+
+
+def heartbeat(db: Session, job_id: int, worker: str) -> bool:
+    """Extend the lease of a running job. False if it is no longer this runner's."""
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.worker == worker)
+        .values(heartbeat_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def finish(db: Session, job: Job, worker: str, error: Optional[str] = None) -> bool:
+    """Record a job's outcome. False if it was reclaimed from the runner meanwhile, which then wins."""
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "running", Job.worker == worker)
+        .values(
+            status="failed" if error else "completed",
+            error=error,
+            completed_at=datetime.now(timezone.utc)
+        )
+    )
+    db.commit()
+    db.refresh(job)
+    return result.rowcount == 1
+
+
+@profiling.profiled("fetch")
+def run_fetch_job(log_id: int):
+    """Fetch, process and select, reporting progress on the fetch log."""
+    db = SessionLocal()
+
+    def publish(event_type: str, **data):
+        events.publish_fetch_event(log_id, event_type, **data)
+
+    pipeline = None
+    try:
+        fetch_log = db.query(FetchLog).filter(FetchLog.id == log_id).first()
+        fetch_log.status = "running"
+        db.commit()
+        publish("job_started")
+
+        # Fetch, process with AI and select today's top articles, overlapped
+        pipeline = FetchPipeline(db, on_event=publish)
+        fetched, processed = pipeline.run(articles_per_source=5, process_limit=100)
+        fetch_log.articles_fetched = fetched
+        fetch_log.articles_processed = processed
+
+        fetch_log.status = "completed"
+        fetch_log.completed_at = datetime.now(timezone.utc)
+        pipeline.metrics.save(db, log_id)
+        db.commit()
+        rollups.invalidate_stats()
+        bootstrap.invalidate_bootstrap()
+        publish(
+            "job_completed",
+            articles_fetched=fetch_log.articles_fetched,
+            articles_processed=fetch_log.articles_processed
+        )
+
+    except Exception as e:
+        print(f"Fetch job {log_id} failed: {e}")
+        publish("job_failed", error=str(e))
+        try:
+            db.rollback()
+            fetch_log = db.query(FetchLog).filter(FetchLog.id == log_id).first()
+            if fetch_log:
+                fetch_log.status = "failed"
+                fetch_log.errors = [str(e)]
+                fetch_log.completed_at = datetime.now(timezone.utc)
+                if pipeline:
+                    pipeline.metrics.save(db, log_id)
+                db.commit()
+        except Exception as rollback_err:
+            print(f"Fetch job {log_id} failed to update log after error: {rollback_err}")
+        raise
+
+    finally:
+        db.close()
+
+
+@profiling.profiled("newsletter")
+def run_newsletter_job():
+    """Fetch the latest newsletter and summarize it."""
+    db = SessionLocal()
+
+    try:
+        # Fetch latest newsletter
+        fetcher = NewsletterFetcher(db)
+        newsletter = fetcher.fetch_latest()
+
+        if newsletter and not newsletter.processed:
+            # Process with AI
+            processor = AIProcessor(db)
+            processor.process_newsletter(newsletter)
+            print(f"Newsletter processed: {newsletter.title[:50]}...")
+
+        bootstrap.invalidate_bootstrap()
+
+    except Exception as e:
+        print(f"Error in newsletter job: {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        raise
+
+    finally:
+        db.close()
+
+
+@profiling.profiled("retention")
+def run_retention_job():
+    """Drop old article content, archive old articles and vacuum."""
+    db = SessionLocal()
+
+    try:
+        retention.apply_retention(db)
+    except Exception as e:
+        print(f"Error in retention job: {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        raise
+
+    finally:
+        db.close()
+
+
+# Job type -> callable taking the job's payload
+HANDLERS: dict[str, Callable[[dict], None]] = {
+    FETCH: lambda payload: run_fetch_job(payload["log_id"]),
+    NEWSLETTER: lambda payload: run_newsletter_job(),
+    RETENTION: lambda payload: run_retention_job(),
+}
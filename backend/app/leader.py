@@ -0,0 +1,108 @@
+"""
+Leader election for the scheduler. Every API replica runs APScheduler, but
+only the one holding the leader lock queues scheduled jobs; the others keep
+retrying, so a replacement takes over within one check interval if the
+leader goes away.
+
+On PostgreSQL the lock is a session-level advisory lock on a dedicated
+connection, released by the server when that connection drops (it needs a
+direct or session-mode connection; transaction-mode poolers don't keep
+session locks). On SQLite, where every replica shares one host, it is an
+exclusive lock on a file next to the database.
+"""
+import fcntl
+import threading
+import zlib
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+
+
+class LeaderElection:
+    def __init__(self, name: str):
+        self.name = name
+        self._held = False
+        self._connection: Optional[Connection] = None
+        self._lock_file = None
+        # Scheduled jobs and the periodic check call in from different threads
+        self._mutex = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._held
+
+    def try_acquire(self) -> bool:
+        """Take the lock if it is free, or confirm we still hold it."""
+        with self._mutex:
+            if engine.dialect.name == "postgresql":
+                return self._try_advisory_lock()
+            return self._try_file_lock()
+
+    def release(self) -> None:
+        with self._mutex:
+            self._release()
+
+    def _release(self) -> None:
+        self._held = False
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _try_advisory_lock(self) -> bool:
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT 1"))
+                self._connection.commit()
+                return True
+            except Exception as e:
+                print(f"Lost scheduler leadership ({self.name}): {e}")
+                self._release()
+
+        key = zlib.crc32(self.name.encode())
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+            # Leave no transaction open while the connection sits holding the lock
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+
+        self._connection = connection
+        self._held = True
+        print(f"Acquired scheduler leadership ({self.name}).")
+        return True
+
+    def _try_file_lock(self) -> bool:
+        if self._held:
+            return True
+
+        database = engine.url.database
+        if not database or database == ":memory:":
+            # A private in-memory database can't be shared with another process
+            self._held = True
+            return True
+
+        lock_file = open(f"{database}.{self.name}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        self._held = True
+        print(f"Acquired scheduler leadership ({self.name}).")
+        return True
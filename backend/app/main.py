@@ -1,53 +1,93 @@
+import asyncio
 from datetime import datetime, date, timezone, timedelta
-from typing import Optional
+from typing import Literal, Optional
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc, text
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, joinedload, undefer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import LargeBinary, desc, select, text, type_coerce
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import httpx
+import orjson
 
-from app.database import get_db, init_db
+from app.database import SessionLocal, get_db, get_async_db, get_primary_async_db, init_db
 from app.models import Article, Source, FetchLog, Newsletter
-from app import schemas
-from app.rss_fetcher import RSSFetcher
-from app.ai_processor import AIProcessor
-from app.newsletter_fetcher import NewsletterFetcher
+from app import schemas, rollups, queries, http_cache, search, tags, events, snapshots, bootstrap, jobs, fetch_metrics, metrics, profiling
+from app.worker import create_worker
+from app.leader import LeaderElection
 from app.config import get_settings
+from app.pagination import (
+    ARTICLE_ORDER, article_cursor, decode_article_cursor, article_keyset_filter
+)
+from app.responses import CompressionMiddleware, choose_encoding, encoded_etag, json_response
+from app.types import GZIP_MAGIC, ZSTD_MAGIC, decompress_text, zstd_dict_id
 
 settings = get_settings()
 
 scheduler = AsyncIOScheduler()
 
+# Only the replica holding this lock queues scheduled jobs
+leader = LeaderElection("scheduler")
+
+
+def scheduled_fetch():
+    """Queue the day's fetch on schedule, if this replica is the scheduler leader."""
+    if not _is_leader():
+        return
+    print("APScheduler: Queueing scheduled fetch...")
+    db = SessionLocal()
+    try:
+        fetch_log = jobs.enqueue_fetch(db, jobs.scheduled_key(jobs.DAILY_FETCH))
+        print(f"APScheduler: Fetch job queued (log {fetch_log.id})")
+    except Exception as e:
+        print(f"APScheduler: Failed to queue fetch: {e}")
+    finally:
+        db.close()
+
 
-async def scheduled_fetch():
-    """Trigger the fetch pipeline on schedule."""
-    print("APScheduler: Triggering scheduled fetch...")
+def scheduled_newsletter():
+    """Queue the day's newsletter fetch on schedule, if this replica is the scheduler leader."""
+    if not _is_leader():
+        return
+    print("APScheduler: Queueing scheduled newsletter fetch...")
+    db = SessionLocal()
+    try:
+        job = jobs.enqueue_newsletter(db, jobs.scheduled_key(jobs.DAILY_NEWSLETTER))
+        print(f"APScheduler: Newsletter job queued (job {job.id})")
+    except Exception as e:
+        print(f"APScheduler: Failed to queue newsletter fetch: {e}")
+    finally:
+        db.close()
+
+
+def scheduled_retention():
+    """Queue the day's retention run on schedule, if this replica is the scheduler leader."""
+    if not _is_leader():
+        return
+    db = SessionLocal()
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post("http://localhost:8000/api/fetch/trigger", timeout=30.0)
-            if resp.status_code == 200:
-                print(f"APScheduler: Fetch trigger succeeded ({resp.status_code})")
-            else:
-                print(f"APScheduler: Fetch trigger returned unexpected status {resp.status_code}: {resp.text}")
+        job = jobs.enqueue_retention(db, jobs.scheduled_key(jobs.DAILY_RETENTION))
+        print(f"APScheduler: Retention job queued (job {job.id})")
     except Exception as e:
-        print(f"APScheduler: Fetch trigger failed: {e}")
+        print(f"APScheduler: Failed to queue retention: {e}")
+    finally:
+        db.close()
 
 
-async def scheduled_newsletter():
-    """Trigger newsletter fetch on schedule."""
-    print("APScheduler: Triggering scheduled newsletter fetch...")
+def _is_leader() -> bool:
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post("http://localhost:8000/api/newsletter/trigger", timeout=30.0)
-            if resp.status_code == 200:
-                print(f"APScheduler: Newsletter trigger succeeded ({resp.status_code})")
-            else:
-                print(f"APScheduler: Newsletter trigger returned unexpected status {resp.status_code}: {resp.text}")
+        return leader.try_acquire()
     except Exception as e:
-        print(f"APScheduler: Newsletter trigger failed: {e}")
+        print(f"APScheduler: Leader election failed: {e}")
+        return False
+
+
+def _job_finished(event: dict):
+    """A job in a separate runner changed the data behind the cached payloads."""
+    rollups.invalidate_stats()
+    bootstrap.invalidate_bootstrap()
 
 
 @asynccontextmanager
@@ -56,14 +96,33 @@ async def lifespan(app):
     # Startup
     init_db()
     print("Database initialized.")
+    metrics.setup()
+    profiling.setup()
+    events.broker.bind(asyncio.get_running_loop())
+    relay = None
+    if settings.database_url.startswith("postgresql"):
+        relay = asyncio.create_task(events.relay_events(on_job_finished=_job_finished))
+    worker = None
+    if settings.embedded_worker:
+        worker = create_worker()
+        worker.start()
+    _is_leader()
     scheduler.add_job(scheduled_fetch, CronTrigger(hour=12, minute=0), id="daily_fetch", misfire_grace_time=3600)
     scheduler.add_job(scheduled_newsletter, CronTrigger(hour=12, minute=5), id="daily_newsletter", misfire_grace_time=3600)
+    scheduler.add_job(scheduled_retention, CronTrigger(hour=3, minute=0), id="daily_retention", misfire_grace_time=3600)
+    # Keep the leader lock held, or take it over from a replica that went away
+    scheduler.add_job(_is_leader, "interval", seconds=settings.leader_check_seconds, id="leader_election")
     scheduler.start()
-    print("APScheduler started: fetch at 12:00 UTC, newsletter at 12:05 UTC")
+    print("APScheduler started: fetch at 12:00 UTC, newsletter at 12:05 UTC, retention at 03:00 UTC")
     yield
     # Shutdown
     scheduler.shutdown()
     print("APScheduler shut down.")
+    leader.release()
+    if worker:
+        worker.stop()
+    if relay:
+        relay.cancel()
 
 
 app = FastAPI(
@@ -71,6 +130,7 @@ app = FastAPI(
     description="AI-powered news aggregation for Cyber Security, AI, Cloud, and Crypto",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for frontend
@@ -84,16 +144,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+app.add_middleware(profiling.ProfilingMiddleware)
+
+# Outermost, so latency includes compression
+app.add_middleware(metrics.MetricsMiddleware)
+
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Request, query, pool, cache and queue metrics in Prometheus text format."""
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
+
 
 # Health Check
 @app.get("/health", response_model=schemas.HealthCheck)
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Health check endpoint."""
     try:
         # Test database connection
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception as e:
         print(f"Health check database error: {e}")
@@ -109,56 +185,68 @@ async def health_check(db: Session = Depends(get_db)):
 # Articles Endpoints
 @app.get("/api/articles", response_model=list[schemas.ArticleSummary])
 async def get_articles(
+    response: Response,
     category: Optional[str] = None,
     featured_date: Optional[date] = None,
+    tag: Optional[str] = None,
     processed_only: bool = True,
     limit: int = Query(default=20, le=100),
     offset: int = 0,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get articles with optional filtering."""
-    query = db.query(Article)
+    """
+    Get articles with optional filtering.
+
+    Pages are keyset-paginated: pass the `X-Next-Cursor` header from one
+    response as `cursor` to fetch the next page. `offset` is kept for
+    older clients but gets slower the deeper it goes.
+    """
+    query = queries.article_summary_select()
     
     if category:
-        query = query.filter(Article.category == category)
+        query = query.where(Article.category == category)
     
     if featured_date:
-        query = query.filter(Article.featured_date == featured_date)
+        query = query.where(Article.featured_date == featured_date)
+    
+    if tag:
+        query = query.where(Article.id.in_(tags.tagged_article_ids(tag)))
     
     if processed_only:
-        query = query.filter(Article.processed == True)
+        query = query.where(Article.processed == True)
+    
+    if cursor:
+        try:
+            cursor_key = decode_article_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            article_keyset_filter(*cursor_key, include_unscored=not processed_only)
+        )
     
-    articles = query.order_by(
-        desc(Article.relevance_score),
-        desc(Article.published_at)
-    ).offset(offset).limit(limit).all()
+    # Fetch one extra row to learn whether another page exists
+    result = await db.execute(
+        query.order_by(*ARTICLE_ORDER).offset(offset).limit(limit + 1)
+    )
+    rows = result.all()
     
-    # Enrich with source name
-    result = []
-    for article in articles:
-        article_dict = {
-            "id": article.id,
-            "title": article.title,
-            "url": article.url,
-            "category": article.category,
-            "summary": article.summary,
-            "key_points": article.key_points,
-            "ai_tags": article.ai_tags,
-            "sentiment": article.sentiment,
-            "relevance_score": article.relevance_score,
-            "published_at": article.published_at,
-            "featured_date": article.featured_date,
-            "source_name": article.source.name if article.source else None
-        }
-        result.append(schemas.ArticleSummary(**article_dict))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = article_cursor(rows[-1])
     
-    return result
+    return json_response([row._asdict() for row in rows], response)
 
 
 @app.get("/api/articles/{article_id}", response_model=schemas.Article)
-async def get_article(article_id: int, db: Session = Depends(get_db)):
+async def get_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a single article by ID."""
-    article = db.query(Article).filter(Article.id == article_id).first()
+    result = await db.execute(
+        select(Article)
+        .options(joinedload(Article.source), undefer(Article.content))
+        .where(Article.id == article_id)
+    )
+    article = result.scalars().first()
     
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
@@ -166,70 +254,139 @@ async def get_article(article_id: int, db: Session = Depends(get_db)):
     return article
 
 
+# Search Endpoint
+@app.get("/api/search", response_model=list[schemas.ArticleSummary])
+async def search_articles(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    category: Optional[str] = None,
+    limit: int = Query(default=20, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over processed articles' titles, summaries, key points
+    and tags, best match first. Paginate with `X-Next-Cursor` like /api/articles.
+    """
+    cursor_key = None
+    if cursor:
+        try:
+            cursor_key = search.decode_search_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = await search.search_articles(db, q, category, limit + 1, cursor_key)
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = search.search_cursor(rows[-1].rank, rows[-1].id)
+
+    results = []
+    for row in rows:
+        article = row._asdict()
+        del article["rank"]
+        results.append(article)
+
+    return json_response(results, response)
+
+
+# Tags Endpoint
+@app.get("/api/tags", response_model=list[schemas.TagCount])
+async def get_tags(
+    days: int = Query(default=7, ge=1, le=365),
+    category: Optional[str] = None,
+    limit: int = Query(default=20, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Most used tags over the last `days` days, optionally within a category."""
+    return await tags.get_tag_counts(db, days, category, limit)
+
+
+# Homepage Bootstrap
+@app.get("/api/bootstrap", response_model=schemas.Bootstrap)
+async def get_bootstrap(request: Request, response: Response):
+    """
+    Available dates, the most recent digest, stats and the latest newsletter
+    in one response, so the homepage renders after a single round trip.
+    """
+    body, etag = await bootstrap.get_bootstrap()
+    not_modified = http_cache.conditional_response(request, response, etag, http_cache.cache_control())
+    if not_modified:
+        return not_modified
+
+    return Response(body, media_type="application/json", headers=dict(response.headers))
+
+
 # Daily Digest Endpoint
 @app.get("/api/digest", response_model=schemas.DailyDigest)
 async def get_daily_digest(
+    request: Request,
+    response: Response,
     target_date: Optional[date] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the daily digest for a specific date (defaults to today)."""
     if target_date is None:
         target_date = date.today()
     
-    processor = AIProcessor(db)
-    digest = processor.get_daily_digest(target_date)
+    snapshot = snapshots.serve_snapshot(
+        request,
+        snapshots.digest_name(target_date),
+        http_cache.cache_control(immutable=http_cache.is_past_date(target_date))
+    )
+    if snapshot:
+        return snapshot
     
-    # Convert to response format
-    categories = {}
-    for category, articles in digest["categories"].items():
-        categories[category] = [
-            schemas.ArticleSummary(
-                id=a.id,
-                title=a.title,
-                url=a.url,
-                category=a.category,
-                summary=a.summary,
-                key_points=a.key_points,
-                ai_tags=a.ai_tags,
-                sentiment=a.sentiment,
-                relevance_score=a.relevance_score,
-                published_at=a.published_at,
-                featured_date=a.featured_date,
-                source_name=a.source.name if a.source else None
-            )
-            for a in articles
-        ]
+    version = await rollups.get_digest_version(db, target_date)
+    not_modified = http_cache.conditional_response(
+        request, response,
+        http_cache.make_etag("digest", target_date, version, settings.categories),
+        http_cache.cache_control(immutable=http_cache.is_past_date(target_date))
+    )
+    if not_modified:
+        return not_modified
     
-    return {
-        "date": target_date,
-        "categories": categories,
-        "total_articles": digest["total_articles"]
-    }
+    digest = await queries.get_cached_daily_digest(target_date, version)
+    
+    return json_response(digest, response)
 
 
 # Get available dates with content
 @app.get("/api/digest/dates")
 async def get_available_dates(
+    request: Request,
+    response: Response,
     limit: int = Query(default=30, le=90),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dates that have featured articles."""
-    dates = db.query(Article.featured_date).filter(
-        Article.featured_date != None
-    ).distinct().order_by(
-        desc(Article.featured_date)
-    ).limit(limit).all()
+    snapshot = snapshots.serve_snapshot(request, snapshots.dates_name(limit), http_cache.cache_control())
+    if snapshot:
+        return snapshot
+    
+    version = await rollups.get_digest_dates_version(db)
+    not_modified = http_cache.conditional_response(
+        request, response,
+        http_cache.make_etag("dates", limit, version),
+        http_cache.cache_control()
+    )
+    if not_modified:
+        return not_modified
     
-    return {"dates": [d[0] for d in dates]}
+    dates = await queries.get_available_dates(db, limit)
+    
+    return {"dates": dates}
 
 
 # Category Endpoint
 @app.get("/api/categories/{category}", response_model=schemas.CategoryArticles)
 async def get_category_articles(
+    request: Request,
+    response: Response,
     category: str,
     featured_date: Optional[date] = None,
     limit: int = Query(default=10, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get articles for a specific category."""
     if category not in settings.categories:
@@ -238,42 +395,33 @@ async def get_category_articles(
             detail=f"Invalid category. Must be one of: {settings.categories}"
         )
     
-    query = db.query(Article).filter(
-        and_(
-            Article.category == category,
-            Article.processed == True
-        )
+    snapshot = snapshots.serve_snapshot(
+        request,
+        snapshots.category_name(category, featured_date, limit),
+        http_cache.cache_control(immutable=http_cache.is_past_date(featured_date))
     )
+    if snapshot:
+        return snapshot
     
     if featured_date:
-        query = query.filter(Article.featured_date == featured_date)
+        version = await rollups.get_digest_version(db, featured_date)
+    else:
+        version = await rollups.get_category_version(db, category)
+    not_modified = http_cache.conditional_response(
+        request, response,
+        http_cache.make_etag("category", category, featured_date, limit, version),
+        http_cache.cache_control(immutable=http_cache.is_past_date(featured_date))
+    )
+    if not_modified:
+        return not_modified
     
-    articles = query.order_by(
-        desc(Article.relevance_score),
-        desc(Article.published_at)
-    ).limit(limit).all()
+    articles = await queries.get_category_articles(db, category, featured_date, limit)
     
-    return {
+    return json_response({
         "category": category,
-        "articles": [
-            schemas.ArticleSummary(
-                id=a.id,
-                title=a.title,
-                url=a.url,
-                category=a.category,
-                summary=a.summary,
-                key_points=a.key_points,
-                ai_tags=a.ai_tags,
-                sentiment=a.sentiment,
-                relevance_score=a.relevance_score,
-                published_at=a.published_at,
-                featured_date=a.featured_date,
-                source_name=a.source.name if a.source else None
-            )
-            for a in articles
-        ],
+        "articles": articles,
         "total": len(articles)
-    }
+    }, response)
 
 
 # Sources Endpoints
@@ -281,207 +429,245 @@ async def get_category_articles(
 async def get_sources(
     category: Optional[str] = None,
     active_only: bool = True,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all RSS sources."""
-    query = db.query(Source)
+    query = select(Source)
     
     if category:
-        query = query.filter(Source.category == category)
+        query = query.where(Source.category == category)
     
     if active_only:
-        query = query.filter(Source.active == True)
+        query = query.where(Source.active == True)
     
-    return query.all()
+    result = await db.execute(query)
+    return list(result.scalars())
 
 
 # Manual Fetch Trigger
 @app.post("/api/fetch/trigger", response_model=schemas.FetchTriggerResponse)
-async def trigger_fetch(
-    background_tasks: BackgroundTasks,
+def trigger_fetch(
+    schedule: Optional[Literal["daily_fetch"]] = None,
     db: Session = Depends(get_db)
 ):
-    """Manually trigger a fetch operation."""
-    # Create fetch log
-    fetch_log = FetchLog(status="running")
-    db.add(fetch_log)
-    db.commit()
-    db.refresh(fetch_log)
-    
-    # Run fetch in background
-    background_tasks.add_task(run_fetch_job, fetch_log.id)
-    
+    """
+    Queue a fetch operation for the job runner. External schedulers pass
+    `schedule`, so a run already queued today is returned instead of a new one.
+    """
+    fetch_log = jobs.enqueue_fetch(db, jobs.scheduled_key(schedule) if schedule else None)
+
     return {
-        "message": "Fetch job started",
+        "message": "Fetch job queued",
         "log_id": fetch_log.id,
-        "status": "running"
+        "status": fetch_log.status
     }
 
 
-def run_fetch_job(log_id: int):
-    """Background task to run fetch job."""
-    from app.database import SessionLocal
-
-    db = SessionLocal()
-
-    try:
-        fetch_log = db.query(FetchLog).filter(FetchLog.id == log_id).first()
-
-        # Fetch RSS feeds
-        fetcher = RSSFetcher(db)
-        articles = fetcher.fetch_all_sources(articles_per_source=5)
-        fetch_log.articles_fetched = len(articles)
-
-        # Process with AI
-        processor = AIProcessor(db)
-        processed_count = processor.process_unprocessed_articles(limit=100)
-        fetch_log.articles_processed = processed_count
-
-        # Select top articles for today
-        processor.select_top_articles_for_today(
-            articles_per_category=settings.articles_per_category
-        )
-
-        fetch_log.status = "completed"
-        fetch_log.completed_at = datetime.now(timezone.utc)
-        db.commit()
-
-    except Exception as e:
-        print(f"Fetch job {log_id} failed: {e}")
-        try:
-            db.rollback()
-            fetch_log = db.query(FetchLog).filter(FetchLog.id == log_id).first()
-            if fetch_log:
-                fetch_log.status = "failed"
-                fetch_log.errors = [str(e)]
-                fetch_log.completed_at = datetime.now(timezone.utc)
-                db.commit()
-        except Exception as rollback_err:
-            print(f"Fetch job {log_id} failed to update log after error: {rollback_err}")
-
-    finally:
-        db.close()
-
-
 # Fetch Logs
 @app.get("/api/fetch/logs", response_model=list[schemas.FetchLog])
 async def get_fetch_logs(
     limit: int = Query(default=10, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_async_db)
 ):
-    """Get recent fetch operation logs."""
-    logs = db.query(FetchLog).order_by(
-        desc(FetchLog.started_at)
-    ).limit(limit).all()
+    """Get recent fetch operation logs. Read from the primary, so a job shows up as soon as it's triggered."""
+    result = await db.execute(
+        select(FetchLog).order_by(desc(FetchLog.started_at)).limit(limit)
+    )
     
-    return logs
+    return list(result.scalars())
 
 
-@app.get("/api/fetch/logs/{log_id}", response_model=schemas.FetchLog)
-async def get_fetch_log(log_id: int, db: Session = Depends(get_db)):
-    """Get a specific fetch log."""
-    log = db.query(FetchLog).filter(FetchLog.id == log_id).first()
+@app.get("/api/fetch/logs/{log_id}", response_model=schemas.FetchLogDetail)
+async def get_fetch_log(log_id: int, db: AsyncSession = Depends(get_primary_async_db)):
+    """Get a specific fetch log, with stage timings and latency percentiles."""
+    log = await db.get(FetchLog, log_id)
     
     if not log:
         raise HTTPException(status_code=404, detail="Fetch log not found")
     
-    return log
+    return {
+        **schemas.FetchLog.model_validate(log).model_dump(),
+        "metrics": await fetch_metrics.get_summary(db, log_id)
+    }
+
+
+@app.get("/api/fetch/logs/{log_id}/events")
+async def stream_fetch_events(log_id: int, db: AsyncSession = Depends(get_primary_async_db)):
+    """
+    Server-sent events for a fetch job: job_started, source_fetched,
+    article_processed, selection_done, then job_completed or job_failed.
+    Events come from the in-process broker, which the job runner feeds over
+    PostgreSQL NOTIFY, so open streams cost no queries while the job runs.
+    A finished job that has left the broker's memory gets a single terminal
+    event built from its log.
+    """
+    channel = events.fetch_channel(log_id)
+
+    if not events.broker.has_channel(channel):
+        result = await db.execute(select(FetchLog).where(FetchLog.id == log_id))
+        fetch_log = result.scalars().first()
+        if not fetch_log:
+            raise HTTPException(status_code=404, detail="Fetch log not found")
+
+        if fetch_log.status not in ("queued", "running"):
+            event = {
+                "id": 0,
+                "type": "job_completed" if fetch_log.status == "completed" else "job_failed",
+                "log_id": log_id,
+                "articles_fetched": fetch_log.articles_fetched,
+                "articles_processed": fetch_log.articles_processed,
+                "errors": fetch_log.errors,
+            }
+            return StreamingResponse(iter([_sse_message(event)]), media_type="text/event-stream")
+
+    async def stream():
+        async for event in events.broker.subscribe(channel, keepalive=15):
+            # Comment lines keep proxies from closing an idle stream
+            yield _sse_message(event) if event else b": keepalive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse_message(event: dict) -> bytes:
+    return (
+        f"id: {event['id']}\nevent: {event['type']}\n".encode()
+        + b"data: " + orjson.dumps(event) + b"\n\n"
+    )
+
+
+# Profiles (see app.profiling)
+def require_profile_token(x_profile_token: Optional[str] = Header(None)):
+    # Without a configured token the endpoints don't exist
+    if not profiling.token_valid(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@app.get("/api/profiles", include_in_schema=False, dependencies=[Depends(require_profile_token)])
+def list_profiles(limit: int = Query(50, ge=1, le=500)):
+    """Saved profiles, newest first, without their statements."""
+    summaries = (profiling.load_summary(profile_id) for profile_id in profiling.list_profile_ids()[:limit])
+    return [
+        {key: value for key, value in summary.items() if key != "statements"}
+        for summary in summaries if summary
+    ]
+
+
+@app.get("/api/profiles/{profile_id}", include_in_schema=False, dependencies=[Depends(require_profile_token)])
+def get_profile(profile_id: str):
+    """A profile's timings and SQL statements, slowest first."""
+    summary = profiling.load_summary(profile_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+
+@app.get("/api/profiles/{profile_id}/pstats", include_in_schema=False, dependencies=[Depends(require_profile_token)])
+def download_profile(profile_id: str):
+    """The cProfile capture, for snakeviz or `python -m pstats`."""
+    path = profiling.pstats_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
 
 
 # Stats Endpoint
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db)):
-    """Get aggregation statistics."""
-    total_articles = db.query(func.count(Article.id)).scalar()
-    processed_articles = db.query(func.count(Article.id)).filter(
-        Article.processed == True
-    ).scalar()
-    
-    articles_by_category = {}
-    for category in settings.categories:
-        count = db.query(func.count(Article.id)).filter(
-            Article.category == category
-        ).scalar()
-        articles_by_category[category] = count
-    
-    total_sources = db.query(func.count(Source.id)).scalar()
-    active_sources = db.query(func.count(Source.id)).filter(
-        Source.active == True
-    ).scalar()
-    
-    # Get last fetch info
-    last_fetch = db.query(FetchLog).order_by(
-        desc(FetchLog.started_at)
-    ).first()
-    
-    return {
-        "total_articles": total_articles,
-        "processed_articles": processed_articles,
-        "articles_by_category": articles_by_category,
-        "total_sources": total_sources,
-        "active_sources": active_sources,
-        "last_fetch": {
-            "status": last_fetch.status if last_fetch else None,
-            "started_at": last_fetch.started_at if last_fetch else None,
-            "articles_fetched": last_fetch.articles_fetched if last_fetch else 0
-        } if last_fetch else None,
-        "categories": settings.categories,
-        "fetch_interval_hours": settings.fetch_schedule_hours
-    }
+async def get_stats():
+    """Get aggregation statistics from the precomputed category counters."""
+    return await rollups.get_stats_snapshot()
 
 
 # Newsletter Endpoints
 @app.get("/api/newsletter/latest", response_model=schemas.Newsletter)
-async def get_latest_newsletter(db: Session = Depends(get_db)):
+async def get_latest_newsletter(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get the latest newsletter with executive summary."""
-    newsletter = db.query(Newsletter).order_by(
-        desc(Newsletter.published_at)
-    ).first()
+    result = await db.execute(
+        select(Newsletter).order_by(desc(Newsletter.published_at)).limit(1)
+    )
+    newsletter = result.scalars().first()
 
     if not newsletter:
         raise HTTPException(status_code=404, detail="No newsletter found")
 
+    not_modified = http_cache.conditional_response(
+        request, response,
+        http_cache.make_etag("newsletter", newsletter.id, newsletter.processed, newsletter.fetched_at),
+        http_cache.cache_control()
+    )
+    if not_modified:
+        return not_modified
+
     return newsletter
 
 
+@app.get("/api/newsletter/{newsletter_id}/content")
+async def get_newsletter_content(
+    newsletter_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Sanitized HTML body of a newsletter. It never changes once fetched, so it
+    is cacheable for long, and the stored bytes are sent as they are to
+    clients that accept their coding (zstd, or gzip for older rows).
+    """
+    result = await db.execute(
+        select(type_coerce(Newsletter.content, LargeBinary)).where(Newsletter.id == newsletter_id)
+    )
+    stored = result.scalar()
+
+    # Checked first, so a missing newsletter never gets a long-cached 304
+    if not stored:
+        raise HTTPException(status_code=404, detail="Newsletter content not found")
+
+    not_modified = http_cache.conditional_response(
+        request, response,
+        http_cache.make_etag("newsletter-content", newsletter_id),
+        http_cache.cache_control(immutable=True)
+    )
+    if not_modified:
+        return not_modified
+
+    headers = dict(response.headers)
+    # Rendered inside the frontend; opened directly it may not run anything
+    headers["content-security-policy"] = "default-src 'none'; img-src https: data:; style-src 'unsafe-inline'"
+    headers["x-content-type-options"] = "nosniff"
+    headers["vary"] = "Accept-Encoding"
+
+    # Sent as stored when the client accepts the stored coding
+    if stored[:4] == ZSTD_MAGIC and not zstd_dict_id(stored):
+        stored_encoding = "zstd"
+    elif stored[:2] == GZIP_MAGIC:
+        stored_encoding = "gzip"
+    else:
+        stored_encoding = None
+    if stored_encoding and choose_encoding(request.headers.get("accept-encoding", ""), available=(stored_encoding,)):
+        headers["content-encoding"] = stored_encoding
+        headers["etag"] = encoded_etag(headers["etag"], stored_encoding)
+        return Response(stored, media_type="text/html; charset=utf-8", headers=headers)
+
+    return Response(decompress_text(stored), media_type="text/html; charset=utf-8", headers=headers)
+
+
 @app.post("/api/newsletter/trigger", response_model=schemas.NewsletterTriggerResponse)
-async def trigger_newsletter_fetch(
-    background_tasks: BackgroundTasks,
+def trigger_newsletter_fetch(
+    schedule: Optional[Literal["daily_newsletter"]] = None,
     db: Session = Depends(get_db)
 ):
-    """Manually trigger newsletter fetch and processing."""
-    background_tasks.add_task(run_newsletter_job)
+    """Queue newsletter fetch and processing for the job runner. See trigger_fetch for `schedule`."""
+    jobs.enqueue_newsletter(db, jobs.scheduled_key(schedule) if schedule else None)
 
     return {
-        "message": "Newsletter fetch job started",
+        "message": "Newsletter fetch job queued",
         "newsletter_id": None,
-        "status": "running"
+        "status": "queued"
     }
-
-
-def run_newsletter_job():
-    """Background task to fetch and process newsletter."""
-    from app.database import SessionLocal
-
-    db = SessionLocal()
-
-    try:
-        # Fetch latest newsletter
-        fetcher = NewsletterFetcher(db)
-        newsletter = fetcher.fetch_latest()
-
-        if newsletter and not newsletter.processed:
-            # Process with AI
-            processor = AIProcessor(db)
-            processor.process_newsletter(newsletter)
-            print(f"Newsletter processed: {newsletter.title[:50]}...")
-
-    except Exception as e:
-        print(f"Error in newsletter job: {e}")
-        try:
-            db.rollback()
-        except Exception:
-            pass
-
-    finally:
-        db.close()
@@ -0,0 +1,183 @@
+"""
+Prometheus metrics for the API and the fetch pipeline, served at /metrics
+(and by the job runner on WORKER_METRICS_PORT). Recording is a few counter
+and histogram updates per request, query or AI call; pool usage and queue
+depths are read when Prometheus scrapes.
+
+Under several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR so every
+worker's samples are aggregated.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event, func, select
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import SessionLocal, async_engine, async_read_engine, engine
+from app.models import Job
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries issued per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Database query latency",
+    ["engine"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+FEED_FETCH_DURATION = Histogram(
+    "feed_fetch_duration_seconds", "RSS feed download latency",
+    ["source"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+FEED_FETCH_ERRORS = Counter("feed_fetch_errors_total", "RSS feed downloads that failed", ["source"])
+AI_REQUEST_DURATION = Histogram(
+    "ai_request_duration_seconds", "Claude API request latency",
+    ["model", "kind"],
+    buckets=(0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+AI_TOKENS = Counter("ai_tokens_total", "Claude API tokens", ["model", "direction"])
+AI_ERRORS = Counter("ai_request_errors_total", "Claude API requests that failed", ["model", "kind"])
+CACHE_REQUESTS = Counter("cache_requests_total", "In-process cache lookups", ["cache", "result"])
+PIPELINE_QUEUE_DEPTH = Gauge(
+    "pipeline_queue_depth", "Items waiting between fetch pipeline stages", ["queue"],
+    multiprocess_mode="livesum",
+)
+
+# Query count of the request being served
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+class MetricsMiddleware:
+    """Per-route latency and query count. Routes are labelled by template, never by raw path."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        queries = [0]
+        token = _request_queries.set(queries)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            REQUEST_DURATION.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+            REQUEST_DB_QUERIES.labels(route).observe(queries[0])
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Time every query on a (sync) engine and count it against the current request."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context.metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        DB_QUERY_DURATION.labels(name).observe(time.perf_counter() - context.metrics_start)
+        queries = _request_queries.get()
+        if queries is not None:
+            queries[0] += 1
+
+
+def record_cache(cache: str, result: str) -> None:
+    CACHE_REQUESTS.labels(cache, result).inc()
+
+
+class _ScrapeTimeCollector:
+    """Connection pool usage and job queue depths, read when scraped."""
+
+    def __init__(self, engines: dict):
+        self.engines = engines
+
+    def collect(self):
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["engine"])
+        size = GaugeMetricFamily("db_pool_size", "Connections the pool keeps open", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size", labels=["engine"])
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            checked_out.add_metric([name], pool.checkedout())
+            size.add_metric([name], pool.size())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield checked_out
+        yield size
+        yield overflow
+
+        jobs = GaugeMetricFamily("job_queue_depth", "Jobs in the queue", labels=["type", "status"])
+        try:
+            for job_type, status, count in _job_counts():
+                jobs.add_metric([job_type, status], count)
+        except Exception as e:
+            print(f"Failed to read job queue depth for metrics: {e}")
+        yield jobs
+
+
+def _job_counts():
+    db = SessionLocal()
+    try:
+        return db.execute(
+            select(Job.type, Job.status, func.count())
+            .where(Job.status.in_(("queued", "running")))
+            .group_by(Job.type, Job.status)
+        ).all()
+    finally:
+        db.close()
+
+
+_collector: Optional[_ScrapeTimeCollector] = None
+
+
+def setup() -> None:
+    """Instrument the engines and register the scrape-time gauges, once per process."""
+    global _collector
+    if _collector is not None:
+        return
+
+    engines = {"sync": engine, "async": async_engine.sync_engine}
+    if async_read_engine is not async_engine:
+        engines["async_replica"] = async_read_engine.sync_engine
+
+    for name, instrumented in engines.items():
+        instrument_engine(instrumented, name)
+    _collector = _ScrapeTimeCollector(engines)
+    REGISTRY.register(_collector)
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition-format body and content type for a scrape."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        if _collector is not None:
+            registry.register(_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
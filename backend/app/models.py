@@ -1,10 +1,11 @@
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, 
-    Float, Date, ForeignKey, JSON, UniqueConstraint
+    Float, Date, ForeignKey, JSON, UniqueConstraint, Index, text
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
+from app.types import CompressedText
 
 
 class Source(Base):
@@ -38,7 +39,8 @@ class Article(Base):
     title = Column(String(500), nullable=False)
     url = Column(String(1000), nullable=False)
     author = Column(String(255), nullable=True)
-    content = Column(Text, nullable=True)
+    # Raw feed HTML, zstd-compressed; only loaded when accessed
+    content = deferred(Column(CompressedText(dictionary=True), nullable=True))
     published_at = Column(DateTime(timezone=True), nullable=True)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -58,15 +60,100 @@ class Article(Base):
     # Relationship
     source = relationship("Source", back_populates="articles")
     
-    # Ensure unique articles by URL
     __table_args__ = (
+        # Ensure unique articles by URL
         UniqueConstraint('url', name='uq_article_url'),
+        # Keyset pagination order for /api/articles. PostgreSQL sorts NULLs
+        # first in DESC indexes, SQLite sorts them last and rejects NULLS LAST.
+        Index(
+            'ix_articles_keyset',
+            relevance_score.desc().nullslast(),
+            published_at.desc().nullslast(),
+            id.desc()
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_articles_keyset',
+            relevance_score.desc(),
+            published_at.desc(),
+            id.desc()
+        ).ddl_if(dialect='sqlite'),
+        # Daily digest: category + featured_date, ordered by relevance
+        Index('ix_articles_digest', category, featured_date, relevance_score),
+        # AI backlog: only rows still waiting to be processed
+        Index(
+            'ix_articles_unprocessed',
+            processed,
+            published_at,
+            postgresql_where=text('NOT processed'),
+            sqlite_where=text('processed = 0')
+        ),
+        # Top-article selection: unfeatured, processed, recent per category
+        Index('ix_articles_selection', category, processed, featured_date, published_at),
     )
     
     def __repr__(self):
         return f"<Article(title='{self.title[:50]}...', category='{self.category}')>"
 
 
+class ArticleTag(Base):
+    """
+    One row per (article, tag), written when an article is processed.
+    Category and timestamp are copied from the article so tag counts and
+    tag filters are answered from the indexes alone.
+    """
+    __tablename__ = "article_tags"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+    category = Column(String(50), nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)  # Article published_at, else processed_at
+
+    __table_args__ = (
+        # tag= filter on /api/articles
+        Index('ix_article_tags_tag', tag, article_id),
+        # /api/tags counts over a time window, with and without a category
+        Index('ix_article_tags_window', published_at, tag),
+        Index('ix_article_tags_category_window', category, published_at, tag),
+    )
+
+    def __repr__(self):
+        return f"<ArticleTag(article_id={self.article_id}, tag='{self.tag}')>"
+
+
+class ArchivedArticle(Base):
+    """
+    Articles moved out of `articles` by the retention job (app.retention),
+    so the live table and its indexes only hold the working set.
+    """
+    __tablename__ = "articles_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # Id it had in articles
+    source_id = Column(Integer, nullable=False)
+    title = Column(String(500), nullable=False)
+    url = Column(String(1000), nullable=False)
+    author = Column(String(255), nullable=True)
+    content = deferred(Column(CompressedText(dictionary=True), nullable=True))
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    fetched_at = Column(DateTime(timezone=True), nullable=True)
+    summary = Column(Text, nullable=True)
+    key_points = Column(JSON, nullable=True)
+    ai_tags = Column(JSON, nullable=True)
+    sentiment = Column(String(20), nullable=True)
+    relevance_score = Column(Float, nullable=True)
+    processed = Column(Boolean, default=False)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    category = Column(String(50), nullable=False)
+    featured_date = Column(Date, nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_articles_archive_published', published_at),
+    )
+
+    def __repr__(self):
+        return f"<ArchivedArticle(title='{self.title[:50]}...', category='{self.category}')>"
+
+
 class FetchLog(Base):
     """Log of fetch operations for debugging and monitoring."""
     __tablename__ = "fetch_logs"
@@ -74,7 +161,7 @@ class FetchLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
-    status = Column(String(20), default="running")  # running, completed, failed
+    status = Column(String(20), default="running")  # queued, running, completed, failed
     articles_fetched = Column(Integer, default=0)
     articles_processed = Column(Integer, default=0)
     errors = Column(JSON, nullable=True)  # List of error messages
@@ -83,6 +170,86 @@ class FetchLog(Base):
         return f"<FetchLog(status='{self.status}', fetched={self.articles_fetched})>"
 
 
+class FetchMetric(Base):
+    """
+    Timing and resource use recorded during a fetch job: one row per
+    pipeline stage (busy time summed across workers), per source download
+    and per AI call.
+    """
+    __tablename__ = "fetch_metrics"
+
+    id = Column(Integer, primary_key=True)
+    fetch_log_id = Column(Integer, ForeignKey("fetch_logs.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)  # stage, source, article
+    name = Column(String(255), nullable=False)  # Stage name, source name or article title
+    article_id = Column(Integer, nullable=True)
+    duration_ms = Column(Float, nullable=False)
+    count = Column(Integer, nullable=True)  # Stage: operations timed; source: feed entries
+    bytes = Column(Integer, nullable=True)
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_fetch_metrics_log", "fetch_log_id", "kind"),
+    )
+
+    def __repr__(self):
+        return f"<FetchMetric(kind='{self.kind}', name='{self.name}', duration_ms={self.duration_ms})>"
+
+
+class Job(Base):
+    """Background job queued by the API and run by the job runner (app.worker)."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    type = Column(String(50), nullable=False)  # fetch, newsletter, retention
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, completed, failed
+    payload = Column(JSON, nullable=True)
+    dedupe_key = Column(String(100), nullable=True)  # Set for scheduled runs, e.g. daily_fetch:2026-10-18
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Refreshed by the runner while the job runs
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Claim query: oldest queued job of a type
+        Index("ix_jobs_claim", "status", "type", "id"),
+        # At most one job per scheduled run
+        Index("ix_jobs_dedupe_key", "dedupe_key", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, type='{self.type}', status='{self.status}')>"
+
+
+class CategoryStats(Base):
+    """Running article counters per category, maintained by the fetch pipeline."""
+    __tablename__ = "category_stats"
+
+    category = Column(String(50), primary_key=True)
+    total_articles = Column(Integer, nullable=False, default=0)
+    processed_articles = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CategoryStats(category='{self.category}', total={self.total_articles})>"
+
+
+class DigestVersion(Base):
+    """Content version per digest date, bumped whenever that date's selection changes."""
+    __tablename__ = "digest_versions"
+
+    featured_date = Column(Date, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DigestVersion(featured_date='{self.featured_date}', version={self.version})>"
+
+
 class Newsletter(Base):
     """Newsletter content from tl;dr sec."""
     __tablename__ = "newsletters"
@@ -90,7 +257,9 @@ class Newsletter(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
     url = Column(String(1000), nullable=False, unique=True)
-    content = Column(Text, nullable=True)  # Full HTML/text content
+    # Sanitized HTML, compressed (zstd, or gzip if stored before zstd); only loaded when accessed
+    content = deferred(Column(CompressedText(), nullable=True))
+    content_length = Column(Integer, nullable=True)  # Uncompressed size in bytes
     published_at = Column(DateTime(timezone=True), nullable=True)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
     executive_summary = Column(Text, nullable=True)  # AI-generated summary
@@ -98,3 +267,4 @@ class Newsletter(Base):
 
     def __repr__(self):
         return f"<Newsletter(title='{self.title[:50]}...', processed={self.processed})>"
+
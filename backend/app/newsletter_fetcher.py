@@ -1,13 +1,68 @@
+import re
 import feedparser
 import httpx
 from datetime import datetime, timezone
 from typing import Optional
 from dateutil import parser as date_parser
 from sqlalchemy.orm import Session
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Comment, NavigableString
 
 from app.models import Newsletter
 
+# Elements removed together with their contents
+DROPPED_TAGS = [
+    'script', 'style', 'iframe', 'frame', 'object', 'embed', 'form', 'input',
+    'button', 'select', 'textarea', 'noscript', 'link', 'meta', 'base',
+    'template', 'canvas', 'svg', 'head', 'title'
+]
+
+# Every other attribute (inline styles, event handlers, tracking data-*) is stripped
+ALLOWED_ATTRIBUTES = {
+    'href', 'src', 'alt', 'title', 'class', 'id', 'colspan', 'rowspan', 'width', 'height'
+}
+
+URL_ATTRIBUTES = {'href', 'src'}
+SAFE_URL = re.compile(r'^(https?:|mailto:|#|/)|^[^:]*$', re.IGNORECASE)
+
+# Whitespace is significant inside these
+PREFORMATTED_TAGS = {'pre', 'code', 'textarea'}
+
+
+def clean_newsletter_html(html: str) -> str:
+    """
+    Sanitize and minify newsletter HTML once at ingestion, so clients can
+    render it directly: active content and unsafe URLs are removed, only
+    presentational attributes are kept, and whitespace is collapsed.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    for tag in soup.find_all(DROPPED_TAGS):
+        tag.decompose()
+
+    # The content is embedded in a page, document wrappers add nothing
+    for tag in soup.find_all(['html', 'body']):
+        tag.unwrap()
+
+    for tag in soup.find_all(True):
+        for name in list(tag.attrs):
+            value = tag.attrs[name]
+            if name not in ALLOWED_ATTRIBUTES:
+                del tag.attrs[name]
+            elif name in URL_ATTRIBUTES and not SAFE_URL.match(str(value).strip()):
+                del tag.attrs[name]
+
+    for text in soup.find_all(string=True):
+        if any(parent.name in PREFORMATTED_TAGS for parent in text.parents):
+            continue
+        collapsed = re.sub(r'\s+', ' ', str(text))
+        if collapsed != text:
+            text.replace_with(NavigableString(collapsed))
+
+    return str(soup).strip()
+
 
 class NewsletterFetcher:
     """Fetches tl;dr sec newsletter content."""
@@ -150,12 +205,15 @@ class NewsletterFetcher:
         # Beehiiv RSS feeds include full newsletter HTML, while web pages are JS SPAs
         # that BeautifulSoup can't render properly
         content = rss_content if rss_content else full_content
+        if content:
+            content = clean_newsletter_html(content)
 
         # Create newsletter record
         newsletter = Newsletter(
             title=latest_entry.get('title', 'tl;dr sec Newsletter'),
             url=url,
             content=content,
+            content_length=len(content.encode('utf-8')) if content else None,
             published_at=self.parse_published_date(latest_entry),
             fetched_at=datetime.now(timezone.utc),
             processed=False
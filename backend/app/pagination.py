@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_
+
+from app.models import Article
+
+
+# Sort order shared by every paginated article listing. NULLs sort last on
+# every backend so the keyset predicate below stays well defined, and the id
+# tiebreaker makes the order total.
+ARTICLE_ORDER = (
+    Article.relevance_score.desc().nullslast(),
+    Article.published_at.desc().nullslast(),
+    Article.id.desc(),
+)
+
+
+def encode_cursor(values: list) -> str:
+    """Encode a list of JSON-serializable sort key values as an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Malformed cursor: {e}") from e
+
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor: expected a list")
+
+    return values
+
+
+def article_cursor(article: Article) -> str:
+    """Build the cursor pointing just past the given article in ARTICLE_ORDER."""
+    return encode_cursor([
+        article.relevance_score,
+        article.published_at.isoformat() if article.published_at else None,
+        article.id,
+    ])
+
+
+def decode_article_cursor(cursor: str) -> tuple[Optional[float], Optional[datetime], int]:
+    """Decode an article cursor into its (relevance_score, published_at, id) key."""
+    values = decode_cursor(cursor)
+    if len(values) != 3:
+        raise ValueError("Malformed cursor: expected 3 values")
+
+    relevance_score, published_at, article_id = values
+    try:
+        return (
+            float(relevance_score) if relevance_score is not None else None,
+            datetime.fromisoformat(published_at) if published_at is not None else None,
+            int(article_id),
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {e}") from e
+
+
+def article_keyset_filter(
+    relevance_score: Optional[float],
+    published_at: Optional[datetime],
+    article_id: int,
+    include_unscored: bool = True
+):
+    """
+    Build the WHERE clause selecting articles that sort after the cursor key
+    in ARTICLE_ORDER. The leading `relevance_score <= x` bound lets the
+    database seek into ix_articles_keyset instead of scanning from the top.
+
+    Processed articles always carry a relevance score, so callers listing
+    only processed articles can pass include_unscored=False to drop the
+    IS NULL branch and keep the predicate a single index range.
+    """
+    if published_at is None:
+        tail = and_(Article.published_at.is_(None), Article.id < article_id)
+    else:
+        tail = or_(
+            Article.published_at < published_at,
+            Article.published_at.is_(None),
+            and_(Article.published_at == published_at, Article.id < article_id)
+        )
+
+    if relevance_score is None:
+        return and_(Article.relevance_score.is_(None), tail)
+
+    scored = and_(
+        Article.relevance_score <= relevance_score,
+        or_(
+            Article.relevance_score < relevance_score,
+            and_(Article.relevance_score == relevance_score, tail)
+        )
+    )
+
+    if include_unscored:
+        return or_(scored, Article.relevance_score.is_(None))
+
+    return scored
@@ -0,0 +1,306 @@
+"""
+Streaming fetch pipeline. Feeds download in parallel; each feed's new
+articles are stored and handed to the AI stage as soon as it is parsed;
+once every feed is stored, older unprocessed articles fill what is left of
+the run's processing budget; a category's digest is selected as soon as
+its articles are processed after that. A run takes about as long as the
+slower of fetching and processing, rather than their sum.
+
+    fetch workers --feeds--> coordinator --article ids--> AI workers
+                                  ^                           |
+                                  +---------- results --------+
+
+The coordinator is the job's own thread and session; it does all storing
+and selection. Stages are joined by bounded buffers, so when the AI stage
+falls behind the coordinator blocks handing it work, stops storing feeds,
+and the fetch workers stop downloading instead of piling up articles.
+Workers report every feed and article they take, even when handling it
+fails, and the coordinator's waits time out to check that workers are still
+alive, so a failure ends the run instead of hanging it.
+"""
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session, undefer
+
+from app import metrics, profiling, rollups
+from app.ai_processor import AIProcessor
+from app.config import get_settings
+from app.database import SessionLocal
+from app.fetch_metrics import RunMetrics
+from app.models import Article, Source
+from app.rss_fetcher import RSSFetcher
+
+settings = get_settings()
+
+# How often blocked workers check whether the run is over
+POLL_SECONDS = 0.5
+
+
+class FetchPipeline:
+    def __init__(self, db: Session, on_event: Optional[Callable[..., None]] = None):
+        self.db = db
+        self.on_event = on_event  # Progress callback: on_event(event_type, **data)
+        self.fetcher = RSSFetcher(db)
+        self.metrics = RunMetrics()  # Saved with the job's log by the caller
+        self.fetch_workers = settings.pipeline_fetch_workers
+        self.ai_workers = settings.pipeline_ai_workers
+
+        self._stop = threading.Event()
+        # Everything the coordinator reacts to: ("feed", source, feed) and
+        # ("processed", article_id, category, relevance_score | None)
+        self._inbox: queue.Queue = queue.Queue()
+        self._articles: queue.Queue = queue.Queue(maxsize=settings.pipeline_queue_size)
+        # Downloaded feeds the coordinator hasn't stored yet
+        self._feed_slots = threading.Semaphore(settings.pipeline_queue_size)
+
+    def run(self, articles_per_source: int = 5, process_limit: int = 100) -> tuple[int, int]:
+        """
+        Fetch, process at most `process_limit` articles (this run's first,
+        then older unprocessed ones), and select each category's top
+        articles. Returns (articles fetched, articles processed).
+        """
+        with self.metrics.stage("source_sync"):
+            self.fetcher.ensure_sources_exist()
+        sources = self.db.query(Source).filter(Source.active == True).all()
+
+        self.articles_per_source = articles_per_source
+        self.process_limit = process_limit
+        self.sources_total = len(sources)
+        self.sources_done = 0
+        self.backlog_queued = False
+        self.pending = defaultdict(int)
+        self.queued: set[int] = set()
+        self.selected: set[str] = set()
+        self.articles_fetched = 0
+        self.articles_processed = 0
+        self.articles_done = 0
+
+        # Workers get plain values: the ORM objects belong to this thread's session
+        source_queue: queue.Queue = queue.Queue()
+        for source in sources:
+            source_queue.put((source, source.feed_url, source.name, f"{source.name} ({source.category})"))
+
+        self._fetch_threads = [
+            threading.Thread(target=profiling.propagate(self._fetch_worker), args=(source_queue,), name=f"pipeline-fetch-{i}", daemon=True)
+            for i in range(self.fetch_workers)
+        ]
+        self._ai_threads = [
+            threading.Thread(target=profiling.propagate(self._ai_worker), name=f"pipeline-ai-{i}", daemon=True)
+            for i in range(self.ai_workers)
+        ]
+        threads = self._fetch_threads + self._ai_threads
+        for thread in threads:
+            thread.start()
+
+        try:
+            if not sources:
+                self._queue_backlog()
+
+            while self.sources_done < self.sources_total or len(self.queued) > self.articles_done:
+                try:
+                    message = self._inbox.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    self._check_workers()
+                    continue
+                metrics.PIPELINE_QUEUE_DEPTH.labels("inbox").set(self._inbox.qsize())
+                metrics.PIPELINE_QUEUE_DEPTH.labels("articles").set(self._articles.qsize())
+                if message[0] == "feed":
+                    self._store_feed(message[1], message[2])
+                else:
+                    self._record_processed(*message[1:])
+
+            for category in settings.categories:
+                self._maybe_select(category)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            metrics.PIPELINE_QUEUE_DEPTH.labels("inbox").set(0)
+            metrics.PIPELINE_QUEUE_DEPTH.labels("articles").set(0)
+
+        print(f"Pipeline done: {self.articles_fetched} fetched, {self.articles_processed} processed.")
+        return self.articles_fetched, self.articles_processed
+
+    # Coordinator
+
+    def _store_feed(self, source: Source, feed) -> None:
+        self._feed_slots.release()
+        with self.metrics.stage("dedup"):
+            article_data_list = self.fetcher.parse_source_articles(source, feed, limit=self.articles_per_source)
+
+        with self.metrics.stage("insert"):
+            articles = [Article(**article_data) for article_data in article_data_list]
+            self.db.add_all(articles)
+            rollups.record_articles_added(self.db, [a.category for a in articles])
+            self.db.commit()
+        self.articles_fetched += len(articles)
+
+        self.sources_done += 1
+        print(f"Fetched {len(articles)} new articles from {source.name} ({source.category}).")
+        self._emit(
+            "source_fetched",
+            source=source.name,
+            category=source.category,
+            new_articles=len(articles),
+            sources_done=self.sources_done,
+            sources_total=self.sources_total
+        )
+
+        for article in articles:
+            self._queue_article(article)
+
+        if self.sources_done == self.sources_total:
+            self._queue_backlog()
+            for category in settings.categories:
+                self._maybe_select(category)
+
+    def _queue_backlog(self) -> None:
+        """
+        Older unprocessed articles, newest first, within what the run's new
+        articles left of its limit. Only queued once every feed is stored, so
+        a backlog (e.g. after an API outage) never crowds out new articles.
+        """
+        self.backlog_queued = True
+        remaining = self.process_limit - len(self.queued)
+        if remaining <= 0:
+            return
+        query = self.db.query(Article).filter(Article.processed == False)
+        if self.queued:
+            query = query.filter(Article.id.notin_(self.queued))
+        for article in query.order_by(Article.published_at.desc()).limit(remaining).all():
+            self._queue_article(article)
+
+    def _queue_article(self, article: Article) -> None:
+        if len(self.queued) >= self.process_limit:
+            return
+        self.queued.add(article.id)
+        self.pending[article.category] += 1
+        # Blocks while the AI stage is behind; its results wait in the inbox
+        while True:
+            try:
+                self._articles.put((article.id, article.category), timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                # Only the AI workers take from the buffer, and they only exit once the run is over
+                if not any(thread.is_alive() for thread in self._ai_threads):
+                    raise RuntimeError("AI workers exited with articles still queued")
+
+    def _check_workers(self) -> None:
+        """After waiting on an empty inbox: fail the run if the workers it waits on have all exited."""
+        fetch_alive = any(thread.is_alive() for thread in self._fetch_threads)
+        ai_alive = any(thread.is_alive() for thread in self._ai_threads)
+        # Workers report before they exit, so anything they sent is in the inbox by now
+        if not self._inbox.empty():
+            return
+        if not fetch_alive and self.sources_done < self.sources_total:
+            raise RuntimeError("Fetch workers exited before every feed was reported")
+        if not ai_alive and len(self.queued) > self.articles_done:
+            raise RuntimeError("AI workers exited before every article was reported")
+
+    def _record_processed(self, article_id: int, category: str, relevance_score: Optional[float]) -> None:
+        self.articles_done += 1
+        self.pending[category] -= 1
+        if relevance_score is not None:
+            self.articles_processed += 1
+            self._emit(
+                "article_processed",
+                article_id=article_id,
+                category=category,
+                relevance_score=relevance_score,
+                articles_done=self.articles_done,
+                articles_total=len(self.queued)
+            )
+        self._maybe_select(category)
+
+    def _maybe_select(self, category: str) -> None:
+        if category not in settings.categories or category in self.selected:
+            return
+        # Until the backlog is queued, more of the category's articles may come
+        if not self.backlog_queued or self.pending[category]:
+            return
+        self.selected.add(category)
+        with self.metrics.stage("selection"):
+            AIProcessor(self.db, on_event=self.on_event).select_top_articles_for_today(
+                articles_per_category=settings.articles_per_category,
+                categories=[category]
+            )
+
+    def _emit(self, event_type: str, **data) -> None:
+        if self.on_event:
+            self.on_event(event_type, **data)
+
+    # Workers
+
+    def _fetch_worker(self, source_queue: queue.Queue) -> None:
+        while not self._stop.is_set():
+            try:
+                source, feed_url, name, label = source_queue.get_nowait()
+            except queue.Empty:
+                return
+            # Wait for the coordinator to have room for another feed
+            while not self._feed_slots.acquire(timeout=POLL_SECONDS):
+                if self._stop.is_set():
+                    return
+            print(f"Fetching from {label}...")
+            feed = None
+            try:
+                feed = self._fetch(feed_url, name)
+            except Exception as e:
+                print(f"Error fetching {label}: {e}")
+            # Always reported, so the coordinator never waits on a lost feed
+            self._inbox.put(("feed", source, feed))
+
+    def _fetch(self, feed_url: str, name: str):
+        start = time.perf_counter()
+        response = self.fetcher.download_feed(feed_url)
+        download_ms = (time.perf_counter() - start) * 1000
+        self.metrics.add_stage("download", download_ms)
+        metrics.FEED_FETCH_DURATION.labels(name).observe(download_ms / 1000)
+        if response is None:
+            metrics.FEED_FETCH_ERRORS.labels(name).inc()
+            self.metrics.record_source(name, download_ms, None, 0)
+            return None
+
+        with self.metrics.stage("parse"):
+            feed = self.fetcher.parse_feed(feed_url, response.text)
+        self.metrics.record_source(name, download_ms, len(response.content), len(feed.entries) if feed else 0)
+        return feed
+
+    def _ai_worker(self) -> None:
+        db = None
+        processor = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    article_id, category = self._articles.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    continue
+                relevance_score = None
+                try:
+                    # Set up here, so a failure is reported per article like any other
+                    if processor is None:
+                        db = db or SessionLocal()
+                        processor = AIProcessor(db)
+                    article = db.get(Article, article_id, options=[undefer(Article.content)])
+                    print(f"Processing: {article.title[:50]}...")
+                    start = time.perf_counter()
+                    processor.process_article(article)
+                    ai_ms = (time.perf_counter() - start) * 1000
+                    self.metrics.add_stage("ai", ai_ms)
+                    self.metrics.record_article(article_id, article.title, ai_ms, *(processor.last_usage or (None, None)))
+                    db.commit()
+                    relevance_score = article.relevance_score
+                except Exception as e:
+                    print(f"Error storing processed article {article_id}: {e}")
+                    if db is not None:
+                        db.rollback()
+                finally:
+                    # Always reported, so the coordinator never waits on a lost article
+                    self._inbox.put(("processed", article_id, category, relevance_score))
+        finally:
+            if db is not None:
+                db.close()
@@ -0,0 +1,307 @@
+"""
+Opt-in profiling of API requests and background jobs. A profile is a
+cProfile capture (pstats format, for snakeviz or `python -m pstats`) plus
+the SQL statements executed, aggregated by statement, saved to PROFILE_DIR.
+
+Requests are profiled when they carry `X-Profile-Token: <PROFILE_TOKEN>` or
+are picked by PROFILE_REQUEST_SAMPLE_RATE; jobs by PROFILE_JOB_SAMPLE_RATE.
+Profiled responses carry an X-Profile-Id header; the results are listed
+and downloaded from /api/profiles with the same token.
+
+cProfile is per thread, so a process profiles one request at a time (a
+request also captures other coroutines interleaved on the event loop);
+pipeline threads started during a profiled job add their own captures.
+A streaming response (e.g. fetch progress events) is only profiled up to
+its first streamed chunk, so a long-lived stream doesn't hold the profiler.
+"""
+import contextvars
+import cProfile
+import functools
+import hmac
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from uuid import uuid4
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.database import async_engine, async_read_engine, engine
+
+settings = get_settings()
+
+HEADER = "x-profile-token"
+
+# Statements kept per profile, slowest first
+MAX_STATEMENTS = 200
+
+_active: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar("profile_session", default=None)
+
+# The event loop thread can run one cProfile at a time
+_request_lock = threading.Lock()
+
+
+class ProfileSession:
+    def __init__(self, kind: str, name: str):
+        self.id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{kind}-{uuid4().hex[:8]}"
+        self.kind = kind
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._profiles: list[cProfile.Profile] = []
+        self._statements: dict[str, list] = {}  # statement -> [count, total seconds]
+        self.streamed = False  # Ended at a response's first streamed chunk
+        self.stopped = False  # Saved or about to be; later statements aren't recorded
+
+    def start_capture(self) -> cProfile.Profile:
+        """Start a cProfile of the current thread; end it with stop_capture()."""
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def stop_capture(self, profile: cProfile.Profile) -> None:
+        profile.disable()
+        with self._lock:
+            self._profiles.append(profile)
+
+    @contextmanager
+    def capture_thread(self):
+        """cProfile the current thread for the duration of the block."""
+        profile = self.start_capture()
+        try:
+            yield
+        finally:
+            self.stop_capture(profile)
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            if self.stopped:
+                return
+            entry = self._statements.setdefault(statement, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def save(self) -> None:
+        self.stopped = True
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        os.makedirs(settings.profile_dir, exist_ok=True)
+        base = os.path.join(settings.profile_dir, self.id)
+
+        with self._lock:
+            profiles = list(self._profiles)
+            statements = sorted(self._statements.items(), key=lambda item: item[1][1], reverse=True)
+
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(base + ".prof")
+
+        summary = {
+            "id": self.id,
+            "kind": self.kind,
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(duration_ms, 1),
+            "streamed": self.streamed,
+            "has_pstats": bool(profiles),
+            "sql_count": sum(count for count, _ in self._statements.values()),
+            "sql_ms": round(sum(seconds for _, seconds in self._statements.values()) * 1000, 1),
+            "statements": [
+                {"statement": statement, "count": count, "total_ms": round(seconds * 1000, 2)}
+                for statement, (count, seconds) in statements[:MAX_STATEMENTS]
+            ],
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(summary, f)
+        _prune()
+        print(f"Saved profile {self.id} ({self.name}, {summary['duration_ms']} ms).")
+
+
+def _prune() -> None:
+    """Keep only the newest PROFILE_KEEP profiles."""
+    ids = list_profile_ids()
+    for profile_id in ids[settings.profile_keep:]:
+        for suffix in (".json", ".prof"):
+            try:
+                os.remove(os.path.join(settings.profile_dir, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def list_profile_ids() -> list[str]:
+    """Saved profiles, newest first."""
+    try:
+        names = os.listdir(settings.profile_dir)
+    except FileNotFoundError:
+        return []
+    return sorted((name[:-5] for name in names if name.endswith(".json")), reverse=True)
+
+
+def load_summary(profile_id: str) -> Optional[dict]:
+    if os.path.basename(profile_id) != profile_id:
+        return None
+    try:
+        with open(os.path.join(settings.profile_dir, profile_id + ".json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def pstats_path(profile_id: str) -> Optional[str]:
+    if os.path.basename(profile_id) != profile_id:
+        return None
+    path = os.path.join(settings.profile_dir, profile_id + ".prof")
+    return path if os.path.exists(path) else None
+
+
+def token_valid(token: Optional[str]) -> bool:
+    if not settings.profile_token or token is None:
+        return False
+    return hmac.compare_digest(token.encode(), settings.profile_token.encode())
+
+
+def _sampled(rate: float) -> bool:
+    return rate > 0 and random.random() < rate
+
+
+@contextmanager
+def profile_job(kind: str, name: str):
+    """Profile a background job if PROFILE_JOB_SAMPLE_RATE picks it."""
+    if not _sampled(settings.profile_job_sample_rate):
+        yield None
+        return
+
+    setup()
+    session = ProfileSession(kind, name)
+    token = _active.set(session)
+    try:
+        with session.capture_thread():
+            yield session
+    finally:
+        _active.reset(token)
+        _save(session)
+
+
+def profiled(kind: str):
+    """Decorate a job function so sampled runs are profiled."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile_job(kind, f"{fn.__name__}({', '.join(map(repr, args))})"):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(target: Callable) -> Callable:
+    """
+    Wrap a thread target so the thread joins the current profile, if any.
+    Threads don't inherit context variables or the profiler on their own.
+    """
+    session = _active.get()
+    if session is None:
+        return target
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        with session.capture_thread():
+            return context.run(target, *args, **kwargs)
+
+    return run
+
+
+def _save(session: ProfileSession) -> None:
+    # A failed write must never fail the request or job being profiled
+    try:
+        session.save()
+    except Exception as e:
+        print(f"Failed to save profile {session.id}: {e}")
+
+
+class ProfilingMiddleware:
+    """Profile requests that carry the profile token or are sampled."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/api/profiles"):
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for key, value in scope["headers"]:
+            if key == HEADER.encode():
+                token = value.decode("latin-1")
+                break
+
+        wanted = token_valid(token) or _sampled(settings.profile_request_sample_rate)
+        if not wanted or not _request_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession("request", f"{scope['method']} {scope['path']}")
+        profile = None
+
+        def finish() -> None:
+            nonlocal profile
+            if profile is None:
+                return
+            session.stop_capture(profile)
+            profile = None
+            _request_lock.release()
+            _save(session)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", session.id)
+            elif message["type"] == "http.response.body" and message.get("more_body"):
+                # A stream may stay open for minutes; the profile covers it up to here
+                session.streamed = True
+                finish()
+            await send(message)
+
+        context_token = _active.set(session)
+        profile = session.start_capture()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active.reset(context_token)
+            finish()
+
+
+def _instrument(instrumented_engine) -> None:
+    @event.listens_for(instrumented_engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if _active.get() is not None:
+            context.profile_start = time.perf_counter()
+
+    @event.listens_for(instrumented_engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        session = _active.get()
+        start = getattr(context, "profile_start", None)
+        if session is not None and start is not None:
+            session.record_statement(statement, time.perf_counter() - start)
+
+
+_instrumented = False
+
+
+def setup() -> None:
+    """Capture SQL for active profiles on every engine, once per process."""
+    global _instrumented
+    if _instrumented:
+        return
+    _instrumented = True
+    for instrumented_engine in {engine, async_engine.sync_engine, async_read_engine.sync_engine}:
+        _instrument(instrumented_engine)
@@ -0,0 +1,128 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import CoalescingCache
+from app.database import AsyncSessionLocal
+from app.models import Article, Source
+from app.pagination import ARTICLE_ORDER
+from app.config import get_settings
+
+settings = get_settings()
+
+_digest_cache = CoalescingCache(
+    ttl_seconds=settings.digest_cache_ttl_seconds,
+    name="digest",
+    max_entries=settings.digest_cache_max_entries
+)
+
+# ArticleSummary fields, in schema order. List views select exactly these
+# columns and serialize the rows directly instead of building ORM objects
+# and Pydantic models per row.
+ARTICLE_SUMMARY_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.url,
+    Article.category,
+    Article.summary,
+    Article.key_points,
+    Article.ai_tags,
+    Article.sentiment,
+    Article.relevance_score,
+    Article.published_at,
+    Article.featured_date,
+    Source.name.label("source_name"),
+)
+
+
+def article_summary_select():
+    """SELECT of the ArticleSummary columns, joined to the source name."""
+    return select(*ARTICLE_SUMMARY_COLUMNS).select_from(Article).outerjoin(
+        Source, Article.source_id == Source.id
+    )
+
+
+def daily_digest_select(target_date: date):
+    """Featured articles for a date, in digest order."""
+    return article_summary_select().where(
+        Article.category.in_(settings.categories),
+        Article.featured_date == target_date
+    ).order_by(Article.category, Article.relevance_score.desc())
+
+
+def build_daily_digest(target_date: date, rows) -> dict:
+    """Group digest rows by category into the DailyDigest shape."""
+    categories = {category: [] for category in settings.categories}
+    for row in rows:
+        categories[row.category].append(row._asdict())
+
+    return {
+        "date": target_date,
+        "categories": categories,
+        "total_articles": sum(len(articles) for articles in categories.values())
+    }
+
+
+def available_dates_select(limit: int):
+    """Most recent dates that have featured articles."""
+    return (
+        select(Article.featured_date)
+        .where(Article.featured_date != None)
+        .distinct()
+        .order_by(desc(Article.featured_date))
+        .limit(limit)
+    )
+
+
+def category_articles_select(category: str, featured_date: Optional[date] = None, limit: int = 10):
+    """Top processed articles in a category, optionally for one date."""
+    query = article_summary_select().where(
+        Article.category == category,
+        Article.processed == True
+    )
+
+    if featured_date:
+        query = query.where(Article.featured_date == featured_date)
+
+    return query.order_by(*ARTICLE_ORDER).limit(limit)
+
+
+async def get_daily_digest(db: AsyncSession, target_date: date) -> dict:
+    """Get the featured articles for a date, grouped by category."""
+    result = await db.execute(daily_digest_select(target_date))
+    return build_daily_digest(target_date, result)
+
+
+async def get_cached_daily_digest(target_date: date, version: int) -> dict:
+    """
+    Digest for a date at a known content version. Keyed by version, so it
+    never serves an outdated selection, and concurrent misses (e.g. right
+    after selection bumps the version) share a single query. Dates that were
+    never selected (version 0) aren't cached, since any date can be asked for.
+    """
+    async def load() -> dict:
+        async with AsyncSessionLocal() as db:
+            return await get_daily_digest(db, target_date)
+
+    if not version:
+        return await load()
+    return await _digest_cache.get_or_compute((target_date, version), load)
+
+
+async def get_available_dates(db: AsyncSession, limit: int) -> list[date]:
+    """Get the most recent dates that have featured articles."""
+    result = await db.execute(available_dates_select(limit))
+    return list(result.scalars())
+
+
+async def get_category_articles(
+    db: AsyncSession,
+    category: str,
+    featured_date: Optional[date] = None,
+    limit: int = 10
+) -> list[dict]:
+    """Get the top processed articles in a category, optionally for one date."""
+    result = await db.execute(category_articles_select(category, featured_date, limit))
+    return [row._asdict() for row in result]
@@ -0,0 +1,134 @@
+import gzip
+
+import brotli
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Content types worth compressing; images and archives are already compressed
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# Codings responses are sent in: compressed here (br, gzip) or stored that
+# way (gzip, zstd newsletter bodies). Each gets a suffix inside the ETag, so
+# every encoding keeps its own strong validator.
+CONTENT_CODINGS = ("br", "gzip", "zstd")
+ETAG_ENCODING_SUFFIXES = tuple(f"-{coding}" for coding in CONTENT_CODINGS)
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """
+    ETag of a representation in a content coding. Only codings listed in
+    CONTENT_CODINGS are accepted, since If-None-Match maps the others back
+    to nothing and their clients would never get a 304.
+    """
+    if coding not in CONTENT_CODINGS:
+        raise ValueError(f"ETag suffix for unknown content coding '{coding}'")
+    return f'{etag[:-1]}-{coding}"'
+
+
+def json_response(content, response: Response) -> ORJSONResponse:
+    """
+    Serialize already-shaped data with orjson, skipping FastAPI's response
+    model validation. Headers set on the injected response (ETag, cursors)
+    are carried over, since FastAPI only merges them for non-Response returns.
+    """
+    return ORJSONResponse(content, headers=dict(response.headers))
+
+
+def choose_encoding(accept_encoding: str, available: tuple = ("br", "gzip")):
+    """Pick the first available coding an Accept-Encoding header allows, honouring q=0."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for coding in available:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip compression for complete responses above a size threshold.
+    Streaming responses (more than one body chunk) and responses that are
+    already encoded pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if message.get("more_body", False) or not self._should_compress(headers, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and etag.endswith('"'):
+                headers["ETag"] = encoded_etag(etag, encoding)
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes) -> bool:
+        if len(body) < self.minimum_size or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
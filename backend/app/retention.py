@@ -0,0 +1,129 @@
+"""
+Retention for articles, run daily as a `retention` job. Old articles are
+only ever shown in summary form, so the job:
+
+1. drops the raw `content` of processed, unfeatured articles older than
+   RETENTION_CONTENT_DAYS;
+2. moves unfeatured articles older than RETENTION_ARCHIVE_DAYS to
+   `articles_archive`, with their tag index rows and search entries;
+3. vacuums and analyzes, so the freed space is reused and the planner
+   sees the smaller tables.
+
+Featured articles are kept whole, since past digests show them. Each step
+works through the table by id in batches of RETENTION_BATCH_SIZE, one
+transaction per batch, so it never holds long locks.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app import rollups
+from app.config import get_settings
+from app.database import engine
+from app.models import ArchivedArticle, Article, ArticleTag
+
+settings = get_settings()
+
+# Columns copied into the archive, named the same in both tables
+ARCHIVED_COLUMNS = [column.name for column in ArchivedArticle.__table__.columns if column.name != "archived_at"]
+
+
+def _age():
+    return func.coalesce(Article.published_at, Article.fetched_at)
+
+
+def drop_old_content(db: Session, days: int, batch_size: int) -> int:
+    """Null the content of processed, unfeatured articles older than `days`. Returns the count."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    dropped = 0
+    last_id = 0
+
+    while True:
+        ids = db.execute(
+            select(Article.id)
+            .where(
+                Article.id > last_id,
+                Article.processed == True,
+                Article.featured_date == None,
+                Article.content != None,
+                _age() < cutoff
+            )
+            .order_by(Article.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return dropped
+
+        db.execute(
+            update(Article).where(Article.id.in_(ids)).values(content=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        dropped += len(ids)
+        last_id = ids[-1]
+
+
+def archive_old_articles(db: Session, days: int, batch_size: int) -> int:
+    """Move unfeatured articles older than `days` to articles_archive. Returns the count."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    archived = 0
+    last_id = 0
+
+    while True:
+        rows = db.execute(
+            select(Article.id, Article.category, Article.processed)
+            .where(Article.id > last_id, Article.featured_date == None, _age() < cutoff)
+            .order_by(Article.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return archived
+
+        ids = [row.id for row in rows]
+        db.execute(insert(ArchivedArticle).from_select(
+            ARCHIVED_COLUMNS,
+            select(*(Article.__table__.c[name] for name in ARCHIVED_COLUMNS)).where(Article.id.in_(ids))
+        ))
+        # Explicitly: SQLite doesn't enforce the cascade
+        db.execute(delete(ArticleTag).where(ArticleTag.article_id.in_(ids)))
+        db.execute(delete(Article).where(Article.id.in_(ids)).execution_options(synchronize_session=False))
+        rollups.record_articles_removed(db, [(row.category, row.processed) for row in rows])
+        db.commit()
+        archived += len(ids)
+        last_id = ids[-1]
+
+
+def vacuum() -> None:
+    """
+    PostgreSQL: plain VACUUM ANALYZE, which makes the space reusable without
+    locking out readers. SQLite: VACUUM rewrites the file to give the space
+    back, so it waits for other connections' transactions to finish.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("VACUUM (ANALYZE) articles, article_tags, articles_archive"))
+        else:
+            conn.execute(text("VACUUM"))
+            conn.execute(text("ANALYZE"))
+
+
+def apply_retention(db: Session) -> dict:
+    """Run every configured retention step. Returns what was done."""
+    result = {"content_dropped": 0, "archived": 0}
+
+    if settings.retention_content_days:
+        result["content_dropped"] = drop_old_content(db, settings.retention_content_days, settings.retention_batch_size)
+        print(f"Retention: dropped content of {result['content_dropped']} articles.")
+
+    if settings.retention_archive_days:
+        result["archived"] = archive_old_articles(db, settings.retention_archive_days, settings.retention_batch_size)
+        print(f"Retention: archived {result['archived']} articles.")
+        if result["archived"]:
+            rollups.invalidate_stats()
+
+    if settings.retention_vacuum and any(result.values()):
+        vacuum()
+        print("Retention: vacuumed and analyzed.")
+
+    return result
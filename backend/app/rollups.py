@@ -0,0 +1,191 @@
+from collections import Counter
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import func, desc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache import CoalescingCache
+from app.database import AsyncSessionLocal
+from app.models import Article, Source, FetchLog, CategoryStats, DigestVersion
+from app.config import get_settings
+
+settings = get_settings()
+
+_stats_cache = CoalescingCache(
+    ttl_seconds=settings.stats_cache_ttl_seconds,
+    stale_seconds=settings.cache_stale_seconds,
+    name="stats"
+)
+
+
+def record_articles_added(db: Session, categories: Iterable[str]) -> None:
+    """
+    Increment per-category article counters for newly inserted articles.
+    Runs inside the caller's transaction so counters commit with the rows.
+    """
+    for category, count in Counter(categories).items():
+        _increment(db, category, total_articles=count)
+
+
+def record_article_processed(db: Session, category: str) -> None:
+    """Increment the processed counter for an article that was just processed."""
+    _increment(db, category, processed_articles=1)
+
+
+def record_articles_removed(db: Session, articles: Iterable[tuple[str, bool]]) -> None:
+    """Decrement the counters for (category, processed) of articles taken out of the table."""
+    totals, processed = Counter(), Counter()
+    for category, was_processed in articles:
+        totals[category] += 1
+        processed[category] += bool(was_processed)
+    for category, count in totals.items():
+        _increment(db, category, total_articles=-count, processed_articles=-processed[category])
+
+
+def _increment(db: Session, category: str, total_articles: int = 0, processed_articles: int = 0) -> None:
+    """Apply counter deltas with a single UPDATE, creating the row if needed."""
+    result = db.execute(
+        update(CategoryStats)
+        .where(CategoryStats.category == category)
+        .values(
+            total_articles=CategoryStats.total_articles + total_articles,
+            processed_articles=CategoryStats.processed_articles + processed_articles,
+        )
+    )
+
+    if result.rowcount == 0:
+        db.add(CategoryStats(
+            category=category,
+            total_articles=total_articles,
+            processed_articles=processed_articles
+        ))
+        db.flush()
+
+
+def record_digest_changed(db: Session, featured_date: date) -> None:
+    """Bump the content version of a digest date after its selection changed."""
+    result = db.execute(
+        update(DigestVersion)
+        .where(DigestVersion.featured_date == featured_date)
+        .values(version=DigestVersion.version + 1)
+    )
+
+    if result.rowcount == 0:
+        db.add(DigestVersion(featured_date=featured_date, version=1))
+        db.flush()
+
+
+async def get_digest_version(db: AsyncSession, featured_date: date) -> int:
+    """Current content version of a digest date (0 if it was never selected)."""
+    result = await db.execute(
+        select(DigestVersion.version).where(DigestVersion.featured_date == featured_date)
+    )
+    return result.scalar() or 0
+
+
+async def get_digest_dates_version(db: AsyncSession) -> tuple:
+    """Version of the list of digest dates; changes whenever a date gains a digest."""
+    result = await db.execute(select(
+        func.count(DigestVersion.featured_date),
+        func.max(DigestVersion.featured_date)
+    ))
+    return tuple(result.one())
+
+
+async def get_category_version(db: AsyncSession, category: str) -> tuple:
+    """
+    Version of a category's undated article listing. It changes when a new
+    article in the category is processed or when any digest selection runs,
+    since both can alter which articles are listed or their featured_date.
+    """
+    result = await db.execute(
+        select(CategoryStats.processed_articles, CategoryStats.updated_at)
+        .where(CategoryStats.category == category)
+    )
+    counters = result.one_or_none()
+
+    result = await db.execute(select(func.max(DigestVersion.updated_at)))
+    last_selection = result.scalar()
+
+    return (tuple(counters) if counters else None, last_selection)
+
+
+def rebuild_category_stats(db: Session) -> None:
+    """Recompute every category counter from the articles table with one GROUP BY."""
+    rows = db.query(
+        Article.category,
+        func.count(Article.id),
+        func.count(Article.id).filter(Article.processed == True)
+    ).group_by(Article.category).all()
+
+    db.query(CategoryStats).delete()
+    for category, total, processed in rows:
+        db.add(CategoryStats(
+            category=category,
+            total_articles=total,
+            processed_articles=processed
+        ))
+
+    db.commit()
+    invalidate_stats()
+    print(f"Category stats rebuilt for {len(rows)} categories.")
+
+
+def ensure_category_stats(db: Session) -> None:
+    """Seed the counters from existing data the first time they are needed."""
+    if db.query(CategoryStats.category).first() is None:
+        rebuild_category_stats(db)
+
+
+async def get_stats_snapshot() -> dict:
+    """
+    The /api/stats payload, built from the counters table so its cost is
+    independent of the number of articles. Every page view requests it, so
+    it is cached, concurrent misses share one build, and an expired value
+    is served while it refreshes.
+    """
+    return await _stats_cache.get_or_compute("stats", _build_stats_snapshot)
+
+
+async def _build_stats_snapshot() -> dict:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(CategoryStats))
+        counters = {row.category: row for row in result.scalars()}
+
+        result = await db.execute(select(
+            func.count(Source.id),
+            func.count(Source.id).filter(Source.active == True)
+        ))
+        total_sources, active_sources = result.one()
+
+        result = await db.execute(
+            select(FetchLog).order_by(desc(FetchLog.started_at)).limit(1)
+        )
+        last_fetch = result.scalars().first()
+
+    articles_by_category = {}
+    for category in settings.categories:
+        row = counters.get(category)
+        articles_by_category[category] = row.total_articles if row else 0
+
+    return {
+        "total_articles": sum(row.total_articles for row in counters.values()),
+        "processed_articles": sum(row.processed_articles for row in counters.values()),
+        "articles_by_category": articles_by_category,
+        "total_sources": total_sources,
+        "active_sources": active_sources,
+        "last_fetch": {
+            "status": last_fetch.status,
+            "started_at": last_fetch.started_at,
+            "articles_fetched": last_fetch.articles_fetched
+        } if last_fetch else None,
+        "categories": settings.categories,
+        "fetch_interval_hours": settings.fetch_schedule_hours
+    }
+
+
+def invalidate_stats() -> None:
+    """Drop the cached stats so the next request sees fresh counters."""
+    _stats_cache.invalidate()
@@ -1,13 +1,14 @@
 import feedparser
 import httpx
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 from dateutil import parser as date_parser
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from app.models import Source, Article
 from app.config import RSS_SOURCES, get_settings
+from app import rollups
 
 settings = get_settings()
 
@@ -15,9 +16,10 @@ settings = get_settings()
 class RSSFetcher:
     """Fetches and parses RSS feeds."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, on_event: Optional[Callable[..., None]] = None):
         self.db = db
         self.timeout = 30.0
+        self.on_event = on_event  # Progress callback: on_event(event_type, **data)
     
     def ensure_sources_exist(self) -> None:
         """Ensure all configured sources exist in the database."""
@@ -42,15 +44,33 @@ class RSSFetcher:
     
     def fetch_feed(self, feed_url: str) -> Optional[feedparser.FeedParserDict]:
         """Fetch and parse a single RSS feed."""
+        response = self.download_feed(feed_url)
+        if response is None:
+            return None
+        return self.parse_feed(feed_url, response.text)
+    
+    def download_feed(self, feed_url: str) -> Optional[httpx.Response]:
+        """Download a feed, or None on failure."""
         try:
-            # Use httpx to fetch with timeout, then parse
+            # Use httpx to fetch with timeout
             with httpx.Client(timeout=self.timeout, follow_redirects=True) as client:
                 response = client.get(feed_url, headers={
                     "User-Agent": "NewsAggregator/1.0 (https://github.com/news-aggregator)"
                 })
                 response.raise_for_status()
-                
-            feed = feedparser.parse(response.text)
+            return response
+            
+        except httpx.HTTPError as e:
+            print(f"HTTP error fetching {feed_url}: {e}")
+            return None
+        except Exception as e:
+            print(f"Error fetching {feed_url}: {e}")
+            return None
+    
+    def parse_feed(self, feed_url: str, text: str) -> Optional[feedparser.FeedParserDict]:
+        """Parse a downloaded feed, or None if it has no usable entries."""
+        try:
+            feed = feedparser.parse(text)
             
             if feed.bozo and not feed.entries:
                 print(f"Warning: Feed {feed_url} has parsing issues: {feed.bozo_exception}")
@@ -58,11 +78,8 @@ class RSSFetcher:
             
             return feed
             
-        except httpx.HTTPError as e:
-            print(f"HTTP error fetching {feed_url}: {e}")
-            return None
         except Exception as e:
-            print(f"Error fetching {feed_url}: {e}")
+            print(f"Error parsing {feed_url}: {e}")
             return None
     
     def parse_published_date(self, entry: dict) -> Optional[datetime]:
@@ -106,7 +123,15 @@ class RSSFetcher:
     def fetch_source_articles(self, source: Source, limit: int = 10) -> list[dict]:
         """Fetch articles from a single source."""
         feed = self.fetch_feed(source.feed_url)
-        
+        return self.parse_source_articles(source, feed, limit=limit)
+    
+    def parse_source_articles(
+        self,
+        source: Source,
+        feed: Optional[feedparser.FeedParserDict],
+        limit: int = 10
+    ) -> list[dict]:
+        """Articles from an already-fetched feed that aren't stored yet."""
         if not feed or not feed.entries:
             return []
         
@@ -148,7 +173,7 @@ class RSSFetcher:
         sources = self.db.query(Source).filter(Source.active == True).all()
         all_articles = []
         
-        for source in sources:
+        for index, source in enumerate(sources, start=1):
             print(f"Fetching from {source.name} ({source.category})...")
             
             article_data_list = self.fetch_source_articles(
@@ -156,15 +181,28 @@ class RSSFetcher:
                 limit=articles_per_source
             )
             
+            new_articles = 0
             for article_data in article_data_list:
                 try:
                     article = Article(**article_data)
                     self.db.add(article)
                     all_articles.append(article)
+                    new_articles += 1
                 except Exception as e:
                     print(f"Error saving article: {e}")
                     continue
-        
+            
+            if self.on_event:
+                self.on_event(
+                    "source_fetched",
+                    source=source.name,
+                    category=source.category,
+                    new_articles=new_articles,
+                    sources_done=index,
+                    sources_total=len(sources)
+                )
+        
+        rollups.record_articles_added(self.db, [a.category for a in all_articles])
         self.db.commit()
         print(f"Fetched {len(all_articles)} new articles total.")
         
@@ -197,5 +235,6 @@ class RSSFetcher:
                     print(f"Error saving article: {e}")
                     continue
         
+        rollups.record_articles_added(self.db, [a.category for a in all_articles])
         self.db.commit()
         return all_articles
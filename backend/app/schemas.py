@@ -96,6 +96,54 @@ class FetchLog(FetchLogBase):
         from_attributes = True
 
 
+class Percentiles(BaseModel):
+    """Nearest-rank percentiles of a set of measurements."""
+    count: int
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+    max: Optional[float] = None
+
+
+class StageTiming(BaseModel):
+    """Busy time of a pipeline stage, summed across its workers."""
+    total_ms: float
+    count: Optional[int] = None
+
+
+class SourceTiming(BaseModel):
+    name: str
+    duration_ms: float
+    bytes: Optional[int] = None
+    entries: Optional[int] = None
+
+
+class SourceMetrics(BaseModel):
+    latency_ms: Percentiles
+    bytes_total: int
+    entries_total: int
+    slowest: list[SourceTiming]
+
+
+class ArticleMetrics(BaseModel):
+    latency_ms: Percentiles
+    input_tokens: Percentiles
+    output_tokens: Percentiles
+    input_tokens_total: int
+    output_tokens_total: int
+
+
+class FetchLogMetrics(BaseModel):
+    stages: dict[str, StageTiming]
+    sources: SourceMetrics
+    articles: ArticleMetrics
+
+
+class FetchLogDetail(FetchLog):
+    """Fetch log with its per-stage, per-source and per-article metrics."""
+    metrics: FetchLogMetrics
+
+
 # API Response Schemas
 class DailyDigest(BaseModel):
     """Daily digest with articles grouped by category."""
@@ -111,6 +159,12 @@ class CategoryArticles(BaseModel):
     total: int
 
 
+class TagCount(BaseModel):
+    """Number of recent articles carrying a tag."""
+    tag: str
+    count: int
+
+
 class HealthCheck(BaseModel):
     """Health check response."""
     status: str
@@ -132,9 +186,9 @@ class NewsletterBase(BaseModel):
 
 
 class Newsletter(NewsletterBase):
-    """Newsletter with full content and AI summary."""
+    """Newsletter metadata and AI summary; the HTML body is served separately."""
     id: int
-    content: Optional[str] = None
+    content_length: Optional[int] = None
     published_at: Optional[datetime] = None
     fetched_at: datetime
     executive_summary: Optional[str] = None
@@ -144,6 +198,14 @@ class Newsletter(NewsletterBase):
         from_attributes = True
 
 
+class Bootstrap(BaseModel):
+    """Everything the homepage needs for its first render."""
+    dates: list[date]
+    digest: DailyDigest
+    stats: dict
+    newsletter: Optional[Newsletter] = None
+
+
 class NewsletterTriggerResponse(BaseModel):
     """Response for newsletter fetch trigger."""
     message: str
@@ -0,0 +1,89 @@
+import re
+from typing import Optional
+
+from sqlalchemy import and_, column, func, literal_column, or_, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Article
+from app.queries import article_summary_select
+from app.pagination import encode_cursor, decode_cursor
+
+# Relative weights of the FTS5 columns (title, summary, key_points, ai_tags),
+# matching the setweight() classes of the PostgreSQL search_vector.
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 1.0, 4.0)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# FTS5 index created by migration 0005; it is not mapped on the models
+articles_fts = table("articles_fts", column("rowid"))
+
+
+def _fts5_query(q: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match, as a
+    prefix. Quoting each term keeps FTS5 operators in user input inert.
+    """
+    words = _WORD_RE.findall(q)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_cursor(rank: float, article_id: int) -> str:
+    """Cursor pointing just past a search result."""
+    return encode_cursor([rank, article_id])
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """Decode a search cursor into its (rank, id) key. Raises ValueError if malformed."""
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise ValueError("Malformed cursor: expected 2 values")
+    try:
+        return float(values[0]), int(values[1])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {e}") from e
+
+
+async def search_articles(
+    db: AsyncSession,
+    q: str,
+    category: Optional[str] = None,
+    limit: int = 20,
+    cursor_key: Optional[tuple[float, int]] = None
+) -> list:
+    """
+    Rank processed articles against a free-text query using the database's
+    full-text index: the GIN-indexed search_vector on PostgreSQL, FTS5 on
+    SQLite. Returns rows of ArticleSummary columns plus a `rank` column,
+    best match first; higher rank is better on both backends.
+    """
+    if db.bind.dialect.name == "postgresql":
+        ts_query = func.websearch_to_tsquery("english", q)
+        search_vector = literal_column("articles.search_vector")
+        rank = func.ts_rank_cd(search_vector, ts_query).label("rank")
+        query = article_summary_select().add_columns(rank).where(search_vector.op("@@")(ts_query))
+    else:
+        match = _fts5_query(q)
+        if match is None:
+            return []
+        # bm25() is lower-is-better, negate it so both backends sort descending
+        rank = (-func.bm25(literal_column("articles_fts"), *SQLITE_BM25_WEIGHTS)).label("rank")
+        query = article_summary_select().add_columns(rank).join(
+            articles_fts, articles_fts.c.rowid == Article.id
+        ).where(literal_column("articles_fts").op("MATCH")(match))
+
+    query = query.where(Article.processed == True)
+
+    if category:
+        query = query.where(Article.category == category)
+
+    if cursor_key:
+        last_rank, last_id = cursor_key
+        query = query.where(or_(
+            rank < last_rank,
+            and_(rank == last_rank, Article.id < last_id)
+        ))
+
+    result = await db.execute(query.order_by(rank.desc(), Article.id.desc()).limit(limit))
+    return result.all()
@@ -0,0 +1,257 @@
+"""
+Precompressed JSON snapshots of the digest endpoints.
+
+A digest date only changes when selection runs, so selection publishes the
+date's digest, its category pages and the dates list as files, each with
+gzip and brotli variants. Every file starts with a line holding the ETag the
+API would send for it, so a body and its ETag are always read together. The
+API serves those files before touching the database.
+
+Only the default query shapes are published (the dates list at its default
+limit, category pages at their default limit), which is what the frontend
+requests; anything else falls through to the database.
+
+Rebuild every date, e.g. after restoring a backup:
+    python -m app.snapshots
+"""
+import gzip
+import os
+import sys
+import tempfile
+from datetime import date
+from typing import Optional
+
+import brotli
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import http_cache, queries
+from app.config import get_settings
+from app.models import DigestVersion
+from app.responses import choose_encoding, encoded_etag
+
+settings = get_settings()
+
+# Limits the API uses when the client passes none
+DATES_LIMIT = 30
+CATEGORY_LIMIT = 10
+
+ENCODING_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+
+def digest_name(target_date: date) -> str:
+    return f"digest/{target_date.isoformat()}"
+
+
+def dates_name(limit: int) -> Optional[str]:
+    return "dates" if limit == DATES_LIMIT else None
+
+
+def category_name(category: str, featured_date: Optional[date], limit: int) -> Optional[str]:
+    # Undated category pages change with every processed article
+    if featured_date is None or limit != CATEGORY_LIMIT:
+        return None
+    return f"categories/{category}/{featured_date.isoformat()}"
+
+
+def _path(name: str) -> str:
+    return os.path.join(settings.snapshot_dir, *name.split("/"))
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_snapshot(name: str, content, etag: str) -> None:
+    """
+    Write a JSON snapshot, and its compressed variants when it is big enough
+    to be compressed (the same rule as CompressionMiddleware, so both paths
+    agree on the ETag). Each file is replaced atomically and carries its own
+    ETag, so a reader never pairs a new ETag with an old body.
+    """
+    body = ORJSONResponse(content).body
+    base = _path(name) + ".json"
+    header = etag.encode() + b"\n"
+
+    _write_atomic(base, header + body)
+    if len(body) >= settings.compression_minimum_size:
+        _write_atomic(base + ".gz", header + gzip.compress(body, compresslevel=9))
+        _write_atomic(base + ".br", header + brotli.compress(body, quality=11))
+    else:
+        _unlink(*(base + extension for extension in ENCODING_EXTENSIONS.values()))
+
+
+def _unlink(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_snapshot(name: str) -> None:
+    base = _path(name) + ".json"
+    # .etag: written next to the body before ETags moved inside the files
+    _unlink(base, *(base + extension for extension in ENCODING_EXTENSIONS.values()), _path(name) + ".etag")
+
+
+def _read_snapshot(path: str) -> Optional[tuple[str, bytes]]:
+    """ETag and body of a snapshot file, or None if it doesn't exist."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    etag, _, body = data.partition(b"\n")
+    # Files from before ETags moved inside them start with the body
+    if not (etag.startswith(b'"') and etag.endswith(b'"')):
+        return None
+    return etag.decode(), body
+
+
+def serve_snapshot(request: Request, name: Optional[str], cache_control_value: str) -> Optional[Response]:
+    """
+    Response for a published snapshot, in the encoding the client prefers,
+    or None when snapshots are disabled or this one was never published.
+    """
+    if not settings.snapshot_dir or name is None:
+        return None
+
+    path = _path(name) + ".json"
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    snapshot = _read_snapshot(path + ENCODING_EXTENSIONS[encoding]) if encoding else None
+    if snapshot is None:
+        # Too small to have been compressed, or the client takes no encoding we have
+        encoding = None
+        snapshot = _read_snapshot(path)
+        if snapshot is None:
+            return None
+    etag, body = snapshot
+
+    not_modified = http_cache.conditional_response(request, Response(), etag, cache_control_value)
+    if not_modified:
+        return not_modified
+
+    headers = {"Cache-Control": cache_control_value, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        etag = encoded_etag(etag, encoding)
+    headers["ETag"] = etag
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _digest_version(db: Session, featured_date: date) -> int:
+    return db.execute(
+        select(DigestVersion.version).where(DigestVersion.featured_date == featured_date)
+    ).scalar() or 0
+
+
+def _dates_version(db: Session) -> tuple:
+    return tuple(db.execute(select(
+        func.count(DigestVersion.featured_date),
+        func.max(DigestVersion.featured_date)
+    )).one())
+
+
+def _publish(db: Session, featured_date: date) -> None:
+    # ETags are built from the same parts as the API's, so a client keeps
+    # its cached copy whichever path answers
+    version = _digest_version(db, featured_date)
+
+    rows = db.execute(queries.daily_digest_select(featured_date))
+    write_snapshot(
+        digest_name(featured_date),
+        queries.build_daily_digest(featured_date, rows),
+        http_cache.make_etag("digest", featured_date, version, settings.categories)
+    )
+
+    for category in settings.categories:
+        rows = db.execute(queries.category_articles_select(category, featured_date, CATEGORY_LIMIT))
+        articles = [row._asdict() for row in rows]
+        write_snapshot(
+            category_name(category, featured_date, CATEGORY_LIMIT),
+            {"category": category, "articles": articles, "total": len(articles)},
+            http_cache.make_etag("category", category, featured_date, CATEGORY_LIMIT, version)
+        )
+
+
+def _publish_dates(db: Session) -> None:
+    dates = list(db.execute(queries.available_dates_select(DATES_LIMIT)).scalars())
+    write_snapshot(
+        dates_name(DATES_LIMIT),
+        {"dates": dates},
+        http_cache.make_etag("dates", DATES_LIMIT, _dates_version(db))
+    )
+
+
+def publish_digest(db: Session, featured_date: date) -> None:
+    """
+    Publish a date's digest and category pages plus the dates list. Called
+    after selection commits; a failure only costs the fast path, so it is
+    logged rather than raised, and the date's existing snapshots are removed
+    rather than left serving the previous selection.
+    """
+    if not settings.snapshot_dir:
+        return
+
+    try:
+        _publish(db, featured_date)
+        _publish_dates(db)
+        print(f"Published digest snapshots for {featured_date}.")
+    except Exception as e:
+        print(f"Failed to publish digest snapshots for {featured_date}: {e}")
+        # The files on disk predate the selection that was just committed
+        discard_digest(featured_date)
+
+
+def discard_digest(featured_date: date) -> None:
+    """
+    Remove a date's digest and category snapshots and the dates list, so
+    their requests fall through to the database until the next publish.
+    """
+    if not settings.snapshot_dir:
+        return
+
+    names = [digest_name(featured_date), dates_name(DATES_LIMIT)]
+    names += [category_name(category, featured_date, CATEGORY_LIMIT) for category in settings.categories]
+    try:
+        for name in names:
+            _remove_snapshot(name)
+        print(f"Removed digest snapshots for {featured_date}.")
+    except Exception as e:
+        print(f"Failed to remove digest snapshots for {featured_date}: {e}")
+
+
+def publish_all(db: Session) -> int:
+    """Republish every digest date."""
+    featured_dates = list(db.execute(select(DigestVersion.featured_date)).scalars())
+    for featured_date in featured_dates:
+        _publish(db, featured_date)
+    _publish_dates(db)
+    return len(featured_dates)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if not settings.snapshot_dir:
+        print("SNAPSHOT_DIR is empty, snapshots are disabled.")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        count = publish_all(db)
+    finally:
+        db.close()
+    print(f"Published snapshots for {count} digest dates to {settings.snapshot_dir}.")
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Article, ArticleTag
+
+MAX_TAG_LENGTH = 100
+
+
+def normalize_tag(tag) -> Optional[str]:
+    """Canonical form of a tag as stored in the index, or None if unusable."""
+    if not isinstance(tag, str):
+        return None
+    tag = tag.strip().lower()[:MAX_TAG_LENGTH]
+    return tag or None
+
+
+def normalize_tags(tags: Optional[Iterable]) -> list[str]:
+    """Normalized, de-duplicated tags in their original order."""
+    normalized = []
+    for tag in tags or []:
+        tag = normalize_tag(tag)
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def record_article_tags(db: Session, article: Article) -> None:
+    """
+    Replace an article's rows in the tag index with its current ai_tags.
+    Runs inside the caller's transaction so the index commits with the article.
+    """
+    db.execute(delete(ArticleTag).where(ArticleTag.article_id == article.id))
+    db.add_all([
+        ArticleTag(
+            article_id=article.id,
+            tag=tag,
+            category=article.category,
+            published_at=article.published_at or article.processed_at
+        )
+        for tag in normalize_tags(article.ai_tags)
+    ])
+
+
+def tagged_article_ids(tag: str):
+    """Subquery of the ids of articles carrying a tag, for IN filters."""
+    return select(ArticleTag.article_id).where(ArticleTag.tag == normalize_tag(tag))
+
+
+async def get_tag_counts(
+    db: AsyncSession,
+    days: int = 7,
+    category: Optional[str] = None,
+    limit: int = 20
+) -> list[dict]:
+    """Most used tags among articles from the last `days` days."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    count = func.count().label("count")
+
+    query = select(ArticleTag.tag, count).where(ArticleTag.published_at >= cutoff)
+    if category:
+        query = query.where(ArticleTag.category == category)
+
+    result = await db.execute(
+        query.group_by(ArticleTag.tag).order_by(desc(count), ArticleTag.tag).limit(limit)
+    )
+    return [row._asdict() for row in result]
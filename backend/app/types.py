@@ -0,0 +1,120 @@
+import gzip
+import os
+import threading
+from glob import glob
+from typing import Optional
+
+import zstandard
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.config import get_settings
+
+settings = get_settings()
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# zstd contexts aren't thread-safe, so each thread gets its own
+_local = threading.local()
+_dictionaries: Optional[dict[int, zstandard.ZstdCompressionDict]] = None
+_active_dict_id: Optional[int] = None  # Dictionary new values are compressed with
+_dictionaries_lock = threading.Lock()
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored zstd-compressed in a binary column, with the trained
+    ZSTD_DICTIONARY when `dictionary` is set and one is configured. Values
+    read back as str whatever wrote them (zstd with or without a dictionary,
+    gzip from before zstd, or plain text). Select the column through
+    type_coerce(column, LargeBinary) to get the stored bytes, e.g. to send
+    them to a client as-is.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dictionary: bool = False):
+        super().__init__()
+        self.dictionary = dictionary
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value, dictionary=self.dictionary)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_text(value)
+
+
+def load_dictionaries() -> dict[int, zstandard.ZstdCompressionDict]:
+    """
+    Every dictionary next to ZSTD_DICTIONARY (*.zdict), by dictionary id,
+    so rows written with an earlier dictionary stay readable while its file
+    is kept.
+    """
+    global _dictionaries, _active_dict_id
+    with _dictionaries_lock:
+        if _dictionaries is None:
+            dictionaries = {}
+            if settings.zstd_dictionary:
+                paths = glob(os.path.join(os.path.dirname(settings.zstd_dictionary) or ".", "*.zdict"))
+                for path in sorted(set(paths) | {settings.zstd_dictionary}):
+                    with open(path, "rb") as f:
+                        dictionary = zstandard.ZstdCompressionDict(f.read())
+                    dictionaries[dictionary.dict_id()] = dictionary
+                    if path == settings.zstd_dictionary:
+                        _active_dict_id = dictionary.dict_id()
+            _dictionaries = dictionaries
+        return _dictionaries
+
+
+def _compressor(dictionary: bool) -> zstandard.ZstdCompressor:
+    compressors = getattr(_local, "compressors", None)
+    if compressors is None:
+        compressors = _local.compressors = {}
+    if dictionary not in compressors:
+        dict_data = load_dictionaries()[_active_dict_id] if dictionary else None
+        compressors[dictionary] = zstandard.ZstdCompressor(
+            level=settings.zstd_level,
+            dict_data=dict_data,
+            # Frames record the dictionary id, which is how reads find the dictionary
+            write_dict_id=True,
+        )
+    return compressors[dictionary]
+
+
+def _decompressor(dict_id: int) -> zstandard.ZstdDecompressor:
+    decompressors = getattr(_local, "decompressors", None)
+    if decompressors is None:
+        decompressors = _local.decompressors = {}
+    if dict_id not in decompressors:
+        dict_data = None
+        if dict_id:
+            dict_data = load_dictionaries().get(dict_id)
+            if dict_data is None:
+                raise ValueError(f"zstd dictionary {dict_id} not found next to ZSTD_DICTIONARY")
+        decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+    return decompressors[dict_id]
+
+
+def compress_text(value: str, dictionary: bool = False) -> bytes:
+    """Encode a value for a CompressedText column."""
+    return _compressor(dictionary and bool(settings.zstd_dictionary)).compress(value.encode("utf-8"))
+
+
+def zstd_dict_id(value: bytes) -> int:
+    """Dictionary a stored zstd value needs, 0 for none."""
+    return zstandard.get_frame_parameters(value).dict_id
+
+
+def decompress_text(value) -> str:
+    """Decode a stored CompressedText value."""
+    if isinstance(value, str):
+        return value
+    if value[:4] == ZSTD_MAGIC:
+        value = _decompressor(zstd_dict_id(value)).decompress(value)
+    elif value[:2] == GZIP_MAGIC:
+        value = gzip.decompress(value)
+    return bytes(value).decode("utf-8")
@@ -0,0 +1,128 @@
+"""
+Job runner: claims jobs from the queue (app.jobs) and runs them, at most
+WORKER_CONCURRENCY[type] at a time per job type. Run it as its own process
+or container:
+
+    python -m app.worker
+
+With EMBEDDED_WORKER set, the API starts one in-process instead, for
+single-process setups.
+"""
+import os
+import signal
+import socket
+import threading
+from typing import Optional
+
+from prometheus_client import start_http_server
+
+from app import events, jobs, metrics
+from app.config import get_settings
+from app.database import SessionLocal
+
+settings = get_settings()
+
+
+class Worker:
+    """Polls the queue from one thread per concurrency slot."""
+
+    def __init__(self, concurrency: dict[str, int], poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for job_type, slots in self.concurrency.items():
+            if job_type not in jobs.HANDLERS:
+                print(f"Worker: ignoring unknown job type '{job_type}'")
+                continue
+            for slot in range(slots):
+                thread = threading.Thread(
+                    target=self._run, args=(job_type,), name=f"worker-{job_type}-{slot}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        print(f"Worker {self.name} started: {self.concurrency}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming jobs and wait for the running ones to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        print(f"Worker {self.name} stopped.")
+
+    def _run(self, job_type: str) -> None:
+        while not self._stop.is_set():
+            try:
+                ran = self._run_next(job_type)
+            except Exception as e:
+                print(f"Worker: failed to claim {job_type} job: {e}")
+                ran = False
+            if not ran:
+                self._stop.wait(self.poll_interval)
+
+    def _run_next(self, job_type: str) -> bool:
+        db = SessionLocal()
+        try:
+            job = jobs.claim(db, job_type, self.name)
+            if job is None:
+                return False
+
+            print(f"Worker: running {job_type} job {job.id}")
+            done = threading.Event()
+            beat = threading.Thread(
+                target=self._heartbeat, args=(job.id, done), name=f"heartbeat-{job.id}", daemon=True
+            )
+            beat.start()
+            error = None
+            try:
+                jobs.HANDLERS[job_type](job.payload or {})
+            except Exception as e:
+                error = str(e)
+            finally:
+                done.set()
+                beat.join()
+            if jobs.finish(db, job, self.name, error):
+                print(f"Worker: {job_type} job {job.id} {job.status}")
+            else:
+                print(f"Worker: {job_type} job {job.id} was reclaimed while running ({job.status})")
+
+            # Lets an API in another process drop caches the job made stale
+            events.publish(events.JOBS_CHANNEL, "job_finished", job_id=job.id, job_type=job_type)
+            return True
+        finally:
+            db.close()
+
+    def _heartbeat(self, job_id: int, done: threading.Event) -> None:
+        while not done.wait(settings.worker_heartbeat_seconds):
+            db = SessionLocal()
+            try:
+                if not jobs.heartbeat(db, job_id, self.name):
+                    print(f"Worker: lost the lease on job {job_id}")
+                    return
+            except Exception as e:
+                print(f"Worker: heartbeat for job {job_id} failed: {e}")
+            finally:
+                db.close()
+
+
+def create_worker() -> Worker:
+    return Worker(settings.worker_concurrency, settings.worker_poll_interval_seconds)
+
+
+if __name__ == "__main__":
+    metrics.setup()
+    if settings.worker_metrics_port:
+        start_http_server(settings.worker_metrics_port)
+        print(f"Worker metrics on port {settings.worker_metrics_port}")
+
+    worker = create_worker()
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.set())
+
+    worker.start()
+    stopping.wait()
+    worker.stop()
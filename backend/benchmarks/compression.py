@@ -0,0 +1,167 @@
+"""
+Measure what compressing article bodies saves, on a sample of real-sized
+content from a database (filled by benchmarks.seed, or a copy of production).
+
+Half of the sampled articles train a zstd dictionary and the other half are
+compressed four ways: not at all, gzip -9 (how newsletters were stored
+before), zstd at ZSTD_LEVEL, and zstd with the trained dictionary. Then both
+the plain and the dictionary-compressed bodies are written to scratch SQLite
+tables to compare file size and the time to read every body back.
+
+Usage (from the backend directory):
+    python -m benchmarks.compression
+    python -m benchmarks.compression --database-url postgresql://.../copy --sample 50000
+    python -m benchmarks.compression --write-dictionary ./data/zstd/articles-1.zdict
+
+A dictionary written with --write-dictionary is used for new rows once
+ZSTD_DICTIONARY points at it; keep older .zdict files in the same directory
+so the rows written with them stay readable.
+"""
+import argparse
+import gzip
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+DEFAULT_DATABASE_URL = "sqlite:///./data/bench_read.db"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--sample", type=int, default=20_000, help="Articles with content to sample")
+    parser.add_argument("--level", type=int, help="zstd level (default ZSTD_LEVEL)")
+    parser.add_argument("--dict-size", type=int, default=112_640, help="Trained dictionary size in bytes")
+    parser.add_argument("--write-dictionary", help="Save the trained dictionary to this path")
+    return parser.parse_args()
+
+
+def load_sample(limit: int) -> list[bytes]:
+    """Raw article bodies, newest first, whichever way they are stored."""
+    from sqlalchemy import LargeBinary, select, type_coerce
+    from app.database import SessionLocal
+    from app.models import Article
+    from app.types import decompress_text
+
+    with SessionLocal() as db:
+        stored = db.execute(
+            select(type_coerce(Article.content, LargeBinary))
+            .where(Article.content != None)
+            .order_by(Article.id.desc())
+            .limit(limit)
+        ).scalars().all()
+    return [decompress_text(value).encode("utf-8") for value in stored]
+
+
+def measure(name: str, values: list[bytes], compress, decompress) -> dict:
+    raw_bytes = sum(len(value) for value in values)
+    start = time.perf_counter()
+    compressed = [compress(value) for value in values]
+    compress_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for value in compressed:
+        decompress(value)
+    decompress_seconds = time.perf_counter() - start
+
+    stored_bytes = sum(len(value) for value in compressed)
+    return {
+        "codec": name,
+        "bytes": stored_bytes,
+        "ratio": raw_bytes / stored_bytes,
+        "compress_mb_s": raw_bytes / 1e6 / compress_seconds if compress_seconds else None,
+        "decompress_mb_s": raw_bytes / 1e6 / decompress_seconds if decompress_seconds else None,
+        "values": compressed,
+    }
+
+
+def table_scan(path: str, rows: list, decode) -> dict:
+    """File size of a table holding `rows`, and the time to read and decode them all."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE bodies (id INTEGER PRIMARY KEY, content BLOB)")
+    conn.executemany("INSERT INTO bodies (content) VALUES (?)", ((row,) for row in rows))
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    size = os.path.getsize(path)
+
+    conn = sqlite3.connect(path)
+    start = time.perf_counter()
+    for (content,) in conn.execute("SELECT content FROM bodies"):
+        decode(content)
+    seconds = time.perf_counter() - start
+    conn.close()
+    return {"size": size, "scan_seconds": seconds}
+
+
+def main() -> int:
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+
+    import zstandard
+    from app.config import get_settings
+
+    level = args.level if args.level is not None else get_settings().zstd_level
+
+    print(f"Sampling up to {args.sample:,} article bodies...", file=sys.stderr)
+    sample = load_sample(args.sample)
+    if len(sample) < 100:
+        raise SystemExit(f"Only {len(sample)} articles with content; seed or point at a bigger database first.")
+
+    # Train and evaluate on disjoint halves, so the dictionary isn't flattered by having seen the data
+    training, evaluation = sample[::2], sample[1::2]
+    start = time.perf_counter()
+    dictionary = zstandard.train_dictionary(args.dict_size, training, level=level)
+    train_seconds = time.perf_counter() - start
+    if args.write_dictionary:
+        os.makedirs(os.path.dirname(os.path.abspath(args.write_dictionary)), exist_ok=True)
+        with open(args.write_dictionary, "wb") as f:
+            f.write(dictionary.as_bytes())
+
+    plain = zstandard.ZstdCompressor(level=level)
+    with_dict = zstandard.ZstdCompressor(level=level, dict_data=dictionary, write_dict_id=True)
+    results = [
+        measure("none", evaluation, lambda value: value, lambda value: value),
+        measure("gzip -9", evaluation, lambda value: gzip.compress(value, 9), gzip.decompress),
+        measure(f"zstd {level}", evaluation, plain.compress, zstandard.ZstdDecompressor().decompress),
+        measure(f"zstd {level} + dictionary", evaluation, with_dict.compress,
+                zstandard.ZstdDecompressor(dict_data=dictionary).decompress),
+    ]
+
+    raw_bytes = results[0]["bytes"]
+    print(f"# Article body compression, {len(evaluation):,} bodies "
+          f"(avg {raw_bytes // len(evaluation):,} bytes), {args.database_url.split('://')[0]}\n")
+    print(f"Dictionary: {len(dictionary.as_bytes()):,} bytes, id {dictionary.dict_id()}, "
+          f"trained on {len(training):,} other bodies in {train_seconds:.1f}s\n")
+    print("| codec | stored MB | ratio | compress MB/s | decompress MB/s |")
+    print("|---|---|---|---|---|")
+    for result in results:
+        compress_rate = f"{result['compress_mb_s']:.0f}" if result["codec"] != "none" else "-"
+        decompress_rate = f"{result['decompress_mb_s']:.0f}" if result["codec"] != "none" else "-"
+        print(f"| {result['codec']} | {result['bytes'] / 1e6:.2f} | {result['ratio']:.2f}x | "
+              f"{compress_rate} | {decompress_rate} |")
+
+    print("Writing scratch tables...", file=sys.stderr)
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+    with tempfile.TemporaryDirectory() as tmp:
+        text_scan = table_scan(os.path.join(tmp, "plain.db"), [value.decode("utf-8") for value in evaluation],
+                               lambda value: value)
+        zstd_scan = table_scan(os.path.join(tmp, "zstd.db"), results[-1]["values"],
+                               lambda value: decompressor.decompress(value).decode("utf-8"))
+
+    print("\nThe same bodies in a scratch SQLite table, read back in full (warm page cache):\n")
+    print("| storage | file MB | scan + decode ms |")
+    print("|---|---|---|")
+    print(f"| text | {text_scan['size'] / 1e6:.2f} | {text_scan['scan_seconds'] * 1000:.0f} |")
+    print(f"| zstd + dictionary | {zstd_scan['size'] / 1e6:.2f} | {zstd_scan['scan_seconds'] * 1000:.0f} |")
+    print(f"\n{text_scan['size'] / zstd_scan['size']:.1f}x fewer bytes to store, cache and read from disk; "
+          f"decompression adds {(zstd_scan['scan_seconds'] - text_scan['scan_seconds']) * 1e6 / len(evaluation):.1f} "
+          f"us of CPU per body read")
+    if args.write_dictionary:
+        print(f"\nDictionary written to {args.write_dictionary}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
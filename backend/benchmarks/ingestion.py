@@ -0,0 +1,337 @@
+"""
+Offline end-to-end benchmark of a fetch job: the real RSSFetcher ->
+AIProcessor -> selection pipeline (app.pipeline), against synthetic
+RSS feeds and a fake Anthropic Messages API served locally, so it needs no
+network access and costs nothing.
+
+Reports articles/sec, p50/p95 per pipeline stage, database queries and peak
+RSS, appends the result to a JSON-lines file and compares it with the last
+stored run with the same parameters.
+
+Usage (from the backend directory):
+    python -m benchmarks.ingestion
+    python -m benchmarks.ingestion --feeds 40 --feed-latency 0.5 --ai-latency 2 --ai-rpm 50
+    python -m benchmarks.ingestion --ai-workers 8 --label "8 AI workers"
+
+The target database is dropped back to an empty schema first, so never point
+--database-url at a database you care about.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_DATABASE_URL = "sqlite:///./data/bench_ingestion.db"
+DEFAULT_RESULTS = "./data/benchmarks/ingestion.jsonl"
+
+# Arguments that make two runs comparable, besides worker counts and database
+COMPARED_ARGS = (
+    "feeds", "items", "item_bytes", "feed_latency", "feed_error_rate", "ai_latency", "ai_rpm", "process_limit",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--feeds", type=int, default=20, help="Synthetic feeds, spread over the categories")
+    parser.add_argument("--items", type=int, default=20, help="Items per feed (a fetch job stores up to 5 per feed)")
+    parser.add_argument("--item-bytes", type=int, default=4000, help="HTML body size of each item")
+    parser.add_argument("--feed-latency", type=float, default=0.3, help="Seconds before a feed responds")
+    parser.add_argument("--feed-error-rate", type=float, default=0.0, help="Fraction of feed requests answered with a 500")
+    parser.add_argument("--ai-latency", type=float, default=1.0, help="Seconds before the fake API responds")
+    parser.add_argument("--ai-rpm", type=int, default=0, help="Fake API requests per minute before it answers 429 (0: unlimited)")
+    parser.add_argument("--fetch-workers", type=int, help="PIPELINE_FETCH_WORKERS for the run")
+    parser.add_argument("--ai-workers", type=int, help="PIPELINE_AI_WORKERS for the run")
+    parser.add_argument("--process-limit", type=int, default=100, help="Articles sent to the AI stage, as in a fetch job")
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSON-lines file results are appended to")
+    parser.add_argument("--label", default="", help="Note stored with the result")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+# Stub servers, run in a child process so they don't share this one's GIL or memory
+
+def feed_handler(args):
+    rng = random.Random(args.seed)
+    rng_lock = threading.Lock()
+    body = "<p>" + escape("Synthetic article body with some detail. " * (args.item_bytes // 40 + 1))[:args.item_bytes] + "</p>"
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def log_message(self, *_):
+            pass
+
+        def do_GET(self):
+            time.sleep(args.feed_latency)
+            with rng_lock:
+                failed = rng.random() < args.feed_error_rate
+            if failed:
+                self.send_error(500)
+                return
+
+            name = self.path.strip("/")
+            now = format_datetime(datetime.now(timezone.utc))
+            items = "".join(
+                f"<item><title>{name} story {i}</title><link>https://bench.invalid/{name}/{i}</link>"
+                f"<pubDate>{now}</pubDate><description>{escape(body)}</description></item>"
+                for i in range(args.items)
+            )
+            payload = f"<?xml version='1.0'?><rss version='2.0'><channel><title>{name}</title>{items}</channel></rss>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return FeedHandler
+
+
+def anthropic_handler(args, rate_limited):
+    rng = random.Random(args.seed)
+    window: deque = deque()
+    window_lock = threading.Lock()
+
+    class AnthropicHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_):
+            pass
+
+        def send_json(self, status: int, body: dict, headers: dict = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+            if args.ai_rpm:
+                with window_lock:
+                    now = time.monotonic()
+                    while window and now - window[0] >= 60:
+                        window.popleft()
+                    retry_after = math.ceil(60 - (now - window[0])) if len(window) >= args.ai_rpm else 0
+                    if not retry_after:
+                        window.append(now)
+                if retry_after:
+                    with rate_limited.get_lock():
+                        rate_limited.value += 1
+                    self.send_json(
+                        429,
+                        {"type": "error", "error": {"type": "rate_limit_error", "message": "Benchmark rate limit"}},
+                        {"retry-after": str(retry_after)},
+                    )
+                    return
+
+            time.sleep(args.ai_latency)
+            prompt = "".join(message["content"] for message in request["messages"])
+            text = json.dumps({
+                "summary": "A synthetic two sentence summary. It reads like the real one.",
+                "key_points": ["First detail.", "Second detail.", "Third detail."],
+                "tags": ["synthetic", "benchmark", "feed"],
+                "sentiment": "neutral",
+                "relevance_score": round(rng.random(), 3),
+            })
+            self.send_json(200, {
+                "id": "msg_bench",
+                "type": "message",
+                "role": "assistant",
+                "model": request["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+            })
+
+    return AnthropicHandler
+
+
+def serve(args, ports, rate_limited) -> None:
+    feeds = ThreadingHTTPServer(("127.0.0.1", 0), feed_handler(args))
+    api = ThreadingHTTPServer(("127.0.0.1", 0), anthropic_handler(args, rate_limited))
+    feeds.daemon_threads = api.daemon_threads = True
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+    ports.put((feeds.server_address[1], api.server_address[1]))
+    feeds.serve_forever()
+
+
+# Measurement
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def count_queries(engine) -> dict:
+    from sqlalchemy import event
+
+    counts = {"queries": 0, "seconds": 0.0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context.bench_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        counts["queries"] += 1
+        counts["seconds"] += time.perf_counter() - context.bench_start
+
+    return counts
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def previous_result(path: str, params: dict):
+    """The latest stored result with the same parameters, if any."""
+    if not os.path.exists(path):
+        return None
+    match = None
+    with open(path) as f:
+        for line in f:
+            result = json.loads(line)
+            if result["params"] == params:
+                match = result
+    return match
+
+
+def main() -> int:
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["ANTHROPIC_API_KEY"] = "bench"
+    # Keep the digest snapshots of the run away from the development ones
+    os.environ["SNAPSHOT_DIR"] = "./data/bench_snapshots"
+    if args.fetch_workers:
+        os.environ["PIPELINE_FETCH_WORKERS"] = str(args.fetch_workers)
+    if args.ai_workers:
+        os.environ["PIPELINE_AI_WORKERS"] = str(args.ai_workers)
+
+    ports = multiprocessing.Queue()
+    rate_limited = multiprocessing.Value("i", 0)
+    server = multiprocessing.Process(target=serve, args=(args, ports, rate_limited), daemon=True)
+    server.start()
+    feed_port, api_port = ports.get(timeout=10)
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{api_port}"
+
+    from alembic import command
+    from alembic.config import Config
+    from app.config import RSS_SOURCES, get_settings
+    from app.database import SessionLocal, engine
+    from app.fetch_metrics import STAGES, percentiles
+    from app.pipeline import FetchPipeline
+
+    settings = get_settings()
+    categories = settings.categories
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(args.database_url[len("sqlite:///"):])), exist_ok=True)
+    alembic_cfg = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+    command.downgrade(alembic_cfg, "base")
+    command.upgrade(alembic_cfg, "head")
+
+    # The pipeline syncs sources from RSS_SOURCES, so point it at the stub feeds
+    RSS_SOURCES.clear()
+    for i in range(args.feeds):
+        category = categories[i % len(categories)]
+        RSS_SOURCES.setdefault(category, []).append({
+            "name": f"Bench feed {i}",
+            "url": "https://bench.invalid",
+            "feed_url": f"http://127.0.0.1:{feed_port}/{category}-{i}",
+        })
+
+    queries = count_queries(engine)
+    rss_before = peak_rss_mb()
+    print(f"Running the fetch pipeline against {args.feeds} stub feeds...", file=sys.stderr)
+    db = SessionLocal()
+    pipeline = FetchPipeline(db)
+    start = time.perf_counter()
+    # What jobs.run_fetch_job runs
+    fetched, processed = pipeline.run(articles_per_source=5, process_limit=args.process_limit)
+    elapsed = time.perf_counter() - start
+    db.close()
+    server.terminate()
+
+    samples = pipeline.metrics.stage_samples()
+    stages = {
+        name: {"total_ms": round(sum(samples[name]), 1), **percentiles(samples[name], points=(0.5, 0.95))}
+        for name in STAGES if name in samples
+    }
+    params = {
+        **{key: getattr(args, key) for key in COMPARED_ARGS},
+        "fetch_workers": settings.pipeline_fetch_workers,
+        "ai_workers": settings.pipeline_ai_workers,
+        "database": engine.dialect.name,
+    }
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "label": args.label,
+        "params": params,
+        "seconds": round(elapsed, 2),
+        "articles_fetched": fetched,
+        "articles_processed": processed,
+        "articles_per_second": round(processed / elapsed, 2) if elapsed else None,
+        "db_queries": queries["queries"],
+        "db_seconds": round(queries["seconds"], 2),
+        "rate_limited": rate_limited.value,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+        "stages": stages,
+    }
+    previous = previous_result(args.results, params)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    print(f"# Ingestion, {args.feeds} feeds x {args.items} items, {params['database']}, "
+          f"{params['fetch_workers']} fetch / {params['ai_workers']} AI workers\n")
+    print(f"{processed} articles processed ({fetched} fetched) in {elapsed:.2f}s: "
+          f"{result['articles_per_second']} articles/s")
+    print(f"{queries['queries']:,} queries ({queries['seconds']:.2f}s), peak RSS {result['peak_rss_mb']} MB "
+          f"(+{result['peak_rss_growth_mb']} MB during the run), {rate_limited.value} rate-limited API calls\n")
+    print("| stage | count | total ms | p50 ms | p95 ms | max ms |")
+    print("|---|---|---|---|---|---|")
+    for name, stage in stages.items():
+        print(f"| {name} | {stage['count']} | {stage['total_ms']} | {stage['p50']} | {stage['p95']} | {stage['max']} |")
+
+    if previous:
+        print(f"\nPrevious run ({previous['commit'] or 'unknown commit'}, {previous['timestamp'][:16]}"
+              f"{', ' + previous['label'] if previous['label'] else ''}):")
+        print(f"  articles/s {previous['articles_per_second']} -> {result['articles_per_second']}, "
+              f"queries {previous['db_queries']:,} -> {result['db_queries']:,}, "
+              f"peak RSS {previous['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+        for name, stage in stages.items():
+            before = previous["stages"].get(name)
+            if before:
+                print(f"  {name} p95 {before['p95']} -> {stage['p95']} ms")
+    print(f"\nResult appended to {args.results}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
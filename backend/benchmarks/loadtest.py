@@ -0,0 +1,183 @@
+"""
+Load test the read endpoints of a running backend, one scenario at a time:
+N concurrent clients request it for a fixed duration, then throughput,
+p50/p99 latency and errors are reported per scenario. Parameters vary per
+request (dates across the seeded history, categories, tags, cursors), so
+the in-process caches only help as much as they would in production.
+
+Meant for a database filled by benchmarks.seed, or real data: dates are
+drawn from the last --history-days days (the seed's default span) and tags
+from /api/tags.
+
+Usage (from the backend directory, with the API running):
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --base-url http://localhost:8000 --concurrency 50 --duration 30
+    python -m benchmarks.loadtest --scenarios digest,category_day
+
+The client is a single Python process; if its CPU is saturated, run it from
+another machine or several processes before reading the numbers as server
+limits.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import httpx
+
+CATEGORIES = ["cyber", "ai", "cloud", "crypto"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients per scenario")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds each scenario runs")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds of unmeasured requests first")
+    parser.add_argument("--history-days", type=int, default=3 * 365, help="Days of history dates are drawn from")
+    parser.add_argument("--scenarios", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--results", help="JSON-lines file to append the results to")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+class Context:
+    """What scenarios draw their parameters from, learned from the API."""
+
+    def __init__(self, rng: random.Random, history_days: int, tags: list[str]):
+        self.rng = rng
+        self.history_days = history_days
+        self.tags = tags or ["security"]
+        self.cursors: list[str] = []
+
+    def category(self) -> str:
+        return self.rng.choice(CATEGORIES)
+
+    def date(self) -> str:
+        return (date.today() - timedelta(days=self.rng.randint(1, self.history_days))).isoformat()
+
+
+# Scenario name -> request path for the next request
+SCENARIOS = {
+    "articles": lambda ctx: "/api/articles?limit=20",
+    "articles_category": lambda ctx: f"/api/articles?limit=20&category={ctx.category()}",
+    "articles_tag": lambda ctx: f"/api/articles?limit=20&tag={ctx.rng.choice(ctx.tags)}",
+    # Later pages, via cursors collected from the scenarios above
+    "articles_next_page": lambda ctx: (
+        f"/api/articles?limit=20&cursor={ctx.rng.choice(ctx.cursors)}" if ctx.cursors else "/api/articles?limit=20"
+    ),
+    "digest": lambda ctx: f"/api/digest?target_date={ctx.date()}",
+    "category_latest": lambda ctx: f"/api/categories/{ctx.category()}",
+    "category_day": lambda ctx: f"/api/categories/{ctx.category()}?featured_date={ctx.date()}",
+    "stats": lambda ctx: "/api/stats",
+}
+
+
+def nearest_rank(ordered: list[float], p: float) -> float:
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+async def discover(client: httpx.AsyncClient, args, rng: random.Random) -> Context:
+    response = await client.get("/api/tags", params={"days": 365, "limit": 100})
+    response.raise_for_status()
+    return Context(rng, args.history_days, [row["tag"] for row in response.json()])
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, name: str, args) -> dict:
+    next_path = SCENARIOS[name]
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    errors = 0
+    warm_until = time.perf_counter() + args.warmup
+    stop_at = warm_until + args.duration
+
+    async def client_loop():
+        nonlocal errors
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                return
+            path = next_path(ctx)
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                await response.aread()
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            elapsed = time.perf_counter() - start
+
+            if status == 200 and "x-next-cursor" in response.headers and len(ctx.cursors) < 1000:
+                ctx.cursors.append(response.headers["x-next-cursor"])
+            if start < warm_until:
+                continue
+            latencies.append(elapsed * 1000)
+            if status is None or status >= 400:
+                errors += 1
+            statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+
+    ordered = sorted(latencies)
+    return {
+        "scenario": name,
+        "requests": len(ordered),
+        "rps": round(len(ordered) / args.duration, 1),
+        "p50_ms": round(nearest_rank(ordered, 0.5), 1) if ordered else None,
+        "p99_ms": round(nearest_rank(ordered, 0.99), 1) if ordered else None,
+        "max_ms": round(ordered[-1], 1) if ordered else None,
+        "errors": errors,
+        "statuses": {str(status): count for status, count in statuses.items()},
+    }
+
+
+async def run(args) -> list[dict]:
+    rng = random.Random(args.seed)
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30, headers={"Accept-Encoding": "gzip, br"}
+    ) as client:
+        ctx = await discover(client, args, rng)
+        print(f"{len(ctx.tags)} tags to draw from", file=sys.stderr)
+
+        results = []
+        for name in names:
+            print(f"Running {name} for {args.duration:g}s at concurrency {args.concurrency}...", file=sys.stderr)
+            results.append(await run_scenario(client, ctx, name, args))
+        return results
+
+
+def main() -> int:
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    print(f"# Read load test, {args.base_url}, concurrency {args.concurrency}, {args.duration:g}s per scenario\n")
+    print("| scenario | requests | req/s | p50 ms | p99 ms | max ms | errors |")
+    print("|---|---|---|---|---|---|---|")
+    for result in results:
+        print(f"| {result['scenario']} | {result['requests']} | {result['rps']} | {result['p50_ms']} | "
+              f"{result['p99_ms']} | {result['max_ms']} | {result['errors']} |")
+
+    if args.results:
+        with open(args.results, "a") as f:
+            f.write(json.dumps({
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "base_url": args.base_url,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "results": results,
+            }) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
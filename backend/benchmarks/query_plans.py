@@ -0,0 +1,221 @@
+"""
+Compare query plans for the hot article queries before and after the
+composite indexes in migration 0003.
+
+Seeds a dedicated database with synthetic articles at revision 0002, captures
+the plan and median latency of each query, upgrades to 0003 and repeats.
+
+Usage (from the backend directory):
+    python -m benchmarks.query_plans --rows 500000
+    python -m benchmarks.query_plans --database-url postgresql://.../bench
+
+The target database is dropped back to an empty schema first, so never point
+--database-url at a database you care about.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+DEFAULT_DATABASE_URL = "sqlite:///./data/bench_query_plans.db"
+BEFORE_REVISION = "0002"
+AFTER_REVISION = "0003"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of articles to seed")
+    parser.add_argument("--days", type=int, default=730, help="Days of history to spread articles over")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    return parser.parse_args()
+
+
+def seed_articles(db, rows: int, days: int) -> None:
+    """Insert synthetic sources and articles shaped like production data."""
+    from app.config import RSS_SOURCES
+    from app.models import Article, Source
+
+    sources = []
+    for category, configs in RSS_SOURCES.items():
+        for config in configs:
+            sources.append(Source(category=category, active=True, **config))
+    db.add_all(sources)
+    db.commit()
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    batch = []
+
+    for i in range(rows):
+        source = sources[i % len(sources)]
+        age_days = (i * days) // rows
+        published_at = now - timedelta(days=age_days, minutes=rng.randint(0, 1439))
+        processed = age_days > 0 or rng.random() < 0.7
+        batch.append({
+            "source_id": source.id,
+            "title": f"Synthetic {source.category} article {i}",
+            "url": f"https://bench.invalid/{source.category}/{i}",
+            "content": None,
+            "published_at": published_at,
+            "summary": "Synthetic summary." if processed else None,
+            "ai_tags": ["synthetic", source.category] if processed else None,
+            "relevance_score": round(rng.random(), 3) if processed else None,
+            "processed": processed,
+            "category": source.category,
+            # Roughly five featured articles per category per day
+            "featured_date": (today - timedelta(days=age_days))
+            if processed and age_days > 0 and rng.random() < 25 * days / rows else None,
+        })
+
+        if len(batch) == 10_000:
+            db.bulk_insert_mappings(Article, batch)
+            db.commit()
+            batch = []
+
+    if batch:
+        db.bulk_insert_mappings(Article, batch)
+        db.commit()
+
+
+def hot_queries(db):
+    """The article queries the app runs most, built exactly as the app builds them."""
+    from app.models import Article
+    from app.pagination import ARTICLE_ORDER, article_keyset_filter
+    from app.queries import article_summary_select
+    from sqlalchemy import and_
+
+    yesterday = date.today() - timedelta(days=1)
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+    deep = db.query(Article).filter(Article.processed == True).order_by(*ARTICLE_ORDER).offset(10_000).first()
+
+    return {
+        # queries.get_daily_digest, narrowed to one category
+        "digest": lambda: db.execute(article_summary_select().where(
+            and_(Article.category == "cyber", Article.featured_date == yesterday)
+        ).order_by(Article.relevance_score.desc())).all(),
+        # AIProcessor.process_unprocessed_articles
+        "unprocessed_backlog": lambda: db.query(Article).filter(
+            Article.processed == False
+        ).order_by(Article.published_at.desc()).limit(100).all(),
+        # AIProcessor.select_top_articles_for_today, per category
+        "selection": lambda: db.query(Article).filter(
+            and_(
+                Article.category == "cyber",
+                Article.processed == True,
+                Article.featured_date == None,
+                Article.published_at >= cutoff
+            )
+        ).order_by(Article.relevance_score.desc(), Article.published_at.desc()).limit(5).all(),
+        # /api/articles?category=cyber, page ~500 via cursor
+        "articles_deep_cursor": lambda: db.execute(article_summary_select().where(
+            Article.category == "cyber",
+            Article.processed == True,
+            article_keyset_filter(deep.relevance_score, deep.published_at, deep.id, include_unscored=False)
+        ).order_by(*ARTICLE_ORDER).limit(21)).all(),
+    }
+
+
+def capture_statement(engine, fn):
+    """Run fn once and return the (statement, parameters) of its first SELECT."""
+    from sqlalchemy import event
+
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return captured[0]
+
+
+def explain(engine, statement: str, parameters) -> str:
+    """Return the database's plan for a captured statement."""
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        raw.close()
+
+    if engine.dialect.name == "postgresql":
+        return "\n".join(row[0] for row in rows)
+    return "\n".join(row[-1] for row in rows)
+
+
+def measure(engine, db, repeat: int) -> dict:
+    """Plan and median latency for every hot query."""
+    results = {}
+    for name, fn in hot_queries(db).items():
+        statement, parameters = capture_statement(engine, fn)
+        timings = []
+        for _ in range(repeat):
+            db.expunge_all()
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "plan": explain(engine, statement, parameters),
+            "median_ms": statistics.median(timings),
+        }
+    return results
+
+
+def analyze(engine) -> None:
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def main() -> int:
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic import command
+    from alembic.config import Config
+    from app.database import SessionLocal, engine
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(args.database_url[len("sqlite:///"):])), exist_ok=True)
+
+    alembic_cfg = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+    command.downgrade(alembic_cfg, "base")
+    command.upgrade(alembic_cfg, BEFORE_REVISION)
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    seed_articles(db, args.rows, args.days)
+    print(f"Seeded {args.rows:,} articles in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    analyze(engine)
+    before = measure(engine, db, args.repeat)
+
+    command.upgrade(alembic_cfg, AFTER_REVISION)
+    analyze(engine)
+    after = measure(engine, db, args.repeat)
+    db.close()
+
+    print(f"# Query plans on {engine.dialect.name}, {args.rows:,} articles\n")
+    for name in before:
+        print(f"## {name}: {before[name]['median_ms']:.2f} ms -> {after[name]['median_ms']:.2f} ms\n")
+        print(f"Before ({BEFORE_REVISION}):\n{before[name]['plan']}\n")
+        print(f"After ({AFTER_REVISION}):\n{after[name]['plan']}\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
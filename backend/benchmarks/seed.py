@@ -0,0 +1,262 @@
+"""
+Seed a database with years of realistic articles for load testing: several
+sources per category, a few hundred articles a day, processed rows with AI
+fields and 3-5 JSON tags from a skewed vocabulary, five featured articles
+per category per day, and the derived tables the read endpoints use (tag
+index, category counters, digest versions, and the search index, which the
+database maintains itself).
+
+Usage (from the backend directory):
+    python -m benchmarks.seed --rows 2000000
+    python -m benchmarks.seed --rows 5000000 --database-url postgresql://.../bench
+
+Then serve that database and point benchmarks.loadtest at it:
+    DATABASE_URL=sqlite:///./data/bench_read.db SNAPSHOT_DIR= uvicorn app.main:app
+
+The target database is dropped back to an empty schema first, so never point
+--database-url at a database you care about.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+DEFAULT_DATABASE_URL = "sqlite:///./data/bench_read.db"
+SOURCES_PER_CATEGORY = 6
+FEATURED_PER_CATEGORY = 5
+BATCH_SIZE = 10_000
+
+TOPICS = {
+    "cyber": ["ransomware", "vulnerability", "phishing", "malware", "zero-day", "patch", "breach", "cve",
+              "apt", "supply chain", "botnet", "exploit", "identity", "cisa", "encryption", "incident response"],
+    "ai": ["llm", "openai", "anthropic", "regulation", "agents", "gpu", "open source", "benchmark",
+           "fine-tuning", "safety", "robotics", "inference", "nvidia", "multimodal", "research", "chips"],
+    "cloud": ["aws", "azure", "gcp", "kubernetes", "serverless", "outage", "pricing", "finops",
+              "containers", "terraform", "devops", "databases", "networking", "observability", "edge", "storage"],
+    "crypto": ["bitcoin", "ethereum", "defi", "stablecoin", "sec", "etf", "exchange", "hack",
+               "regulation", "nft", "layer 2", "solana", "mining", "custody", "wallet", "tokenization"],
+}
+COMMON_TAGS = ["security", "policy", "funding", "acquisition", "earnings", "europe", "china", "startup"]
+WORDS = ("new report warns attackers exploit critical flaw cloud provider launches model update market "
+         "regulators probe outage raises record funding researchers find bug release adds support").split()
+# Sentences feed bodies are assembled from, so content compresses like real HTML rather than a repeated string
+SENTENCES = [
+    "The company said the issue affected {n} customers and was resolved within hours.",
+    "According to the report, {topic} activity rose {n} percent over the previous quarter.",
+    "Researchers at the lab published details of the {topic} findings on {day}.",
+    "A spokesperson declined to comment on the {topic} investigation.",
+    "Analysts expect the change to reach most users by the end of the year.",
+    "The update follows a similar announcement from a competitor last month.",
+    "Officials urged organisations to review their exposure and apply fixes promptly.",
+    "The firm raised ${n} million in a round led by existing investors.",
+    "Early benchmarks suggest a {n} percent improvement on common workloads.",
+    "Critics argue the {topic} rules do not go far enough.",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of articles to seed")
+    parser.add_argument("--days", type=int, default=3 * 365, help="Days of history, ending today")
+    parser.add_argument("--content-bytes", type=int, default=1500, help="Raw HTML content per article (0 for none)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def pick_tags(rng: random.Random, category: str) -> list[str]:
+    """3-5 tags, mostly from the category's vocabulary, popular ones far more often."""
+    vocabulary = TOPICS[category] if category in TOPICS else TOPICS["cyber"]
+    count = rng.randint(3, 5)
+    chosen = []
+    while len(chosen) < count:
+        if rng.random() < 0.15:
+            tag = rng.choice(COMMON_TAGS)
+        else:
+            # Zipf-like: the first tags of a vocabulary dominate
+            tag = vocabulary[min(int(rng.paretovariate(1.2)) - 1, len(vocabulary) - 1)]
+        if tag not in chosen:
+            chosen.append(tag)
+    return chosen
+
+
+def make_content(rng: random.Random, category: str, article_id: int, day: date, size: int) -> str:
+    """Feed-style HTML of about `size` bytes: paragraphs, links and the odd list."""
+    vocabulary = TOPICS.get(category, TOPICS["cyber"])
+    parts = [f'<div class="entry-content"><p><strong>{rng.choice(vocabulary).title()}</strong> &mdash; ']
+    length = len(parts[0])
+    while length < size:
+        roll = rng.random()
+        if roll < 0.15:
+            items = "".join(f"<li>{rng.choice(SENTENCES).format(n=rng.randint(2, 900), topic=rng.choice(vocabulary), day=day)}</li>"
+                            for _ in range(rng.randint(2, 4)))
+            part = f"</p><ul>{items}</ul><p>"
+        elif roll < 0.3:
+            slug = rng.choice(vocabulary).replace(" ", "-")
+            part = f'<a href="https://{category}.bench.invalid/{slug}/{rng.randint(1, article_id)}" rel="noopener">{slug}</a> '
+        elif roll < 0.4:
+            part = "</p>\n<p>"
+        else:
+            part = rng.choice(SENTENCES).format(n=rng.randint(2, 900), topic=rng.choice(vocabulary), day=day) + " "
+        parts.append(part)
+        length += len(part)
+    return "".join(parts) + "</p></div>"
+
+
+def create_sources(db, categories: list[str]) -> dict[str, list[int]]:
+    from app.models import Source
+
+    sources = {}
+    for category in categories:
+        rows = [
+            Source(
+                name=f"{category.title()} Source {n}",
+                url=f"https://{category}{n}.bench.invalid",
+                feed_url=f"https://{category}{n}.bench.invalid/feed",
+                category=category,
+                active=True,
+            )
+            for n in range(SOURCES_PER_CATEGORY)
+        ]
+        db.add_all(rows)
+        db.flush()
+        sources[category] = [source.id for source in rows]
+    db.commit()
+    return sources
+
+
+def seed_articles(db, args, categories: list[str], sources: dict[str, list[int]]) -> set[date]:
+    """Insert articles and their tag rows day by day. Returns the featured dates."""
+    from sqlalchemy import insert
+    from app.models import Article, ArticleTag
+
+    rng = random.Random(args.seed)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    per_day = args.rows / args.days
+    featured_dates = set()
+    articles, article_tags = [], []
+    article_id = 0
+
+    def flush():
+        db.execute(insert(Article.__table__), articles)
+        db.execute(insert(ArticleTag.__table__), article_tags)
+        db.commit()
+        articles.clear()
+        article_tags.clear()
+
+    for age_days in range(args.days - 1, -1, -1):
+        day = today - timedelta(days=age_days)
+        # Spread the remainder so the total comes out at --rows
+        count = int(per_day * (args.days - age_days)) - int(per_day * (args.days - age_days - 1))
+        featured = {category: 0 for category in categories}
+
+        for _ in range(count):
+            article_id += 1
+            category = categories[article_id % len(categories)]
+            published_at = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(
+                seconds=rng.randint(0, 86_399)
+            )
+            # Today's articles are still being worked through
+            processed = age_days > 0 or rng.random() < 0.6
+            row = {
+                "id": article_id,
+                "source_id": rng.choice(sources[category]),
+                "title": f"{' '.join(rng.choices(WORDS, k=rng.randint(6, 11))).capitalize()} ({category} {article_id})",
+                "url": f"https://{category}.bench.invalid/{day.isoformat()}/{article_id}",
+                "author": f"Reporter {rng.randint(1, 200)}",
+                "content": make_content(rng, category, article_id, day, args.content_bytes) if args.content_bytes else None,
+                "published_at": min(published_at, now),
+                "fetched_at": min(published_at + timedelta(minutes=rng.randint(5, 600)), now),
+                "processed": processed,
+                "category": category,
+                # Every row carries every column, so batches insert in one executemany
+                "summary": None, "key_points": None, "ai_tags": None, "sentiment": None,
+                "relevance_score": None, "processed_at": None, "featured_date": None,
+            }
+            if processed:
+                tags = pick_tags(rng, category)
+                relevance = round(rng.betavariate(2, 3), 3)
+                is_featured = age_days > 0 and featured[category] < FEATURED_PER_CATEGORY and rng.random() < 0.2
+                if is_featured:
+                    featured[category] += 1
+                    relevance = round(0.8 + rng.random() * 0.2, 3)
+                    featured_dates.add(day)
+                row.update({
+                    "summary": "A short executive summary of the story. It covers who, what and why it matters.",
+                    "key_points": [f"Key point {k} with a specific figure or detail." for k in range(rng.randint(3, 5))],
+                    "ai_tags": tags,
+                    "sentiment": rng.choice(("positive", "neutral", "neutral", "negative")),
+                    "relevance_score": relevance,
+                    "processed_at": row["fetched_at"],
+                    "featured_date": day if is_featured else None,
+                })
+                article_tags.extend(
+                    {"article_id": article_id, "tag": tag, "category": category, "published_at": row["published_at"]}
+                    for tag in tags
+                )
+            articles.append(row)
+
+            if len(articles) >= BATCH_SIZE:
+                flush()
+
+        if age_days % 30 == 0:
+            print(f"  {article_id:,} articles seeded, through {day}", file=sys.stderr)
+
+    if articles:
+        flush()
+    return featured_dates
+
+
+def finish(db, engine, featured_dates: set[date]) -> None:
+    """Derived tables and planner statistics."""
+    from sqlalchemy import text
+    from app import rollups
+    from app.models import DigestVersion
+
+    db.bulk_insert_mappings(DigestVersion, [{"featured_date": day, "version": 1} for day in sorted(featured_dates)])
+    db.commit()
+    rollups.rebuild_category_stats(db)
+
+    if engine.dialect.name == "postgresql":
+        # Ids were inserted explicitly, so move the sequence past them
+        db.execute(text("SELECT setval(pg_get_serial_sequence('articles', 'id'), (SELECT max(id) FROM articles))"))
+        db.commit()
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def main() -> int:
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic import command
+    from alembic.config import Config
+    from app.config import get_settings
+    from app.database import SessionLocal, engine
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(args.database_url[len("sqlite:///"):])), exist_ok=True)
+
+    alembic_cfg = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+    command.downgrade(alembic_cfg, "base")
+    command.upgrade(alembic_cfg, "head")
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    categories = get_settings().categories
+    sources = create_sources(db, categories)
+    featured_dates = seed_articles(db, args, categories, sources)
+    finish(db, engine, featured_dates)
+    db.close()
+
+    print(f"Seeded {args.rows:,} articles over {args.days} days ({len(featured_dates)} digest dates) "
+          f"into {engine.dialect.name} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Serialization cost of an /api/articles?limit=100 page, before and after the
+orjson/projection path.
+
+before: ORM Article objects -> schemas.ArticleSummary(**dict) per row ->
+        FastAPI response_model serialization -> JSONResponse (stdlib json)
+after:  ArticleSummary column projection -> row._asdict() -> ORJSONResponse
+
+Both paths read the same 100 rows from an in-memory SQLite database. The
+"serialize" figures exclude the query, the "end to end" figures include it.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --repeat 500
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+PAGE_SIZE = 100
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="Timed runs per path")
+    return parser.parse_args()
+
+
+def seed(db) -> None:
+    from app.models import Article, Source
+
+    source = Source(name="Bench Source", url="https://bench.invalid", feed_url="https://bench.invalid/feed", category="cyber")
+    db.add(source)
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    db.bulk_insert_mappings(Article, [{
+        "source_id": source.id,
+        "title": f"Benchmark article {i} about a newly disclosed vulnerability",
+        "url": f"https://bench.invalid/articles/{i}",
+        "content": "<p>" + "Body text. " * 2000 + "</p>",
+        "published_at": now - timedelta(minutes=i),
+        "summary": "A three sentence executive summary of the article. " * 3,
+        "key_points": [f"Key point {n} with a specific detail or figure." for n in range(4)],
+        "ai_tags": ["vulnerability", "patch", "exploit", "cve"],
+        "sentiment": "negative",
+        "relevance_score": (i % 100) / 100,
+        "processed": True,
+        "category": "cyber",
+    } for i in range(PAGE_SIZE)])
+    db.commit()
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    args = parse_args()
+    os.environ["DATABASE_URL"] = "sqlite://"
+
+    import brotli
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from sqlalchemy import select
+    from sqlalchemy.orm import defer, joinedload
+    from app import schemas
+    from app.database import Base, SessionLocal, engine
+    from app.models import Article, Source
+    from app.pagination import ARTICLE_ORDER
+    from app.queries import article_summary_select
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    seed(db)
+
+    field = create_response_field(name="Response_get_articles", type_=list[schemas.ArticleSummary])
+    loop = asyncio.new_event_loop()
+
+    def load_orm():
+        db.expunge_all()
+        return db.execute(
+            select(Article)
+            .options(defer(Article.content), joinedload(Article.source).load_only(Source.name))
+            .order_by(*ARTICLE_ORDER).limit(PAGE_SIZE)
+        ).scalars().all()
+
+    def load_rows():
+        return db.execute(article_summary_select().order_by(*ARTICLE_ORDER).limit(PAGE_SIZE)).all()
+
+    def serialize_before(articles) -> bytes:
+        result = []
+        for article in articles:
+            result.append(schemas.ArticleSummary(**{
+                "id": article.id,
+                "title": article.title,
+                "url": article.url,
+                "category": article.category,
+                "summary": article.summary,
+                "key_points": article.key_points,
+                "ai_tags": article.ai_tags,
+                "sentiment": article.sentiment,
+                "relevance_score": article.relevance_score,
+                "published_at": article.published_at,
+                "featured_date": article.featured_date,
+                "source_name": article.source.name if article.source else None
+            }))
+        content = loop.run_until_complete(serialize_response(field=field, response_content=result))
+        return JSONResponse(content).body
+
+    def serialize_after(rows) -> bytes:
+        return ORJSONResponse([row._asdict() for row in rows]).body
+
+    articles = load_orm()
+    rows = load_rows()
+    body_before = serialize_before(articles)
+    body_after = serialize_after(rows)
+
+    results = {
+        "serialize": (
+            timed(lambda: serialize_before(articles), args.repeat),
+            timed(lambda: serialize_after(rows), args.repeat),
+        ),
+        "end to end": (
+            timed(lambda: serialize_before(load_orm()), args.repeat),
+            timed(lambda: serialize_after(load_rows()), args.repeat),
+        ),
+    }
+
+    db.close()
+    loop.close()
+
+    print(f"/api/articles?limit={PAGE_SIZE}, median of {args.repeat} runs")
+    print(f"response body: {len(body_before):,} bytes before, {len(body_after):,} bytes after, identical: {body_before == body_after}")
+    print(f"compressed: {len(gzip.compress(body_after)):,} bytes gzip, {len(brotli.compress(body_after, quality=4)):,} bytes br")
+    for name, (before, after) in results.items():
+        print(f"{name:>10}: {before:.3f} ms -> {after:.3f} ms ({before / after:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.config import get_settings
+from app.database import Base
+from app import models  # noqa: F401 - registers models on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    # Keep uvicorn's loggers intact when migrations run at startup
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+config.set_main_option("sqlalchemy.url", get_settings().database_url.replace("%", "%%"))
+
+target_metadata = Base.metadata
+
+# Full-text search structures are managed by hand in migration 0005 and are
+# not mapped on the models, so autogenerate must not try to drop them.
+UNMAPPED_SEARCH_OBJECTS = {"search_vector", "ix_articles_search"}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    if reflected and compare_to is None:
+        if name in UNMAPPED_SEARCH_OBJECTS or (type_ == "table" and name.startswith("articles_fts")):
+            return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL without connecting to a database."""
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against a live connection."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        _run_with_connection(connection)
+
+
+def _run_with_connection(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite can only alter tables by copying them
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,101 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+The schema as created by Base.metadata.create_all before migrations were
+introduced. Databases created that way are stamped at this revision by
+init_db and upgraded from here.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sources',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('feed_url', sa.String(length=500), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('feed_url'),
+    )
+    op.create_index('ix_sources_id', 'sources', ['id'])
+    op.create_index('ix_sources_category', 'sources', ['category'])
+
+    op.create_table(
+        'articles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('url', sa.String(length=1000), nullable=False),
+        sa.Column('author', sa.String(length=255), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('key_points', sa.JSON(), nullable=True),
+        sa.Column('ai_tags', sa.JSON(), nullable=True),
+        sa.Column('sentiment', sa.String(length=20), nullable=True),
+        sa.Column('relevance_score', sa.Float(), nullable=True),
+        sa.Column('processed', sa.Boolean(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('featured_date', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['source_id'], ['sources.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url', name='uq_article_url'),
+    )
+    op.create_index('ix_articles_id', 'articles', ['id'])
+    op.create_index('ix_articles_category', 'articles', ['category'])
+    op.create_index('ix_articles_featured_date', 'articles', ['featured_date'])
+
+    op.create_table(
+        'fetch_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('articles_fetched', sa.Integer(), nullable=True),
+        sa.Column('articles_processed', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_fetch_logs_id', 'fetch_logs', ['id'])
+
+    op.create_table(
+        'newsletters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('url', sa.String(length=1000), nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('executive_summary', sa.Text(), nullable=True),
+        sa.Column('processed', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url'),
+    )
+    op.create_index('ix_newsletters_id', 'newsletters', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_table('newsletters')
+    op.drop_table('fetch_logs')
+    op.drop_table('articles')
+    op.drop_table('sources')
@@ -0,0 +1,52 @@
+"""category stats counters and keyset pagination index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+Both objects may already exist on databases that ran create_all after they
+were added to the models, so each step checks before creating.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        # No live database to inspect when emitting SQL scripts
+        tables, indexes = set(), set()
+    else:
+        inspector = sa.inspect(op.get_bind())
+        tables = set(inspector.get_table_names())
+        indexes = {ix['name'] for ix in inspector.get_indexes('articles')}
+
+    if 'category_stats' not in tables:
+        op.create_table(
+            'category_stats',
+            sa.Column('category', sa.String(length=50), nullable=False),
+            sa.Column('total_articles', sa.Integer(), nullable=False),
+            sa.Column('processed_articles', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint('category'),
+        )
+
+    if 'ix_articles_keyset' not in indexes:
+        if op.get_bind().dialect.name == 'postgresql':
+            columns = ['relevance_score DESC NULLS LAST', 'published_at DESC NULLS LAST', 'id DESC']
+        else:
+            columns = ['relevance_score DESC', 'published_at DESC', 'id DESC']
+        op.create_index('ix_articles_keyset', 'articles', [sa.text(c) for c in columns])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_keyset', table_name='articles')
+    op.drop_table('category_stats')
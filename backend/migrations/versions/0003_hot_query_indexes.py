@@ -0,0 +1,47 @@
+"""composite and partial indexes for the hot article queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+- ix_articles_digest: get_daily_digest and the featured_date filter of
+  /api/categories/{category} (category, featured_date, ORDER BY relevance).
+- ix_articles_unprocessed: process_unprocessed_articles; partial, so it only
+  holds the small backlog of rows still waiting for the AI stage.
+- ix_articles_selection: select_top_articles_for_today (category, processed,
+  featured_date IS NULL, published_at >= cutoff).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_articles_digest', 'articles',
+        ['category', 'featured_date', 'relevance_score']
+    )
+    op.create_index(
+        'ix_articles_unprocessed', 'articles',
+        ['processed', 'published_at'],
+        postgresql_where=sa.text('NOT processed'),
+        sqlite_where=sa.text('processed = 0'),
+    )
+    op.create_index(
+        'ix_articles_selection', 'articles',
+        ['category', 'processed', 'featured_date', 'published_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_selection', table_name='articles')
+    op.drop_index('ix_articles_unprocessed', table_name='articles')
+    op.drop_index('ix_articles_digest', table_name='articles')
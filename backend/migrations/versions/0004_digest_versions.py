@@ -0,0 +1,37 @@
+"""digest content versions for HTTP validators
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:03
+
+Existing digest dates start at version 1.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'digest_versions',
+        sa.Column('featured_date', sa.Date(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('featured_date'),
+    )
+    op.execute(
+        "INSERT INTO digest_versions (featured_date, version) "
+        "SELECT DISTINCT featured_date, 1 FROM articles WHERE featured_date IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('digest_versions')
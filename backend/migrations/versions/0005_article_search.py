@@ -0,0 +1,84 @@
+"""full-text search index over articles
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:04
+
+PostgreSQL: a stored, generated tsvector column with a GIN index. Adding a
+stored column rewrites the articles table once.
+
+SQLite: an external-content FTS5 table kept in sync by triggers. Batch
+operations that rebuild the articles table drop these triggers, so any
+later migration doing that must recreate them with create_sqlite_triggers().
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_COLUMNS = "title, summary, key_points, ai_tags"
+
+
+def create_sqlite_triggers() -> None:
+    """Triggers that mirror article text changes into articles_fts."""
+    op.execute(f"""
+        CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.title, new.summary, new.key_points, new.ai_tags);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, {FTS_COLUMNS})
+            VALUES ('delete', old.id, old.title, old.summary, old.key_points, old.ai_tags);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER articles_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, {FTS_COLUMNS})
+            VALUES ('delete', old.id, old.title, old.summary, old.key_points, old.ai_tags);
+            INSERT INTO articles_fts (rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.title, new.summary, new.key_points, new.ai_tags);
+        END
+    """)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE articles ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(ai_tags::text, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(key_points::text, '')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_articles_search ON articles USING GIN (search_vector)")
+    else:
+        op.execute(f"""
+            CREATE VIRTUAL TABLE articles_fts USING fts5(
+                {FTS_COLUMNS},
+                content='articles',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        create_sqlite_triggers()
+        op.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX ix_articles_search")
+        op.execute("ALTER TABLE articles DROP COLUMN search_vector")
+    else:
+        op.execute("DROP TRIGGER articles_fts_update")
+        op.execute("DROP TRIGGER articles_fts_delete")
+        op.execute("DROP TRIGGER articles_fts_insert")
+        op.execute("DROP TABLE articles_fts")
@@ -0,0 +1,68 @@
+"""normalized article tag index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:05
+
+Backfills the index from the ai_tags JSON of already processed articles,
+with the same normalization as app.tags (trimmed, lowercased, at most 100
+characters, one row per distinct tag).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSTGRESQL_BACKFILL = """
+INSERT INTO article_tags (article_id, tag, category, published_at)
+SELECT DISTINCT a.id, left(lower(trim(t.tag)), 100), a.category, coalesce(a.published_at, a.processed_at)
+FROM articles a
+CROSS JOIN LATERAL json_array_elements_text(
+    CASE WHEN json_typeof(a.ai_tags) = 'array' THEN a.ai_tags ELSE '[]'::json END
+) AS t(tag)
+WHERE a.processed AND trim(t.tag) <> ''
+"""
+
+SQLITE_BACKFILL = """
+INSERT INTO article_tags (article_id, tag, category, published_at)
+SELECT DISTINCT a.id, substr(lower(trim(t.value)), 1, 100), a.category, coalesce(a.published_at, a.processed_at)
+FROM articles a, json_each(
+    CASE WHEN json_type(a.ai_tags) = 'array' THEN a.ai_tags ELSE '[]' END
+) AS t
+WHERE a.processed = 1 AND t.type = 'text' AND trim(t.value) <> ''
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'article_tags',
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(length=100), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('article_id', 'tag'),
+    )
+    op.create_index('ix_article_tags_tag', 'article_tags', ['tag', 'article_id'])
+    op.create_index('ix_article_tags_window', 'article_tags', ['published_at', 'tag'])
+    op.create_index('ix_article_tags_category_window', 'article_tags', ['category', 'published_at', 'tag'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(POSTGRESQL_BACKFILL)
+    else:
+        op.execute(SQLITE_BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_article_tags_category_window', table_name='article_tags')
+    op.drop_index('ix_article_tags_window', table_name='article_tags')
+    op.drop_index('ix_article_tags_tag', table_name='article_tags')
+    op.drop_table('article_tags')
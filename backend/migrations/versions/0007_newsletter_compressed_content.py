@@ -0,0 +1,130 @@
+"""store newsletter content sanitized and gzip-compressed
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:06
+
+Existing rows are sanitized with the cleaner the fetcher applied at
+ingestion when this revision was written, then compressed. The cleaner is
+copied here rather than imported, so the result doesn't change with later
+edits to app.newsletter_fetcher. The rewrite happens in Python, so this
+revision cannot be emitted as an offline SQL script.
+"""
+import gzip
+import re
+from typing import Sequence, Union
+
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+newsletters = sa.table(
+    'newsletters',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('content_gz', sa.LargeBinary),
+    sa.column('content_length', sa.Integer),
+)
+
+# app.newsletter_fetcher.clean_newsletter_html as of this revision
+DROPPED_TAGS = [
+    'script', 'style', 'iframe', 'frame', 'object', 'embed', 'form', 'input',
+    'button', 'select', 'textarea', 'noscript', 'link', 'meta', 'base',
+    'template', 'canvas', 'svg', 'head', 'title'
+]
+ALLOWED_ATTRIBUTES = {
+    'href', 'src', 'alt', 'title', 'class', 'id', 'colspan', 'rowspan', 'width', 'height'
+}
+URL_ATTRIBUTES = {'href', 'src'}
+SAFE_URL = re.compile(r'^(https?:|mailto:|#|/)|^[^:]*$', re.IGNORECASE)
+PREFORMATTED_TAGS = {'pre', 'code', 'textarea'}
+
+
+def clean_newsletter_html(html: str) -> str:
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    for tag in soup.find_all(DROPPED_TAGS):
+        tag.decompose()
+
+    for tag in soup.find_all(['html', 'body']):
+        tag.unwrap()
+
+    for tag in soup.find_all(True):
+        for name in list(tag.attrs):
+            value = tag.attrs[name]
+            if name not in ALLOWED_ATTRIBUTES:
+                del tag.attrs[name]
+            elif name in URL_ATTRIBUTES and not SAFE_URL.match(str(value).strip()):
+                del tag.attrs[name]
+
+    for text in soup.find_all(string=True):
+        if any(parent.name in PREFORMATTED_TAGS for parent in text.parents):
+            continue
+        collapsed = re.sub(r'\s+', ' ', str(text))
+        if collapsed != text:
+            text.replace_with(NavigableString(collapsed))
+
+    return str(soup).strip()
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("Revision 0007 rewrites newsletter content and must run online.")
+
+    op.add_column('newsletters', sa.Column('content_gz', sa.LargeBinary(), nullable=True))
+    op.add_column('newsletters', sa.Column('content_length', sa.Integer(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(newsletters.c.id, newsletters.c.content).where(newsletters.c.content != None)
+    ).all()
+    for newsletter_id, content in rows:
+        html = clean_newsletter_html(content).encode('utf-8')
+        conn.execute(
+            newsletters.update()
+            .where(newsletters.c.id == newsletter_id)
+            .values(content_gz=gzip.compress(html, compresslevel=9), content_length=len(html))
+        )
+
+    with op.batch_alter_table('newsletters') as batch_op:
+        batch_op.drop_column('content')
+        batch_op.alter_column('content_gz', new_column_name='content')
+
+
+def downgrade() -> None:
+    compressed = sa.table(
+        'newsletters',
+        sa.column('id', sa.Integer),
+        sa.column('content', sa.LargeBinary),
+        sa.column('content_text', sa.Text),
+    )
+
+    op.add_column('newsletters', sa.Column('content_text', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(compressed.c.id, compressed.c.content).where(compressed.c.content != None)
+    ).all()
+    for newsletter_id, content in rows:
+        conn.execute(
+            compressed.update()
+            .where(compressed.c.id == newsletter_id)
+            .values(content_text=gzip.decompress(content).decode('utf-8'))
+        )
+
+    with op.batch_alter_table('newsletters') as batch_op:
+        batch_op.drop_column('content_length')
+        batch_op.drop_column('content')
+        batch_op.alter_column('content_text', new_column_name='content')
@@ -0,0 +1,28 @@
+"""dedupe key for scheduled jobs
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:08
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('dedupe_key', sa.String(length=100), nullable=True))
+    op.create_index('ix_jobs_dedupe_key', 'jobs', ['dedupe_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_dedupe_key', table_name='jobs')
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('dedupe_key')
@@ -0,0 +1,41 @@
+"""per-stage, per-source and per-article fetch job metrics
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:09
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'fetch_metrics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fetch_log_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=True),
+        sa.Column('duration_ms', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=True),
+        sa.Column('bytes', sa.Integer(), nullable=True),
+        sa.Column('input_tokens', sa.Integer(), nullable=True),
+        sa.Column('output_tokens', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['fetch_log_id'], ['fetch_logs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_fetch_metrics_log', 'fetch_metrics', ['fetch_log_id', 'kind'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fetch_metrics_log', table_name='fetch_metrics')
+    op.drop_table('fetch_metrics')
@@ -0,0 +1,48 @@
+"""archive table for articles past retention
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:10
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'articles_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('url', sa.String(length=1000), nullable=False),
+        sa.Column('author', sa.String(length=255), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('key_points', sa.JSON(), nullable=True),
+        sa.Column('ai_tags', sa.JSON(), nullable=True),
+        sa.Column('sentiment', sa.String(length=20), nullable=True),
+        sa.Column('relevance_score', sa.Float(), nullable=True),
+        sa.Column('processed', sa.Boolean(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('featured_date', sa.Date(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_articles_archive_published', 'articles_archive', ['published_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_archive_published', table_name='articles_archive')
+    op.drop_table('articles_archive')
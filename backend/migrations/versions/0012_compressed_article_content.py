@@ -0,0 +1,107 @@
+"""store article content zstd-compressed
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:11
+
+Live and archived article bodies are compressed in Python, in batches, so
+this revision cannot be emitted as an offline SQL script. The codec is
+copied here rather than imported from app.types, and uses plain zstd at a
+fixed level with no dictionary, so the result doesn't change with
+ZSTD_LEVEL, ZSTD_DICTIONARY or later edits to app.types; CompressedText
+recompresses a row with the dictionary the next time it is written. The
+columns are swapped with plain ALTER TABLE rather than a batch rebuild,
+which would drop the SQLite search triggers; on SQLite that needs 3.35 or
+later.
+"""
+import gzip
+from typing import Callable, Sequence, Union
+
+import zstandard
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('articles', 'articles_archive')
+BATCH_SIZE = 1000
+
+# app.types.compress_text / decompress_text as of this revision, without dictionaries
+ZSTD_LEVEL = 9
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def compress_text(text: str) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(text.encode('utf-8'))
+
+
+def decompress_text(value) -> str:
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if value.startswith(ZSTD_MAGIC):
+        if zstandard.get_frame_parameters(value).dict_id:
+            raise RuntimeError(
+                "Revision 0012 can't decompress article content written with a ZSTD_DICTIONARY; "
+                "rewrite those rows without the dictionary before downgrading."
+            )
+        return zstandard.ZstdDecompressor().decompress(value).decode('utf-8')
+    if value.startswith(GZIP_MAGIC):
+        return gzip.decompress(value).decode('utf-8')
+    return value.decode('utf-8')
+
+
+def convert_content(table_name: str, old_type, new_type, convert: Callable) -> None:
+    """Rewrite a table's content column into a new column of another type, then swap them."""
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('content', old_type),
+        sa.column('content_new', new_type),
+    )
+    op.add_column(table_name, sa.Column('content_new', new_type, nullable=True))
+
+    conn = op.get_bind()
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values(content_new=sa.bindparam('value'))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.content)
+            .where(table.c.id > last_id, table.c.content != None)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [{'row_id': row_id, 'value': convert(content)} for row_id, content in rows])
+        last_id = rows[-1][0]
+
+    op.execute(f'ALTER TABLE {table_name} DROP COLUMN content')
+    op.execute(f'ALTER TABLE {table_name} RENAME COLUMN content_new TO content')
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("Revision 0012 compresses article content and must run online.")
+
+    for table_name in TABLES:
+        convert_content(table_name, sa.Text(), sa.LargeBinary(), compress_text)
+
+
+def downgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("Revision 0012 decompresses article content and must run online.")
+
+    for table_name in TABLES:
+        convert_content(table_name, sa.LargeBinary(), sa.Text(), decompress_text)
@@ -0,0 +1,26 @@
+"""heartbeat for running jobs
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 00:00:12
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -11,12 +11,12 @@ import ArticleModal from '@/components/ArticleModal';
 import TldrNewsletter from '@/components/TldrNewsletter';
 import { DigestSkeleton, StatsPanelSkeleton } from '@/components/LoadingSkeleton';
 import {
+  getBootstrap,
   getDailyDigest,
-  getAvailableDates,
-  getStats,
   DailyDigest,
   Stats,
-  Article
+  Article,
+  Newsletter
 } from '@/lib/api';
 
 // Category order for display
@@ -32,10 +32,10 @@ const categoryConfig: { [key: string]: { label: string; color: string; icon: Rea
 export default function Home() {
   const [currentTab, setCurrentTab] = useState<TabType>('digest');
   const [selectedDate, setSelectedDate] = useState<Date | null>(null);
-  const [initialLoad, setInitialLoad] = useState(true);
   const [availableDates, setAvailableDates] = useState<string[]>([]);
   const [digest, setDigest] = useState<DailyDigest | null>(null);
   const [stats, setStats] = useState<Stats | null>(null);
+  const [newsletter, setNewsletter] = useState<Newsletter | null | undefined>(undefined);
   const [loading, setLoading] = useState(true);
   const [statsLoading, setStatsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -53,60 +53,52 @@ export default function Home() {
     setSelectedArticle(null);
   };
 
-  const fetchData = useCallback(async (date: Date | null) => {
+  // First render: dates, latest digest, stats and newsletter in one request
+  const fetchBootstrap = useCallback(async () => {
     setLoading(true);
+    setStatsLoading(true);
     setError(null);
 
     try {
-      // First fetch available dates to get the most recent
-      const datesData = await getAvailableDates();
-      setAvailableDates(datesData.dates);
-
-      // Use provided date, or default to most recent available date
-      let targetDate = date;
-      if (!targetDate && datesData.dates.length > 0) {
-        targetDate = new Date(datesData.dates[0] + 'T00:00:00');
-        setSelectedDate(targetDate);
+      const data = await getBootstrap();
+      setAvailableDates(data.dates);
+      setDigest(data.digest);
+      setStats(data.stats);
+      setNewsletter(data.newsletter);
+      if (data.dates.length > 0) {
+        setSelectedDate(new Date(data.dates[0] + 'T00:00:00'));
       }
-
-      const dateStr = targetDate ? format(targetDate, 'yyyy-MM-dd') : format(new Date(), 'yyyy-MM-dd');
-      const digestData = await getDailyDigest(dateStr);
-
-      setDigest(digestData);
     } catch (err) {
       console.error('Failed to fetch digest:', err);
       setError('Failed to load news digest. Make sure the backend is running.');
     } finally {
       setLoading(false);
+      setStatsLoading(false);
     }
   }, []);
 
-  const fetchStats = useCallback(async () => {
-    setStatsLoading(true);
+  const fetchData = useCallback(async (date: Date) => {
+    setLoading(true);
+    setError(null);
+
     try {
-      const statsData = await getStats();
-      setStats(statsData);
+      const digestData = await getDailyDigest(format(date, 'yyyy-MM-dd'));
+      setDigest(digestData);
     } catch (err) {
-      console.error('Failed to fetch stats:', err);
+      console.error('Failed to fetch digest:', err);
+      setError('Failed to load news digest. Make sure the backend is running.');
     } finally {
-      setStatsLoading(false);
+      setLoading(false);
     }
   }, []);
 
   useEffect(() => {
-    if (initialLoad) {
-      // On initial load, fetch without a date to get the most recent
-      fetchData(null);
-      fetchStats();
-      setInitialLoad(false);
-    } else if (selectedDate) {
-      // After initial load, fetch data for the selected date
-      fetchData(selectedDate);
-    }
-  }, [selectedDate, initialLoad, fetchData, fetchStats]);
+    fetchBootstrap();
+  }, [fetchBootstrap]);
 
   const handleDateChange = (date: Date) => {
     setSelectedDate(date);
+    fetchData(date);
   };
 
   const handleFilterClick = (category: string | null) => {
@@ -291,7 +283,7 @@ export default function Home() {
                 )}
               </>
             ) : (
-              <TldrNewsletter />
+              <TldrNewsletter initialNewsletter={newsletter} />
             )}
           </div>
 
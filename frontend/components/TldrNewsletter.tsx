@@ -15,7 +15,7 @@ import {
   TrendingUp,
   CheckCircle2
 } from 'lucide-react';
-import { getLatestNewsletter, Newsletter } from '@/lib/api';
+import { getLatestNewsletter, getNewsletterContent, Newsletter } from '@/lib/api';
 
 // Parse executive summary into structured sections
 function parseExecutiveSummary(summary: string): {
@@ -115,11 +115,15 @@ function SummarySection({
   );
 }
 
-export default function TldrNewsletter() {
-  const [newsletter, setNewsletter] = useState<Newsletter | null>(null);
-  const [loading, setLoading] = useState(true);
+// initialNewsletter comes from the homepage bootstrap; null means there is
+// no newsletter yet, undefined that it still has to be fetched
+export default function TldrNewsletter({ initialNewsletter }: { initialNewsletter?: Newsletter | null }) {
+  const [newsletter, setNewsletter] = useState<Newsletter | null>(initialNewsletter ?? null);
+  const [loading, setLoading] = useState(initialNewsletter === undefined);
   const [error, setError] = useState<string | null>(null);
   const [showFullContent, setShowFullContent] = useState(false);
+  const [content, setContent] = useState<string | null>(null);
+  const [contentLoading, setContentLoading] = useState(false);
 
   const fetchNewsletter = async () => {
     setLoading(true);
@@ -137,9 +141,31 @@ export default function TldrNewsletter() {
   };
 
   useEffect(() => {
-    fetchNewsletter();
+    if (initialNewsletter === undefined) {
+      fetchNewsletter();
+    } else if (initialNewsletter === null) {
+      setError('No newsletter available yet. Trigger a fetch to load the latest tl;dr sec newsletter.');
+    }
   }, []);
 
+  // The HTML body is only downloaded the first time it is expanded
+  const toggleFullContent = async () => {
+    const expanding = !showFullContent;
+    setShowFullContent(expanding);
+
+    if (expanding && content === null && newsletter) {
+      setContentLoading(true);
+      try {
+        setContent(await getNewsletterContent(newsletter.id));
+      } catch (err) {
+        console.error('Failed to fetch newsletter content:', err);
+        setShowFullContent(false);
+      } finally {
+        setContentLoading(false);
+      }
+    }
+  };
+
   if (loading) {
     return <NewsletterSkeleton />;
   }
@@ -272,10 +298,10 @@ export default function TldrNewsletter() {
       </div>
 
       {/* Full Newsletter Content */}
-      {newsletter.content && (
+      {!!newsletter.content_length && (
         <div className="bg-[var(--bg-secondary)] border border-[var(--border-subtle)] rounded-lg overflow-hidden">
           <button
-            onClick={() => setShowFullContent(!showFullContent)}
+            onClick={toggleFullContent}
             className="w-full flex items-center justify-between gap-2 p-4 border-b border-[var(--border-subtle)] hover:bg-[var(--bg-tertiary)] transition-colors"
           >
             <div className="flex items-center gap-2">
@@ -291,10 +317,18 @@ export default function TldrNewsletter() {
 
           {showFullContent && (
             <div className="p-6">
-              <div
-                className="newsletter-content prose prose-invert prose-sm max-w-none overflow-x-auto"
-                dangerouslySetInnerHTML={{ __html: newsletter.content }}
-              />
+              {contentLoading || content === null ? (
+                <div className="animate-pulse space-y-3">
+                  <div className="w-full h-4 bg-[var(--bg-tertiary)] rounded" />
+                  <div className="w-5/6 h-4 bg-[var(--bg-tertiary)] rounded" />
+                  <div className="w-4/5 h-4 bg-[var(--bg-tertiary)] rounded" />
+                </div>
+              ) : (
+                <div
+                  className="newsletter-content prose prose-invert prose-sm max-w-none overflow-x-auto"
+                  dangerouslySetInnerHTML={{ __html: content }}
+                />
+              )}
             </div>
           )}
         </div>
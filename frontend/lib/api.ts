@@ -49,17 +49,69 @@ export interface FetchLog {
   errors: string[] | null;
 }
 
+export interface Percentiles {
+  count: number;
+  p50: number | null;
+  p90: number | null;
+  p99: number | null;
+  max: number | null;
+}
+
+export interface FetchLogDetail extends FetchLog {
+  metrics: {
+    stages: { [stage: string]: { total_ms: number; count: number | null } };
+    sources: {
+      latency_ms: Percentiles;
+      bytes_total: number;
+      entries_total: number;
+      slowest: { name: string; duration_ms: number; bytes: number | null; entries: number | null }[];
+    };
+    articles: {
+      latency_ms: Percentiles;
+      input_tokens: Percentiles;
+      output_tokens: Percentiles;
+      input_tokens_total: number;
+      output_tokens_total: number;
+    };
+  };
+}
+
+export interface FetchEvent {
+  id: number;
+  type:
+    | 'job_started'
+    | 'source_fetched'
+    | 'article_processed'
+    | 'selection_done'
+    | 'job_completed'
+    | 'job_failed';
+  log_id: number;
+  [key: string]: unknown;
+}
+
 export interface Newsletter {
   id: number;
   title: string;
   url: string;
-  content: string | null;
+  content_length: number | null;
   published_at: string | null;
   fetched_at: string;
   executive_summary: string | null;
   processed: boolean;
 }
 
+export interface TagCount {
+  tag: string;
+  count: number;
+}
+
+export interface Bootstrap {
+  dates: string[];
+  digest: DailyDigest;
+  stats: Stats;
+  newsletter: Newsletter | null;
+}
+
 export interface Source {
   id: number;
   name: string;
@@ -99,6 +151,11 @@ async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T>
 }
 
 // API Functions
+// Everything the homepage needs for its first render, in one round trip
+export async function getBootstrap(): Promise<Bootstrap> {
+  return fetchApi<Bootstrap>('/api/bootstrap');
+}
+
 export async function getDailyDigest(date?: string): Promise<DailyDigest> {
   const params = date ? `?target_date=${date}` : '';
   return fetchApi<DailyDigest>(`/api/digest${params}`);
@@ -111,12 +168,14 @@ export async function getAvailableDates(): Promise<{ dates: string[] }> {
 export async function getArticles(params?: {
   category?: string;
   featured_date?: string;
+  tag?: string;
   limit?: number;
   offset?: number;
 }): Promise<Article[]> {
   const searchParams = new URLSearchParams();
   if (params?.category) searchParams.set('category', params.category);
   if (params?.featured_date) searchParams.set('featured_date', params.featured_date);
+  if (params?.tag) searchParams.set('tag', params.tag);
   if (params?.limit) searchParams.set('limit', params.limit.toString());
   if (params?.offset) searchParams.set('offset', params.offset.toString());
   
@@ -124,6 +183,82 @@ export async function getArticles(params?: {
   return fetchApi<Article[]>(`/api/articles${query ? `?${query}` : ''}`);
 }
 
+export interface ArticlePage {
+  articles: Article[];
+  nextCursor: string | null;
+}
+
+// Keyset-paginated article listing: pass the previous page's nextCursor
+// to continue. Every page costs the same, however deep into the archive.
+export async function getArticlesPage(params?: {
+  category?: string;
+  featured_date?: string;
+  tag?: string;
+  limit?: number;
+  cursor?: string | null;
+}): Promise<ArticlePage> {
+  const searchParams = new URLSearchParams();
+  if (params?.category) searchParams.set('category', params.category);
+  if (params?.featured_date) searchParams.set('featured_date', params.featured_date);
+  if (params?.tag) searchParams.set('tag', params.tag);
+  if (params?.limit) searchParams.set('limit', params.limit.toString());
+  if (params?.cursor) searchParams.set('cursor', params.cursor);
+
+  const query = searchParams.toString();
+  const endpoint = `/api/articles${query ? `?${query}` : ''}`;
+  const response = await fetch(`${API_BASE}${endpoint}`, {
+    headers: { 'Content-Type': 'application/json' },
+  });
+
+  if (!response.ok) {
+    throw new Error(`API Error: ${response.status} ${response.statusText}`);
+  }
+
+  return {
+    articles: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  };
+}
+
+export async function searchArticles(params: {
+  q: string;
+  category?: string;
+  limit?: number;
+  cursor?: string | null;
+}): Promise<ArticlePage> {
+  const searchParams = new URLSearchParams({ q: params.q });
+  if (params.category) searchParams.set('category', params.category);
+  if (params.limit) searchParams.set('limit', params.limit.toString());
+  if (params.cursor) searchParams.set('cursor', params.cursor);
+
+  const response = await fetch(`${API_BASE}/api/search?${searchParams.toString()}`, {
+    headers: { 'Content-Type': 'application/json' },
+  });
+
+  if (!response.ok) {
+    throw new Error(`API Error: ${response.status} ${response.statusText}`);
+  }
+
+  return {
+    articles: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  };
+}
+
+export async function getTags(params?: {
+  days?: number;
+  category?: string;
+  limit?: number;
+}): Promise<TagCount[]> {
+  const searchParams = new URLSearchParams();
+  if (params?.days) searchParams.set('days', params.days.toString());
+  if (params?.category) searchParams.set('category', params.category);
+  if (params?.limit) searchParams.set('limit', params.limit.toString());
+
+  const query = searchParams.toString();
+  return fetchApi<TagCount[]>(`/api/tags${query ? `?${query}` : ''}`);
+}
+
 export async function getArticle(id: number): Promise<Article> {
   return fetchApi<Article>(`/api/articles/${id}`);
 }
@@ -152,14 +287,51 @@ export async function getFetchLogs(limit = 10): Promise<FetchLog[]> {
   return fetchApi<FetchLog[]>(`/api/fetch/logs?limit=${limit}`);
 }
 
-export async function getFetchLog(id: number): Promise<FetchLog> {
-  return fetchApi<FetchLog>(`/api/fetch/logs/${id}`);
+export async function getFetchLog(id: number): Promise<FetchLogDetail> {
+  return fetchApi<FetchLogDetail>(`/api/fetch/logs/${id}`);
+}
+
+// Stream a fetch job's progress instead of polling its log. Returns a
+// function that closes the stream; it also closes once the job finishes.
+export function subscribeFetchEvents(
+  id: number,
+  onEvent: (event: FetchEvent) => void,
+): () => void {
+  const source = new EventSource(`${API_BASE}/api/fetch/logs/${id}/events`);
+  const types: FetchEvent['type'][] = [
+    'job_started',
+    'source_fetched',
+    'article_processed',
+    'selection_done',
+    'job_completed',
+    'job_failed',
+  ];
+
+  for (const type of types) {
+    source.addEventListener(type, (message) => {
+      onEvent(JSON.parse((message as MessageEvent).data));
+      if (type === 'job_completed' || type === 'job_failed') source.close();
+    });
+  }
+
+  return () => source.close();
 }
 
 export async function getLatestNewsletter(): Promise<Newsletter> {
   return fetchApi<Newsletter>('/api/newsletter/latest');
 }
 
+// Sanitized HTML body, fetched separately from the metadata and cacheable for long
+export async function getNewsletterContent(id: number): Promise<string> {
+  const response = await fetch(`${API_BASE}/api/newsletter/${id}/content`);
+
+  if (!response.ok) {
+    throw new Error(`API Error: ${response.status} ${response.statusText}`);
+  }
+
+  return response.text();
+}
+
 export async function triggerNewsletterFetch(): Promise<{
   message: string;
   newsletter_id: number | null;
@@ -4,9 +4,10 @@ RETURNS void
 LANGUAGE plpgsql
 AS $$
 BEGIN
-    -- Call FastAPI's fetch trigger endpoint
+    -- Call FastAPI's fetch trigger endpoint. The schedule id makes the backend
+    -- queue at most one run per day, however many schedulers fire it.
     PERFORM net.http_post(
-        url := 'http://backend:8000/api/fetch/trigger',
+        url := 'http://backend:8000/api/fetch/trigger?schedule=daily_fetch',
         headers := '{"Content-Type": "application/json"}'::jsonb,
         body := '{}'::jsonb
     );
@@ -21,7 +22,7 @@ AS $$
 BEGIN
     -- Call FastAPI's newsletter trigger endpoint
     PERFORM net.http_post(
-        url := 'http://backend:8000/api/newsletter/trigger',
+        url := 'http://backend:8000/api/newsletter/trigger?schedule=daily_newsletter',
         headers := '{"Content-Type": "application/json"}'::jsonb,
         body := '{}'::jsonb
     );